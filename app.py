@@ -1,5 +1,6 @@
 import os
 import logging
+import click
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy.orm import DeclarativeBase
@@ -25,6 +26,72 @@ app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
     "pool_pre_ping": True,
 }
 
+# analysis job queue
+app.config["ANALYSIS_JOB_MAX_ATTEMPTS"] = int(os.environ.get("ANALYSIS_JOB_MAX_ATTEMPTS", 3))
+app.config["ANALYSIS_JOB_VISIBILITY_TIMEOUT"] = int(os.environ.get("ANALYSIS_JOB_VISIBILITY_TIMEOUT", 300))  # seconds
+app.config["ANALYSIS_JOB_MAX_CONCURRENCY"] = int(os.environ.get("ANALYSIS_JOB_MAX_CONCURRENCY", 0))  # 0 = unlimited
+app.config["ANALYSIS_JOB_RETRY_BACKOFF"] = float(os.environ.get("ANALYSIS_JOB_RETRY_BACKOFF", 15))  # seconds
+app.config["ANALYSIS_BATCH_MAX_MISSIONS"] = int(os.environ.get("ANALYSIS_BATCH_MAX_MISSIONS", 500))
+app.config["ANALYSIS_BATCH_CLAIM_SIZE"] = int(os.environ.get("ANALYSIS_BATCH_CLAIM_SIZE", 20))
+app.config["ANALYSIS_BATCH_AI_CONCURRENCY"] = int(os.environ.get("ANALYSIS_BATCH_AI_CONCURRENCY", 4))
+app.config["AI_BATCH_SIZE"] = int(os.environ.get("AI_BATCH_SIZE", 8))  # missions per batched AI request, 1 = one request each
+app.config["ANALYSIS_STAGE_WORKERS"] = int(os.environ.get("ANALYSIS_STAGE_WORKERS", 8))  # threads shared by the concurrent stages of every analysis in a process
+
+# skip the AI call for missions the physics scorer finds physically infeasible (Δv shortfall, ends before arrival)
+app.config["PHYSICS_SKIP_INFEASIBLE"] = os.environ.get("PHYSICS_SKIP_INFEASIBLE", "1") != "0"
+
+# Monte Carlo mission simulation
+app.config["SIMULATION_TRIALS"] = int(os.environ.get("SIMULATION_TRIALS", 10000))
+app.config["SIMULATION_MAX_TRIALS"] = int(os.environ.get("SIMULATION_MAX_TRIALS", 1000000))
+app.config["SIMULATION_PROCESSES"] = int(os.environ.get("SIMULATION_PROCESSES", 1))
+# Simulation time series: 'blob' keeps them in the database, 'file' in memory-mappable side files
+app.config["SIMULATION_SERIES_STORAGE"] = os.environ.get("SIMULATION_SERIES_STORAGE", "blob")
+app.config["SIMULATION_SERIES_DIR"] = os.environ.get("SIMULATION_SERIES_DIR", os.path.join(app.instance_path, "simulation_series"))
+app.config["SIMULATION_SERIES_DTYPE"] = os.environ.get("SIMULATION_SERIES_DTYPE", "float32")
+app.config["SIMULATION_SERIES_COMPRESS"] = os.environ.get("SIMULATION_SERIES_COMPRESS", "0") == "1"
+
+# AI analysis cache
+app.config["AI_CACHE_ENABLED"] = os.environ.get("AI_CACHE_ENABLED", "1") != "0"
+app.config["AI_CACHE_TTL"] = int(os.environ.get("AI_CACHE_TTL", 7 * 24 * 3600))  # seconds
+app.config["AI_CACHE_MAX_ENTRIES"] = int(os.environ.get("AI_CACHE_MAX_ENTRIES", 10000))
+
+# Process-wide OpenAI client: concurrency, rate limits (0 = unlimited), deadlines, retries, circuit breaker
+app.config["OPENAI_MAX_CONCURRENCY"] = int(os.environ.get("OPENAI_MAX_CONCURRENCY", 8))
+app.config["OPENAI_REQUESTS_PER_MINUTE"] = float(os.environ.get("OPENAI_REQUESTS_PER_MINUTE", 500))
+app.config["OPENAI_TOKENS_PER_MINUTE"] = float(os.environ.get("OPENAI_TOKENS_PER_MINUTE", 150000))
+app.config["OPENAI_TIMEOUT"] = float(os.environ.get("OPENAI_TIMEOUT", 60))  # seconds per attempt
+app.config["OPENAI_DEADLINE"] = float(os.environ.get("OPENAI_DEADLINE", 120))  # seconds per call, retries included
+app.config["OPENAI_MAX_RETRIES"] = int(os.environ.get("OPENAI_MAX_RETRIES", 4))
+app.config["OPENAI_BACKOFF_BASE"] = float(os.environ.get("OPENAI_BACKOFF_BASE", 0.5))  # seconds
+app.config["OPENAI_BACKOFF_MAX"] = float(os.environ.get("OPENAI_BACKOFF_MAX", 20))  # seconds
+app.config["OPENAI_BREAKER_THRESHOLD"] = int(os.environ.get("OPENAI_BREAKER_THRESHOLD", 5))
+app.config["OPENAI_BREAKER_RESET"] = float(os.environ.get("OPENAI_BREAKER_RESET", 30))  # seconds
+
+# keep-alive connections per host in the shared HTTP session used for NASA data
+app.config["HTTP_POOL_SIZE"] = int(os.environ.get("HTTP_POOL_SIZE", 10))
+
+# dashboard statistics summary table (run `flask rebuild-statistics` after enabling)
+app.config["STATS_SUMMARY_ENABLED"] = os.environ.get("STATS_SUMMARY_ENABLED", "0") == "1"
+
+# pushed mission status events (/mission/api/events); "auto" uses Postgres LISTEN/NOTIFY when available
+app.config["MISSION_EVENTS_BACKEND"] = os.environ.get("MISSION_EVENTS_BACKEND", "auto")  # auto, local or postgres
+app.config["MISSION_EVENTS_HEARTBEAT"] = float(os.environ.get("MISSION_EVENTS_HEARTBEAT", 15))  # seconds
+app.config["MISSION_EVENTS_MAX_AGE"] = float(os.environ.get("MISSION_EVENTS_MAX_AGE", 300))  # seconds before the client reconnects
+app.config["MISSION_EVENTS_QUEUE_SIZE"] = int(os.environ.get("MISSION_EVENTS_QUEUE_SIZE", 100))
+app.config["MISSION_EVENTS_POLL_INTERVAL"] = float(os.environ.get("MISSION_EVENTS_POLL_INTERVAL", 2))  # seconds, local backend only; 0 = this process's commits only
+
+# bulk mission import (/mission/api/import, `flask import-missions`)
+app.config["MISSION_IMPORT_BATCH_SIZE"] = int(os.environ.get("MISSION_IMPORT_BATCH_SIZE", 1000))  # records validated together
+app.config["MISSION_IMPORT_CHUNK_SIZE"] = int(os.environ.get("MISSION_IMPORT_CHUNK_SIZE", 500))  # rows per INSERT and commit
+app.config["MISSION_IMPORT_MAX_ERRORS"] = int(os.environ.get("MISSION_IMPORT_MAX_ERRORS", 1000))  # row errors listed in the report
+
+# streaming export (/mission/api/export, `flask export-missions`); Parquet needs pyarrow
+app.config["EXPORT_BATCH_SIZE"] = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))  # rows fetched per round trip
+app.config["EXPORT_PARQUET_ROW_GROUP_SIZE"] = int(os.environ.get("EXPORT_PARQUET_ROW_GROUP_SIZE", 10000))
+
+# add columns and indexes introduced since an existing database was created (see migrations.py)
+app.config["SCHEMA_AUTO_UPGRADE"] = os.environ.get("SCHEMA_AUTO_UPGRADE", "1") == "1"
+
 # initialize the app with the extension
 db.init_app(app)
 
@@ -38,7 +105,156 @@ app.register_blueprint(mission_bp, url_prefix='/mission')
 with app.app_context():
     # Import models to ensure tables are created
     import models  # noqa: F401
+    import services.statistics_service  # noqa: F401  (registers summary maintenance hooks)
+    import services.projection_service  # noqa: F401  (registers display projection hooks)
+    import services.mission_events  # noqa: F401  (registers status event hooks)
     db.create_all()
+    
+    if app.config["SCHEMA_AUTO_UPGRADE"]:
+        from migrations import upgrade_schema
+        upgrade_schema(db.engine)
+    
+    from services.search_service import install_search_index
+    install_search_index(db.engine)
+    
+    from services.container import init_services
+    init_services(app)
+
+@app.cli.command('analysis-workers')
+@click.option('--processes', '-n', default=2, show_default=True, help='Number of worker processes')
+@click.option('--poll-interval', default=2.0, show_default=True, help='Seconds between empty polls')
+def analysis_workers(processes, poll_interval):
+    """Run background workers for queued mission analyses"""
+    from services.analysis_worker import run_worker_pool
+    run_worker_pool(processes, poll_interval)
+
+@app.cli.command('upgrade-schema')
+def upgrade_schema_command():
+    """Apply pending schema migrations to an existing database"""
+    from migrations import upgrade_schema
+    applied = upgrade_schema(db.engine)
+    click.echo(f"Applied: {', '.join(applied)}" if applied else "Schema is up to date")
+
+@app.cli.command('rebuild-statistics')
+def rebuild_statistics():
+    """Recompute the dashboard statistics summary row"""
+    from services.statistics_service import StatisticsService
+    summary = StatisticsService().rebuild_summary()
+    click.echo(f"Statistics rebuilt: {summary.total_missions} missions (generation {summary.generation})")
+
+@app.cli.command('benchmark-simulation')
+@click.option('--trials', default=200000, show_default=True, help='Trials per run')
+@click.option('--processes', '-n', default=1, show_default=True, help='Worker processes')
+@click.option('--destination', default='mars', show_default=True, help='Body catalog key')
+def benchmark_simulation(trials, processes, destination):
+    """Measure Monte Carlo throughput in trials per second per core"""
+    from services.feasibility_scorer import nominal_physics
+    from services.monte_carlo import TrialInputs, benchmark
+    physics = nominal_physics({
+        'destination': destination, 'mission_duration': 900, 'crew_size': 4,
+        'spacecraft_type': 'orion', 'payload_mass': 20000, 'fuel_requirements': 50000
+    })
+    result = benchmark(TrialInputs.from_physics(physics), trials=trials, processes=processes)
+    click.echo(f"{result['trials']} trials on {result['processes']} process(es) in {result['seconds']} s: "
+               f"{result['trials_per_second']:,} trials/s, {result['trials_per_second_per_core']:,} trials/s/core")
+
+@app.cli.command('benchmark-services')
+@click.option('--iterations', default=2000, show_default=True, help='Lookups per measurement')
+def benchmark_services(iterations):
+    """Compare building the services per request with taking them from the container"""
+    from services.container import benchmark_construction
+    result = benchmark_construction(iterations)
+    click.echo(f"Per request: {result['constructed_us']} µs constructing services, "
+               f"{result['container_us']} µs from the container ({result['saved_us']} µs saved)")
+
+@app.cli.command('benchmark-search')
+@click.option('--iterations', default=200, show_default=True, help='Runs per query')
+@click.option('--seed-missions', default=0, show_default=True, help='Insert this many synthetic missions first (scratch databases only)')
+def benchmark_search(iterations, seed_missions):
+    """Measure /mission/api/search latency per query at the current table size"""
+    import time
+    from services.search_service import benchmark_search, seed_benchmark_missions
+    if seed_missions:
+        started = time.perf_counter()
+        seed_benchmark_missions(seed_missions)
+        click.echo(f"Seeded {seed_missions:,} missions in {time.perf_counter() - started:.0f} s")
+    result = benchmark_search(iterations)
+    click.echo(f"{result['missions']:,} missions, {result['backend']} text search, {result['iterations']} runs per query (ms):")
+    for name, stats in result['queries'].items():
+        click.echo(f"  {name:<20} p50 {stats['p50']:>7}  p95 {stats['p95']:>7}  p99 {stats['p99']:>7}  "
+                   f"max {stats['max']:>7}  ({stats['rows']} rows)")
+    click.echo(f"Overall p99: {result['p99']} ms")
+
+@app.cli.command('import-missions')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']), help='Input format (default: from the extension)')
+@click.option('--dry-run', is_flag=True, help='Validate without writing')
+@click.option('--errors-to', type=click.Path(dir_okay=False), help='Write the per-row error report to this JSON file')
+def import_missions(path, fmt, dry_run, errors_to):
+    """Import missions from a CSV or JSON Lines file"""
+    import json
+    from services.mission_import import ImportFormatError, MissionImporter, detect_format
+    try:
+        fmt = detect_format(fmt, filename=path)
+    except ImportFormatError as e:
+        raise click.UsageError(str(e))
+
+    with open(path, 'rb') as stream:
+        report = MissionImporter.from_config(app.config).import_stream(stream, fmt, dry_run=dry_run)
+    if not report['success']:
+        raise click.ClickException(report['error'])
+
+    click.echo(f"{report['processed']} records: {report['imported']} {'valid' if dry_run else 'imported'}, "
+               f"{report['failed']} failed in {report['duration_seconds']} s")
+    if errors_to:
+        with open(errors_to, 'w') as handle:
+            json.dump(report['errors'], handle, indent=2)
+    else:
+        for error in report['errors'][:20]:
+            click.echo(f"  line {error['line']}: {'; '.join(error['errors'])}")
+        if report['failed'] > 20:
+            click.echo(f"  ... {report['failed'] - 20} more (use --errors-to for the full report)")
+
+@app.cli.command('export-missions')
+@click.argument('output', type=click.Path(dir_okay=False, allow_dash=True))
+@click.option('--format', 'fmt', type=click.Choice(['jsonl', 'csv', 'parquet']), help='Output format (default: from the extension)')
+@click.option('--after-id', type=int, help='Resume after this mission id')
+@click.option('--limit', type=int, help='Export at most this many missions')
+@click.option('--destination', multiple=True, help='Only these destinations (repeatable)')
+@click.option('--status', multiple=True, help='Only these statuses (repeatable)')
+@click.option('--risk-level', multiple=True, help='Only these risk levels (repeatable)')
+@click.option('--launch-from', help='Earliest launch date, YYYY-MM-DD')
+@click.option('--launch-to', help='Latest launch date, YYYY-MM-DD')
+def export_missions(output, fmt, after_id, limit, destination, status, risk_level, launch_from, launch_to):
+    """Export missions with their latest analysis and simulation"""
+    from werkzeug.datastructures import MultiDict
+    from services.container import get_services
+    from utils.validators import ValidationError
+    if fmt is None:
+        extension = output.rsplit('.', 1)[-1].lower() if '.' in output else ''
+        fmt = extension if extension in ('jsonl', 'csv', 'parquet') else 'jsonl'
+
+    args = MultiDict([('destination', value) for value in destination]
+                     + [('status', value) for value in status]
+                     + [('risk_level', value) for value in risk_level])
+    for name, value in (('after_id', after_id), ('limit', limit), ('launch_from', launch_from), ('launch_to', launch_to)):
+        if value is not None:
+            args[name] = str(value)
+
+    try:
+        export = get_services().exports.export(args, fmt)
+    except ValidationError as e:
+        raise click.UsageError(str(e))
+
+    with click.open_file(output, 'wb') as handle:
+        try:
+            for chunk in export:
+                handle.write(chunk)
+        except Exception as e:
+            raise click.ClickException(f"Export stopped after {export.rows} missions: {e}. "
+                                       f"Resume with --after-id {export.last_id}")
+    click.echo(f"Exported {export.rows} missions as {fmt}"
+               + (f" (last id {export.last_id})" if export.last_id else ''), err=output == '-')
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
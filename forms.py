@@ -2,6 +2,7 @@ from flask_wtf import FlaskForm
 from wtforms import StringField, TextAreaField, DateField, IntegerField, SelectField, FloatField, SubmitField
 from wtforms.validators import DataRequired, Length, NumberRange, Optional
 from datetime import date, timedelta
+from services.body_catalog import destination_choices
 
 class MissionForm(FlaskForm):
     name = StringField('Mission Name', validators=[
@@ -14,18 +15,7 @@ class MissionForm(FlaskForm):
         Length(max=1000, message='Description must be less than 1000 characters')
     ])
     
-    destination = SelectField('Destination', validators=[DataRequired()], choices=[
-        ('mars', 'Mars'),
-        ('moon', 'Moon'),
-        ('venus', 'Venus'),
-        ('jupiter', 'Jupiter'),
-        ('saturn', 'Saturn'),
-        ('asteroid_belt', 'Asteroid Belt'),
-        ('europa', 'Europa (Jupiter Moon)'),
-        ('titan', 'Titan (Saturn Moon)'),
-        ('enceladus', 'Enceladus (Saturn Moon)'),
-        ('io', 'Io (Jupiter Moon)')
-    ])
+    destination = SelectField('Destination', validators=[DataRequired()], choices=destination_choices())
     
     launch_date = DateField('Launch Date', validators=[DataRequired()], 
                            default=date.today() + timedelta(days=30))
@@ -0,0 +1,175 @@
+"""Schema upgrades for databases created by an earlier version of the app.
+
+db.create_all() only creates missing tables; it never adds columns or
+indexes to tables that already exist. Each migration below brings one
+such change to an existing database. Migrations are idempotent (they
+inspect the schema before changing it), run in order, and are recorded in
+the schema_migration table so later starts skip them. On a fresh database
+create_all has already built everything and they only get recorded.
+
+Run automatically at startup (SCHEMA_AUTO_UPGRADE) or with
+`flask upgrade-schema`.
+"""
+import re
+import time
+import logging
+from datetime import datetime
+from typing import Callable, List, Tuple
+from sqlalchemy import Column, DateTime, MetaData, String, Table, inspect, text
+from sqlalchemy.schema import CreateIndex
+from app import db
+
+logger = logging.getLogger(__name__)
+
+# Any constant shared by every process; serializes upgrades across workers on Postgres
+_PG_LOCK_KEY = 72823501
+
+_bookkeeping = MetaData()
+schema_migration = Table(
+    'schema_migration', _bookkeeping,
+    Column('id', String(100), primary_key=True),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+def _columns(connection, table_name: str) -> set:
+    return {column['name'] for column in inspect(connection).get_columns(table_name)}
+
+def _has_table(connection, table_name: str) -> bool:
+    return inspect(connection).has_table(table_name)
+
+def _add_column(connection, table_name: str, column_name: str, default: str = None, references: str = None):
+    """ALTER TABLE ... ADD COLUMN with the type declared in models.py, unless the column exists"""
+    if not _has_table(connection, table_name) or column_name in _columns(connection, table_name):
+        return
+    column = db.metadata.tables[table_name].c[column_name]
+    quote = connection.dialect.identifier_preparer.quote
+    ddl = (f"ALTER TABLE {quote(table_name)} ADD COLUMN {quote(column_name)} "
+           f"{column.type.compile(dialect=connection.dialect)}")
+    if default is not None:
+        ddl += f" DEFAULT {default}"
+    if not column.nullable:
+        ddl += " NOT NULL"
+    if references:
+        ddl += f" REFERENCES {references}"
+    connection.execute(text(ddl))
+    logger.info(f"Added column {table_name}.{column_name}")
+
+def _analysis_job_force_refresh(connection):
+    # analyses can bypass the feasibility cache
+    _add_column(connection, 'analysis_job', 'force_refresh', default='false')
+
+def _mission_analysis_stage_timings(connection):
+    _add_column(connection, 'mission_analysis', 'stage_timings')
+
+def _analysis_job_batch_id(connection):
+    _add_column(connection, 'analysis_job', 'batch_id')
+
+def _mission_report_versions(connection):
+    # The first mission_report table held one unversioned report per
+    # mission with no input hash. Reports are regenerable, so it is rebuilt.
+    if _has_table(connection, 'mission_report') and 'input_hash' not in _columns(connection, 'mission_report'):
+        connection.execute(text('DROP TABLE mission_report'))
+        db.metadata.tables['mission_report'].create(connection)
+        logger.info("Rebuilt mission_report with version and input_hash columns")
+
+def _mission_latest_analysis(connection):
+    # Add the pointer and set it for every mission analyzed before it existed
+    _add_column(connection, 'mission', 'latest_analysis_id', references='mission_analysis (id)')
+    connection.execute(text(
+        "UPDATE mission SET latest_analysis_id = ("
+        "SELECT ma.id FROM mission_analysis ma WHERE ma.mission_id = mission.id "
+        "ORDER BY ma.created_at DESC, ma.id DESC LIMIT 1) "
+        "WHERE latest_analysis_id IS NULL"
+    ))
+
+def _simulation_monte_carlo(connection):
+    for name in ('trials', 'seed', 'failure_modes'):
+        _add_column(connection, 'simulation_result', name)
+
+def _simulation_series(connection):
+    for name in ('series_storage', 'trajectory_series', 'fuel_series'):
+        _add_column(connection, 'simulation_result', name)
+
+def _mission_display_projections(connection):
+    # Existing rows stay NULL; ProjectionService builds them on first read
+    for name in ('display_summary', 'display_detail'):
+        _add_column(connection, 'mission', name)
+
+MIGRATIONS: Tuple[Tuple[str, Callable], ...] = (
+    ('0001_analysis_job_force_refresh', _analysis_job_force_refresh),
+    ('0002_mission_analysis_stage_timings', _mission_analysis_stage_timings),
+    ('0003_analysis_job_batch_id', _analysis_job_batch_id),
+    ('0004_mission_report_versions', _mission_report_versions),
+    ('0005_mission_latest_analysis', _mission_latest_analysis),
+    ('0006_simulation_monte_carlo', _simulation_monte_carlo),
+    ('0007_simulation_series', _simulation_series),
+    ('0008_mission_display_projections', _mission_display_projections),
+)
+
+def _create_missing_indexes(engine) -> List[str]:
+    """Indexes declared in models.py but missing from existing tables.
+
+    On Postgres they are built CONCURRENTLY (outside a transaction) so a
+    large table stays writable while its index is built.
+    """
+    created = []
+    postgres = engine.dialect.name == 'postgresql'
+    options = {'isolation_level': 'AUTOCOMMIT'} if postgres else {}
+    with engine.connect().execution_options(**options) as connection:
+        for table in db.metadata.sorted_tables:
+            if not _has_table(connection, table.name):
+                continue
+            existing = {index['name'] for index in inspect(connection).get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing:
+                    continue
+                ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect))
+                if postgres:
+                    ddl = re.sub(r'^CREATE (UNIQUE )?INDEX', r'CREATE \1INDEX CONCURRENTLY', ddl)
+                connection.execute(text(ddl))
+                if not postgres:
+                    connection.commit()
+                created.append(index.name)
+                logger.info(f"Created index {index.name}")
+    return created
+
+def _applied(engine) -> set:
+    with engine.connect() as connection:
+        return {row.id for row in connection.execute(schema_migration.select())}
+
+def _run(engine, migration_id: str, step: Callable):
+    with engine.begin() as connection:
+        step(connection)
+        connection.execute(schema_migration.insert().values(id=migration_id, applied_at=datetime.utcnow()))
+
+def upgrade_schema(engine) -> List[str]:
+    """Apply pending migrations and missing indexes; returns what was done"""
+    done = []
+    with engine.connect() as lock_connection:
+        postgres = engine.dialect.name == 'postgresql'
+        if postgres:
+            lock_connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': _PG_LOCK_KEY})
+        try:
+            _bookkeeping.create_all(engine)
+            applied = _applied(engine)
+            for migration_id, step in MIGRATIONS:
+                if migration_id in applied:
+                    continue
+                try:
+                    _run(engine, migration_id, step)
+                except Exception as e:
+                    # Another worker may have run it between our check and our change
+                    # (SQLite has no advisory lock); steps are idempotent, so retry once
+                    time.sleep(0.5)
+                    if migration_id in _applied(engine):
+                        continue
+                    logger.warning(f"Migration {migration_id} failed ({e}); retrying")
+                    _run(engine, migration_id, step)
+                done.append(migration_id)
+                logger.info(f"Applied migration {migration_id}")
+            done += _create_missing_indexes(engine)
+        finally:
+            if postgres:
+                lock_connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': _PG_LOCK_KEY})
+                lock_connection.commit()
+    return done
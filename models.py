@@ -1,6 +1,7 @@
 from app import db
 from datetime import datetime
 from sqlalchemy import Text, JSON
+from sqlalchemy.orm import deferred
 import enum
 
 class MissionStatus(enum.Enum):
@@ -15,6 +16,12 @@ class RiskLevel(enum.Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
+class JobStatus(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
 class Mission(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -46,6 +53,32 @@ class Mission(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     analyzed_at = db.Column(db.DateTime)
     
+    # Denormalized pointer to the newest MissionAnalysis so views can load it
+    # with the mission in one query instead of walking the whole history
+    latest_analysis_id = db.Column(db.Integer, db.ForeignKey(
+        'mission_analysis.id', use_alter=True, name='fk_mission_latest_analysis'
+    ))
+    latest_analysis = db.relationship('MissionAnalysis', foreign_keys=[latest_analysis_id], post_update=True)
+    
+    # Display projections written alongside the data they format (see
+    # services.projection_service); the detail one is only loaded by result pages
+    display_summary = db.Column(JSON)
+    display_detail = deferred(db.Column(JSON))
+    
+    __table_args__ = (
+        # Keyset pagination for the newest-first history list
+        db.Index('ix_mission_created', 'created_at', 'id'),
+        # Search filters, each ending in its sort key so filtered pages stay range scans
+        db.Index('ix_mission_destination_status', 'destination', 'status', 'created_at'),
+        db.Index('ix_mission_status_created', 'status', 'created_at'),
+        db.Index('ix_mission_risk_feasibility', 'risk_level', 'feasibility_score'),
+        db.Index('ix_mission_feasibility', 'feasibility_score', 'id'),
+        db.Index('ix_mission_launch_date', 'launch_date', 'id'),
+        db.Index('ix_mission_name', 'name', 'id'),
+        # Recently changed missions, polled for status events without Postgres NOTIFY
+        db.Index('ix_mission_updated', 'updated_at'),
+    )
+    
     def __repr__(self):
         return f'<Mission {self.name}>'
 
@@ -65,9 +98,25 @@ class MissionAnalysis(db.Model):
     
     # Metadata
     analysis_version = db.Column(db.String(50), default='1.0')
+    stage_timings = db.Column(JSON)  # milliseconds per pipeline stage
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
-    mission = db.relationship('Mission', backref=db.backref('analyses', lazy=True))
+    # Full history is a query, so it is only loaded when a history view asks for it
+    mission = db.relationship('Mission', foreign_keys=[mission_id], backref=db.backref(
+        'analyses', lazy='dynamic', order_by='MissionAnalysis.created_at.desc()'
+    ))
+    
+    __table_args__ = (
+        db.Index('ix_mission_analysis_latest', 'mission_id', 'created_at'),
+    )
+    
+    @classmethod
+    def latest_for(cls, mission_id: int):
+        """Newest analysis for a mission via the (mission_id, created_at) index"""
+        return (cls.query
+                .filter_by(mission_id=mission_id)
+                .order_by(cls.created_at.desc(), cls.id.desc())
+                .first())
 
 class SimulationResult(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -84,6 +133,169 @@ class SimulationResult(db.Model):
     temperature_variations = db.Column(JSON)
     micrometeorite_risk = db.Column(db.Float)
     
+    # Monte Carlo run
+    trials = db.Column(db.Integer)
+    seed = db.Column(db.BigInteger)
+    failure_modes = db.Column(JSON)  # fraction of trials failing for each cause
+    
+    # Time series in the binary format of services.series_format; deferred so
+    # summary queries never read them. In 'file' storage the blobs stay NULL
+    # and the series live in side files named after the simulation id.
+    series_storage = db.Column(db.String(10))
+    trajectory_series = deferred(db.Column(db.LargeBinary))
+    fuel_series = deferred(db.Column(db.LargeBinary))
+    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     mission = db.relationship('Mission', backref=db.backref('simulation_results', lazy=True))
+    
+    __table_args__ = (
+        # Newest simulation per mission (exports join it for every mission)
+        db.Index('ix_simulation_result_mission', 'mission_id', 'id'),
+    )
+    
+    def to_dict(self):
+        return {
+            'simulation_id': self.id,
+            'mission_id': self.mission_id,
+            'trials': self.trials,
+            'seed': self.seed,
+            'success_probability': self.success_probability,
+            'failure_modes': self.failure_modes,
+            'radiation_exposure': self.radiation_exposure,
+            'micrometeorite_risk': self.micrometeorite_risk,
+            'trajectory_data': self.trajectory_data,
+            'fuel_consumption': self.fuel_consumption,
+            'mission_timeline': self.mission_timeline,
+            'temperature_variations': self.temperature_variations,
+            'series_storage': self.series_storage,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+class AnalysisJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    mission_id = db.Column(db.Integer, db.ForeignKey('mission.id'), nullable=False, index=True)
+    
+    # Queue State
+    status = db.Column(db.Enum(JobStatus), default=JobStatus.QUEUED, nullable=False, index=True)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    max_attempts = db.Column(db.Integer, default=3, nullable=False)
+    available_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)  # earliest time a worker may claim it
+    
+    # Lease (visibility timeout)
+    locked_by = db.Column(db.String(100))
+    locked_until = db.Column(db.DateTime)
+    
+    # Skip the AI analysis cache for this run
+    force_refresh = db.Column(db.Boolean, default=False, nullable=False)
+    
+    # Jobs queued together by the batch endpoint share a batch id
+    batch_id = db.Column(db.String(36), index=True)
+    
+    # Outcome
+    analysis_id = db.Column(db.Integer, db.ForeignKey('mission_analysis.id'))
+    last_error = db.Column(Text)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    mission = db.relationship('Mission', backref=db.backref('analysis_jobs', lazy=True))
+    
+    __table_args__ = (
+        db.Index('ix_analysis_job_claim', 'status', 'available_at'),
+    )
+    
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'mission_id': self.mission_id,
+            'batch_id': self.batch_id,
+            'status': self.status.value,
+            'attempts': self.attempts,
+            'max_attempts': self.max_attempts,
+            'last_error': self.last_error,
+            'analysis_id': self.analysis_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class AnalysisCacheEntry(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    cache_key = db.Column(db.String(64), nullable=False, unique=True)  # sha256 hex digest
+    model = db.Column(db.String(50), nullable=False)
+    
+    # Stored _process_ai_response output
+    payload = db.Column(JSON, nullable=False)
+    
+    hit_count = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    last_accessed_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    expires_at = db.Column(db.DateTime, index=True)
+
+class MissionStatistics(db.Model):
+    """Single-row summary of mission counts, maintained on every flush"""
+    id = db.Column(db.Integer, primary_key=True)
+    
+    total_missions = db.Column(db.Integer, default=0, nullable=False)
+    
+    # Status counts
+    draft_missions = db.Column(db.Integer, default=0, nullable=False)
+    analyzing_missions = db.Column(db.Integer, default=0, nullable=False)
+    completed_missions = db.Column(db.Integer, default=0, nullable=False)
+    failed_missions = db.Column(db.Integer, default=0, nullable=False)
+    
+    # Risk level counts
+    low_risk = db.Column(db.Integer, default=0, nullable=False)
+    medium_risk = db.Column(db.Integer, default=0, nullable=False)
+    high_risk = db.Column(db.Integer, default=0, nullable=False)
+    critical_risk = db.Column(db.Integer, default=0, nullable=False)
+    
+    # Running sums for the average feasibility score
+    feasibility_sum = db.Column(db.Float, default=0, nullable=False)
+    feasibility_count = db.Column(db.Integer, default=0, nullable=False)
+    
+    # Bumped on every change, usable as a cache validator
+    generation = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class MissionReport(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    mission_id = db.Column(db.Integer, db.ForeignKey('mission.id'), nullable=False)
+    
+    # Versions count up per mission; older ones are kept for diffing
+    version = db.Column(db.Integer, default=1, nullable=False)
+    
+    # sha256 of the report inputs: mission fields, updated_at and the latest analysis
+    input_hash = db.Column(db.String(64), nullable=False)
+    analysis_id = db.Column(db.Integer, db.ForeignKey('mission_analysis.id'))
+    mission_updated_at = db.Column(db.DateTime)
+    
+    # Report sections keyed by name (executive_summary, mission_overview, ...)
+    content = db.Column(JSON, nullable=False)
+    model = db.Column(db.String(50))
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    mission = db.relationship('Mission', backref=db.backref('reports', lazy=True))
+    
+    __table_args__ = (
+        db.UniqueConstraint('mission_id', 'version', name='uq_mission_report_version'),
+        db.Index('ix_mission_report_lookup', 'mission_id', 'input_hash'),
+    )
+    
+    def to_dict(self, include_content: bool = False):
+        data = {
+            'report_id': self.id,
+            'mission_id': self.mission_id,
+            'version': self.version,
+            'input_hash': self.input_hash,
+            'analysis_id': self.analysis_id,
+            'model': self.model,
+            'mission_updated_at': self.mission_updated_at.isoformat() if self.mission_updated_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+        if include_content:
+            data['content'] = self.content
+        return data
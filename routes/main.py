@@ -1,5 +1,5 @@
 from flask import Blueprint, render_template, request, flash, redirect, url_for
-from utils.formatters import MissionFormatter
+from services.container import get_services
 import logging
 
 main_bp = Blueprint('main', __name__)
@@ -9,17 +9,14 @@ logger = logging.getLogger(__name__)
 def index():
     """Main landing page"""
     try:
-        # Import here to avoid circular import
-        from services.mission_service import MissionService
-        mission_service = MissionService()
+        services = get_services()
+        mission_service = services.missions
         
         # Get recent missions and statistics
         recent_missions = mission_service.get_mission_history(limit=5)
         statistics = mission_service.get_mission_statistics()
         
-        formatted_missions = []
-        for mission in recent_missions:
-            formatted_missions.append(MissionFormatter.format_mission_data(mission))
+        formatted_missions = services.projections.summaries(recent_missions)
         
         return render_template('index.html', 
                              recent_missions=formatted_missions,
@@ -39,6 +36,9 @@ def about():
 @main_bp.route('/api/status')
 def api_status():
     """API status endpoint"""
+    from services.analysis_cache import AnalysisCache
+    from services.mission_events import get_event_bus
+    from services.openai_pool import get_client_pool_stats
     return {
         'status': 'operational',
         'services': {
@@ -46,6 +46,9 @@ def api_status():
             'nasa_api': 'operational',
             'ai_service': 'operational'
         },
+        'ai_cache': AnalysisCache.get_stats(),
+        'openai_client': get_client_pool_stats(),
+        'mission_events': get_event_bus().get_stats(),
         'version': '1.0.0'
     }
 
@@ -1,7 +1,11 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify
+from flask import Blueprint, Response, make_response, render_template, request, flash, redirect, url_for, jsonify, stream_with_context
 from forms import MissionForm
 from utils.formatters import MissionFormatter, DataFormatter
 from utils.validators import MissionValidator, ValidationError
+from utils import http_cache
+from services.container import get_services
+import json
+import time
 import logging
 
 mission_bp = Blueprint('mission', __name__)
@@ -14,9 +18,7 @@ def create():
     
     if form.validate_on_submit():
         try:
-            # Import here to avoid circular import
-            from services.mission_service import MissionService
-            mission_service = MissionService()
+            mission_service = get_services().missions
             
             # Validate mission data
             mission_data = {
@@ -47,36 +49,56 @@ def create():
     
     return render_template('mission/create.html', form=form)
 
+def _mission_validators(kind: str, mission_id: int):
+    """Validators for a mission page from its timestamps alone, without loading the row"""
+    from models import Mission
+    from app import db
+    row = db.session.query(Mission.updated_at, Mission.analyzed_at, Mission.latest_analysis_id).filter(
+        Mission.id == mission_id
+    ).first()
+    if row is None:
+        return None
+    last_modified = max((value for value in (row.updated_at, row.analyzed_at) if value), default=None)
+    return http_cache.make_validators(kind, mission_id, *row, last_modified=last_modified)
+
 @mission_bp.route('/<int:mission_id>')
 def view(mission_id):
     """View mission details"""
     try:
+        from sqlalchemy.orm import joinedload
         from models import Mission
-        mission = Mission.query.get_or_404(mission_id)
+        validators = _mission_validators('view', mission_id)
+        if validators:
+            cached = http_cache.not_modified(validators, http_cache.HTML_POLICY, html=True)
+            if cached:
+                return cached
+        
+        mission = (Mission.query
+                   .options(joinedload(Mission.latest_analysis))
+                   .filter_by(id=mission_id)
+                   .first_or_404())
         
-        formatted_mission = MissionFormatter.format_mission_data(mission)
+        projections = get_services().projections
+        formatted_mission = projections.summary(mission)
+        
+        latest_analysis = mission.latest_analysis
         
         # Get formatted analysis data if available
         analysis_data = {}
-        if mission.analyses:
-            latest_analysis = mission.analyses[-1]  # Get most recent analysis
+        if latest_analysis:
             analysis_data = MissionFormatter.format_analysis_data(latest_analysis)
         
-        # Format NASA data
-        nasa_data = {}
-        if mission.nasa_data:
-            nasa_data = MissionFormatter.format_nasa_data(mission.nasa_data)
-        
-        # Format AI analysis
-        ai_analysis = {}
-        if mission.ai_analysis:
-            ai_analysis = MissionFormatter.format_ai_analysis(mission.ai_analysis)
+        # Formatted NASA data and AI analysis, stored when they were written
+        detail = projections.detail(mission)
+        nasa_data = detail['nasa_data']
+        ai_analysis = detail['analysis']
         
-        return render_template('mission/view.html',
-                             mission=formatted_mission,
-                             analysis_data=analysis_data,
-                             nasa_data=nasa_data,
-                             ai_analysis=ai_analysis)
+        response = make_response(render_template('mission/view.html',
+                                                 mission=formatted_mission,
+                                                 analysis_data=analysis_data,
+                                                 nasa_data=nasa_data,
+                                                 ai_analysis=ai_analysis))
+        return http_cache.with_validators(response, validators, http_cache.HTML_POLICY)
     
     except Exception as e:
         logger.error(f"Error viewing mission {mission_id}: {e}")
@@ -85,74 +107,241 @@ def view(mission_id):
 
 @mission_bp.route('/<int:mission_id>/analyze', methods=['POST'])
 def analyze(mission_id):
-    """Analyze mission"""
+    """Queue mission analysis"""
+    wants_json = request.is_json or request.accept_mimetypes.best == 'application/json'
+    payload = request.get_json(silent=True) or {}
+    force_refresh = str(payload.get('force', request.values.get('force', ''))).lower() in ('1', 'true', 'yes')
     try:
-        from services.mission_service import MissionService
-        mission_service = MissionService()
-        result = mission_service.analyze_mission(mission_id)
+        mission_service = get_services().missions
+        result = mission_service.queue_analysis(mission_id, force_refresh=force_refresh)
         
         if result['success']:
-            flash('Mission analysis completed successfully!', 'success')
-            return redirect(url_for('mission.results', mission_id=mission_id))
+            job = result['job']
+            if wants_json:
+                response = jsonify(job.to_dict())
+                response.status_code = 202
+                response.headers['Location'] = url_for('mission.api_job', job_id=job.id)
+                return response
+            
+            flash('Mission analysis queued. Results will appear here when ready.', 'info')
+            return redirect(url_for('mission.view', mission_id=mission_id))
         else:
+            if wants_json:
+                return jsonify({'error': result['error']}), 400
             flash(f'Analysis failed: {result["error"]}', 'error')
             return redirect(url_for('mission.view', mission_id=mission_id))
     
     except Exception as e:
         logger.error(f"Error analyzing mission {mission_id}: {e}")
+        if wants_json:
+            return jsonify({'error': 'Unable to queue analysis'}), 500
         flash('An error occurred during mission analysis', 'error')
         return redirect(url_for('mission.view', mission_id=mission_id))
 
+@mission_bp.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """Queue analysis for many missions at once"""
+    try:
+        from flask import current_app
+        from models import Mission, MissionStatus
+        
+        payload = request.get_json(silent=True) or {}
+        max_missions = current_app.config.get('ANALYSIS_BATCH_MAX_MISSIONS', 500)
+        
+        if payload.get('mission_ids'):
+            mission_ids = [int(mission_id) for mission_id in payload['mission_ids']]
+        elif payload.get('status'):
+            status = MissionStatus(payload['status'])
+            mission_ids = [row.id for row in Mission.query.with_entities(Mission.id).filter(
+                Mission.status == status
+            ).order_by(Mission.id).limit(max_missions)]
+        else:
+            return jsonify({'error': 'Provide mission_ids or a status filter'}), 400
+        
+        if not mission_ids:
+            return jsonify({'error': 'No missions matched'}), 400
+        if len(mission_ids) > max_missions:
+            return jsonify({'error': f'At most {max_missions} missions per batch'}), 400
+        
+        mission_service = get_services().missions
+        result = mission_service.queue_batch_analysis(
+            mission_ids, force_refresh=bool(payload.get('force'))
+        )
+        
+        if not result['success']:
+            return jsonify({'error': result['error']}), 400
+        
+        response = jsonify({
+            'batch_id': result['batch_id'],
+            'queued': len(result['jobs']),
+            'jobs': [job.to_dict() for job in result['jobs']]
+        })
+        response.status_code = 202
+        response.headers['Location'] = url_for('mission.api_batch', batch_id=result['batch_id'])
+        return response
+    
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': f'Invalid request: {e}'}), 400
+    except Exception as e:
+        logger.error(f"Error queueing analysis batch: {e}")
+        return jsonify({'error': 'Unable to queue batch analysis'}), 500
+
 @mission_bp.route('/<int:mission_id>/results')
 def results(mission_id):
     """View mission analysis results"""
     try:
+        from sqlalchemy.orm import load_only
         from models import Mission
-        mission = Mission.query.get_or_404(mission_id)
+        validators = _mission_validators('results', mission_id)
+        if validators:
+            cached = http_cache.not_modified(validators, http_cache.HTML_POLICY, html=True)
+            if cached:
+                return cached
+        
+        # Only the projections are loaded; the source JSON is fetched only if one needs rebuilding
+        mission = (Mission.query
+                   .options(load_only(Mission.id, Mission.display_summary, Mission.display_detail))
+                   .filter_by(id=mission_id)
+                   .first_or_404())
+        projections = get_services().projections
+        detail = projections.detail(mission)
         
-        if not mission.ai_analysis:
+        if not detail['analysis']:
             flash('Mission analysis not available', 'warning')
             return redirect(url_for('mission.view', mission_id=mission_id))
         
-        formatted_mission = MissionFormatter.format_mission_data(mission)
-        formatted_analysis = MissionFormatter.format_ai_analysis(mission.ai_analysis)
-        formatted_nasa_data = MissionFormatter.format_nasa_data(mission.nasa_data or {})
+        formatted_mission = projections.summary(mission)
+        formatted_analysis = detail['analysis']
+        formatted_nasa_data = detail['nasa_data']
         
-        return render_template('mission/results.html',
-                             mission=formatted_mission,
-                             analysis=formatted_analysis,
-                             nasa_data=formatted_nasa_data)
+        response = make_response(render_template('mission/results.html',
+                                                 mission=formatted_mission,
+                                                 analysis=formatted_analysis,
+                                                 nasa_data=formatted_nasa_data))
+        return http_cache.with_validators(response, validators, http_cache.HTML_POLICY)
     
     except Exception as e:
         logger.error(f"Error viewing results for mission {mission_id}: {e}")
         flash('Error loading mission results', 'error')
         return redirect(url_for('mission.view', mission_id=mission_id))
 
+@mission_bp.route('/<int:mission_id>/simulate', methods=['POST'])
+def simulate(mission_id):
+    """Run a Monte Carlo simulation of the mission"""
+    wants_json = request.is_json or request.accept_mimetypes.best == 'application/json'
+    params = (request.get_json(silent=True) or {}) if request.is_json else request.form
+    
+    try:
+        trials = params.get('trials')
+        seed = params.get('seed')
+        outcome = get_services().simulations.simulate_mission(
+            mission_id,
+            trials=int(trials) if trials not in (None, '') else None,
+            seed=int(seed) if seed not in (None, '') else None
+        )
+    except ValueError:
+        outcome = {'success': False, 'error': 'trials and seed must be integers'}
+    
+    if not outcome['success']:
+        status = 404 if outcome['error'] == 'Mission not found' else 400
+        if wants_json:
+            return jsonify({'error': outcome['error']}), status
+        flash(f'Simulation failed: {outcome["error"]}', 'error')
+        return redirect(url_for('mission.view', mission_id=mission_id))
+    
+    simulation = outcome['simulation']
+    if wants_json:
+        return jsonify(simulation.to_dict()), 201
+    
+    flash(f'Simulation complete: {simulation.success_probability:.1%} success over {simulation.trials:,} trials', 'success')
+    return redirect(url_for('mission.view', mission_id=mission_id))
+
+@mission_bp.route('/api/simulations/<int:simulation_id>/series/<name>')
+def api_simulation_series(simulation_id, name):
+    """Downsampled simulation time series (?points=&start=&stop=, ?format=binary for the packed format)"""
+    from services.series_format import encode
+    from services.simulation_service import SERIES_COLUMNS
+
+    if name not in SERIES_COLUMNS:
+        return jsonify({'error': f"Unknown series; use one of: {', '.join(SERIES_COLUMNS)}"}), 404
+
+    points = request.args.get('points', 500, type=int)
+    if not 1 <= points <= 10000:
+        return jsonify({'error': 'points must be between 1 and 10000'}), 400
+
+    view = get_services().simulations.load_series(simulation_id, name)
+    if view is None:
+        return jsonify({'error': 'Series not found'}), 404
+
+    columns = view.downsample(points, request.args.get('start', type=int), request.args.get('stop', type=int))
+    if request.args.get('format') == 'binary':
+        return Response(encode(columns, dtype=view.dtype.name), mimetype='application/octet-stream')
+
+    return jsonify({
+        'simulation_id': simulation_id,
+        'series': name,
+        'rows': len(view),
+        'columns': {column: values.tolist() for column, values in columns.items()}
+    })
+
 @mission_bp.route('/history')
 def history():
     """View mission history"""
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = 10
-        
-        from models import Mission
-        missions_pagination = Mission.query.order_by(Mission.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
+        page = get_services().history.get_page(
+            cursor=request.args.get('cursor') or None,
+            direction=request.args.get('direction', 'next'),
+            per_page=10
         )
         
-        formatted_missions = []
-        for mission in missions_pagination.items:
-            formatted_missions.append(MissionFormatter.format_mission_data(mission))
+        formatted_missions = get_services().projections.summaries(page.missions)
         
         return render_template('mission/history.html',
                              missions=formatted_missions,
-                             pagination=missions_pagination)
+                             pagination=page)
     
     except Exception as e:
         logger.error(f"Error loading mission history: {e}")
         flash('Error loading mission history', 'error')
         return render_template('mission/history.html', missions=[], pagination=None)
 
+@mission_bp.route('/api/history')
+def api_history():
+    """Keyset-paginated mission history via API"""
+    try:
+        per_page = min(max(request.args.get('per_page', 25, type=int), 1), 100)
+        history_service = get_services().history
+        page = history_service.get_page(
+            cursor=request.args.get('cursor') or None,
+            direction=request.args.get('direction', 'next'),
+            per_page=per_page
+        )
+        
+        return jsonify({
+            'missions': [history_service.to_dict(mission) for mission in page.missions],
+            'next_cursor': page.next_cursor,
+            'prev_cursor': page.prev_cursor,
+            'approximate_total': page.approximate_total
+        })
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error loading mission history: {e}")
+        return jsonify({'error': 'Unable to load mission history'}), 500
+
+@mission_bp.route('/api/search')
+def api_search():
+    """Search missions with filters, sorting and full-text matching"""
+    try:
+        return jsonify(get_services().search.search(request.args))
+    
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error searching missions: {e}")
+        return jsonify({'error': 'Unable to search missions'}), 500
+
 @mission_bp.route('/compare')
 def compare():
     """Compare missions"""
@@ -163,8 +352,7 @@ def compare():
             flash('Please select at least 2 missions to compare', 'warning')
             return redirect(url_for('mission.history'))
         
-        from services.mission_service import MissionService
-        mission_service = MissionService()
+        mission_service = get_services().missions
         comparison_data = mission_service.compare_missions(mission_ids)
         
         if 'error' in comparison_data:
@@ -180,56 +368,349 @@ def compare():
 
 @mission_bp.route('/<int:mission_id>/report')
 def report(mission_id):
-    """Generate mission report"""
+    """Show the mission report, streaming it in when none is stored yet"""
     try:
-        from services.mission_service import MissionService
-        mission_service = MissionService()
+        from models import Mission, MissionStatus
+        mission_service = get_services().missions
+        mission = Mission.query.get_or_404(mission_id)
+        
+        # Render the page right away and let the browser fill in sections over SSE;
+        # ?stream=0 keeps the old blocking behaviour
+        if (mission.status == MissionStatus.COMPLETED
+                and request.args.get('stream', '1') != '0'
+                and mission_service.get_stored_report(mission) is None):
+            return render_template('mission/report.html',
+                                 mission=get_services().projections.summary(mission),
+                                 report=None,
+                                 stream_url=url_for('mission.report_stream', mission_id=mission.id))
+        
         report_data = mission_service.generate_mission_report(mission_id)
         
         if not report_data['success']:
             flash(f'Report generation failed: {report_data["error"]}', 'error')
             return redirect(url_for('mission.view', mission_id=mission_id))
         
-        formatted_mission = MissionFormatter.format_mission_data(report_data['mission'])
+        formatted_mission = get_services().projections.summary(report_data['mission'])
         
         return render_template('mission/report.html',
                              mission=formatted_mission,
-                             report=report_data['report'])
+                             report=report_data['report'],
+                             stream_url=None)
     
     except Exception as e:
         logger.error(f"Error generating report for mission {mission_id}: {e}")
         flash('Error generating mission report', 'error')
         return redirect(url_for('mission.view', mission_id=mission_id))
 
+@mission_bp.route('/<int:mission_id>/report/stream')
+def report_stream(mission_id):
+    """Stream report sections as Server-Sent Events"""
+    mission_service = get_services().missions
+    
+    def generate():
+        try:
+            for event, data in mission_service.stream_mission_report(mission_id):
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            logger.error(f"Error streaming report for mission {mission_id}: {e}")
+            yield f"event: error\ndata: {json.dumps({'error': 'Report generation failed'})}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@mission_bp.route('/api/reports/<int:mission_id>')
+def api_reports(mission_id):
+    """List stored report versions for a mission"""
+    try:
+        from models import Mission
+        mission = Mission.query.get_or_404(mission_id)
+        
+        return jsonify({
+            'mission_id': mission.id,
+            'versions': [report.to_dict() for report in get_services().reports.versions(mission.id)]
+        })
+    
+    except Exception as e:
+        logger.error(f"Error listing reports for mission {mission_id}: {e}")
+        return jsonify({'error': 'Mission not found'}), 404
+
+@mission_bp.route('/api/reports/<int:mission_id>/<int:version>')
+def api_report_version(mission_id, version):
+    """Get one stored report version"""
+    report = get_services().reports.get_version(mission_id, version)
+    
+    if report is None:
+        return jsonify({'error': 'Report version not found'}), 404
+    
+    return jsonify(report.to_dict(include_content=True))
+
+@mission_bp.route('/api/reports/<int:mission_id>/diff')
+def api_report_diff(mission_id):
+    """Diff two report versions (to defaults to the latest, from to the version before to)"""
+    store = get_services().reports
+    
+    old_version = request.args.get('from', type=int)
+    new_version = request.args.get('to', type=int)
+    for name, value in (('from', old_version), ('to', new_version)):
+        if value is None and request.args.get(name) is not None:
+            return jsonify({'error': f"'{name}' must be a report version number"}), 400
+    
+    if old_version is None or new_version is None:
+        versions = [report.version for report in store.versions(mission_id)]
+        if new_version is None:
+            if not versions:
+                return jsonify({'error': 'No stored reports for this mission'}), 404
+            new_version = versions[0]
+        if old_version is None:
+            older = [version for version in versions if version < new_version]
+            if not older:
+                return jsonify({'error': 'At least two report versions are needed for a diff'}), 400
+            old_version = older[0]
+    
+    old = store.get_version(mission_id, old_version)
+    new = store.get_version(mission_id, new_version)
+    missing = [version for version, report in ((old_version, old), (new_version, new)) if report is None]
+    if missing:
+        return jsonify({'error': f"Report version not found: {', '.join(map(str, missing))}"}), 404
+    
+    return jsonify(store.diff(old, new))
+
 @mission_bp.route('/api/status/<int:mission_id>')
 def api_status(mission_id):
     """Get mission status via API"""
     try:
+        from sqlalchemy.orm import load_only
         from models import Mission
-        mission = Mission.query.get_or_404(mission_id)
+        mission = Mission.query.options(load_only(
+            Mission.name, Mission.status, Mission.feasibility_score, Mission.risk_level,
+            Mission.created_at, Mission.analyzed_at, Mission.updated_at
+        )).filter_by(id=mission_id).first_or_404()
+        job = get_services().jobs.get_latest_job(mission.id)
+        job_data = job.to_dict() if job else None
         
-        return jsonify({
+        validators = http_cache.make_validators('status', mission.id, mission.updated_at, job_data)
+        cached = http_cache.not_modified(validators, http_cache.STATUS_POLICY)
+        if cached:
+            return cached
+        
+        response = jsonify({
             'mission_id': mission.id,
             'name': mission.name,
             'status': mission.status.value,
             'feasibility_score': mission.feasibility_score,
             'risk_level': mission.risk_level.value if mission.risk_level else None,
             'created_at': mission.created_at.isoformat(),
-            'analyzed_at': mission.analyzed_at.isoformat() if mission.analyzed_at else None
+            'analyzed_at': mission.analyzed_at.isoformat() if mission.analyzed_at else None,
+            'job': job_data
         })
+        return http_cache.with_validators(response, validators, http_cache.STATUS_POLICY)
     
     except Exception as e:
         logger.error(f"Error getting mission status: {e}")
         return jsonify({'error': 'Mission not found'}), 404
 
+@mission_bp.route('/api/export')
+def api_export():
+    """Stream missions with their latest analysis and simulation.
+
+    ?format=jsonl|csv|parquet (Parquet needs pyarrow on the server). Takes
+    the search filters (destination, status, risk_level, min/max_feasibility,
+    launch_from/to, q), limit, and after_id to resume after the last id
+    received. Rows come in id order.
+    """
+    from datetime import datetime
+    try:
+        export = get_services().exports.export(request.args, request.args.get('format', 'jsonl'))
+    except ValidationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    filename = f"missions-{datetime.utcnow():%Y%m%d%H%M%S}.{export.format}"
+    return Response(stream_with_context(iter(export)), mimetype=export.mimetype,
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"',
+                             'Cache-Control': 'no-store', 'X-Accel-Buffering': 'no'})
+
+@mission_bp.route('/api/import', methods=['POST'])
+def api_import():
+    """Bulk-import missions from CSV or JSON Lines.
+
+    Send the file as multipart field "file" or as the raw request body
+    (text/csv or application/x-ndjson). ?format= overrides detection and
+    ?dry_run=1 only validates. Invalid rows are listed by line number in
+    the report; the rest are imported.
+    """
+    try:
+        from flask import current_app
+        from services.mission_import import ImportFormatError, MissionImporter, detect_format
+
+        upload = request.files.get('file')
+        try:
+            if upload is not None:
+                fmt = detect_format(request.args.get('format'), filename=upload.filename, content_type=upload.mimetype)
+                stream = upload.stream
+            else:
+                fmt = detect_format(request.args.get('format'), content_type=request.mimetype)
+                stream = request.stream
+        except ImportFormatError as e:
+            return jsonify({'error': str(e)}), 400
+
+        dry_run = request.args.get('dry_run', '').lower() in ('1', 'true', 'yes')
+        report = MissionImporter.from_config(current_app.config).import_stream(stream, fmt, dry_run=dry_run)
+
+        if not report['success']:
+            return jsonify(report), 400
+        return jsonify(report)
+
+    except Exception as e:
+        logger.error(f"Error importing missions: {e}")
+        return jsonify({'error': 'Import failed'}), 500
+
+@mission_bp.route('/api/events')
+def api_events():
+    """Push mission status changes as Server-Sent Events.
+
+    ?missions=1,2,3 limits the stream to those missions and starts it with
+    their current state. Comment heartbeats keep proxies from closing idle
+    streams and let the server notice clients that went away. Streams end
+    after MISSION_EVENTS_MAX_AGE (EventSource reconnects on its own) and
+    send a resync event if they fell behind.
+    """
+    from flask import current_app
+    from sqlalchemy.orm import load_only
+    from app import db
+    from models import Mission
+    from services.mission_events import RESYNC, mission_event, use_notify
+
+    try:
+        raw_ids = request.args.get('missions', '')
+        mission_ids = {int(value) for value in raw_ids.split(',') if value.strip()} if raw_ids else None
+    except ValueError:
+        return jsonify({'error': 'missions must be a comma-separated list of ids'}), 400
+    if mission_ids and len(mission_ids) > 100:
+        return jsonify({'error': 'At most 100 missions per stream'}), 400
+
+    config = current_app.config
+    bus = get_services().events
+    if use_notify(config, db.engine.dialect.name):
+        bus.ensure_listener(db.engine)
+    elif config.get('MISSION_EVENTS_POLL_INTERVAL', 2) > 0:
+        # Changes committed by worker processes only reach this one through the database
+        bus.ensure_poller(db.engine, config['MISSION_EVENTS_POLL_INTERVAL'])
+
+    # Subscribe before reading the snapshot so no change can fall between the two
+    subscription = bus.subscribe(mission_ids)
+    snapshot = []
+    try:
+        if mission_ids:
+            missions = Mission.query.options(load_only(
+                Mission.status, Mission.feasibility_score, Mission.risk_level, Mission.analyzed_at
+            )).filter(Mission.id.in_(mission_ids)).all()
+            snapshot = [mission_event(mission) for mission in missions]
+    except Exception as e:
+        bus.unsubscribe(subscription)
+        logger.error(f"Error opening mission event stream: {e}")
+        return jsonify({'error': 'Could not open event stream'}), 500
+    finally:
+        # The stream can stay open for minutes; it must not hold a pooled connection
+        db.session.close()
+
+    heartbeat = config.get('MISSION_EVENTS_HEARTBEAT', 15)
+    max_age = config.get('MISSION_EVENTS_MAX_AGE', 300)
+
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            for payload in snapshot:
+                yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+
+            expires = time.monotonic() + max_age
+            while time.monotonic() < expires:
+                payload = subscription.get(timeout=min(heartbeat, max(expires - time.monotonic(), 0.1)))
+                if payload is None:
+                    yield ": heartbeat\n\n"
+                elif payload is RESYNC:
+                    yield "event: resync\ndata: {}\n\n"
+                    return
+                else:
+                    yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            bus.unsubscribe(subscription)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@mission_bp.route('/api/jobs/<int:job_id>')
+def api_job(job_id):
+    """Get analysis job status via API"""
+    try:
+        job = get_services().jobs.get_job(job_id)
+        
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify(job.to_dict())
+    
+    except Exception as e:
+        logger.error(f"Error getting job status: {e}")
+        return jsonify({'error': 'Unable to fetch job status'}), 500
+
+@mission_bp.route('/api/batches/<batch_id>')
+def api_batch(batch_id):
+    """Get per-mission progress of a batch analysis via API"""
+    try:
+        jobs = get_services().jobs.get_batch_jobs(batch_id)
+        
+        if not jobs:
+            return jsonify({'error': 'Batch not found'}), 404
+        
+        counts = {}
+        for job in jobs:
+            counts[job.status.value] = counts.get(job.status.value, 0) + 1
+        
+        return jsonify({
+            'batch_id': batch_id,
+            'total': len(jobs),
+            'counts': counts,
+            'done': all(job.status.value in ('succeeded', 'failed') for job in jobs),
+            'missions': [job.to_dict() for job in jobs]
+        })
+    
+    except Exception as e:
+        logger.error(f"Error getting batch status: {e}")
+        return jsonify({'error': 'Unable to fetch batch status'}), 500
+
+@mission_bp.route('/api/porkchop/<destination>')
+def api_porkchop(destination):
+    """Get the launch window porkchop grid via API"""
+    try:
+        from datetime import date
+        from services.body_catalog import find_body
+        
+        if find_body(destination) is None:
+            return jsonify({'error': 'Unknown destination'}), 404
+        
+        launch_date = request.args.get('launch_date')
+        launch_date = date.fromisoformat(launch_date) if launch_date else date.today()
+        
+        return jsonify(get_services().nasa.get_porkchop(destination, launch_date))
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        logger.error(f"Error computing porkchop for {destination}: {e}")
+        return jsonify({'error': 'Unable to compute launch windows'}), 500
+
 @mission_bp.route('/api/statistics')
 def api_statistics():
     """Get mission statistics via API"""
     try:
-        from services.mission_service import MissionService
-        mission_service = MissionService()
+        validators = get_services().statistics.validators()
+        cached = http_cache.not_modified(validators, http_cache.STATISTICS_POLICY)
+        if cached:
+            return cached
+        
+        mission_service = get_services().missions
         statistics = mission_service.get_mission_statistics()
-        return jsonify(statistics)
+        return http_cache.with_validators(jsonify(statistics), validators, http_cache.STATISTICS_POLICY)
     
     except Exception as e:
         logger.error(f"Error getting statistics: {e}")
@@ -1,28 +1,203 @@
-import os
+import re
 import json
 import logging
-from typing import Dict, Optional
-from openai import OpenAI
+from typing import Dict, Iterator, List, Optional, Tuple
+from flask import current_app
+from services.analysis_cache import VOLATILE_NASA_FIELDS, AnalysisCache
+from services.feasibility_scorer import score_mission
+from services.openai_pool import get_client_pool
 
-class AIService:
+# the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
+# do not change this unless explicitly requested by the user
+FEASIBILITY_MODEL = "gpt-4o"
+FEASIBILITY_TEMPERATURE = 0.3
+FEASIBILITY_SYSTEM_MESSAGE = "You are an expert space mission analyst with deep knowledge of orbital mechanics, spacecraft engineering, and mission planning. Provide detailed technical analysis in JSON format."
+
+# JSON structure requested for each feasibility analysis
+FEASIBILITY_SCHEMA = """{
+    "feasibility_score": <number 0-100>,
+    "risk_level": "<low|medium|high|critical>",
+    "summary": "<brief summary of overall assessment>",
+    "technical_analysis": {
+        "trajectory": "<analysis of trajectory and orbital mechanics>",
+        "propulsion": "<fuel and propulsion requirements assessment>",
+        "life_support": "<life support systems analysis for crew missions>",
+        "communication": "<communication challenges and solutions>",
+        "landing": "<landing/docking feasibility if applicable>"
+    },
+    "risk_assessment": {
+        "primary_risks": ["<risk1>", "<risk2>", "<risk3>"],
+        "radiation_exposure": "<assessment of radiation risks>",
+        "micrometeorite_risk": "<assessment of debris/micrometeorite risks>",
+        "system_failures": "<critical system failure scenarios>"
+    },
+    "resource_requirements": {
+        "fuel_estimate": "<fuel requirements in kg>",
+        "power_requirements": "<power system needs>",
+        "water_requirements": "<water needs for crew>",
+        "food_requirements": "<food needs for crew>"
+    },
+    "recommendations": [
+        "<recommendation1>",
+        "<recommendation2>",
+        "<recommendation3>"
+    ],
+    "timeline": {
+        "launch_preparation": "<months>",
+        "transit_time": "<months>",
+        "mission_operations": "<months>",
+        "return_time": "<months if applicable>"
+    }
+}"""
+
+RISK_LEVELS = ('low', 'medium', 'high', 'critical')
+
+REPORT_MODEL = "gpt-4o"
+REPORT_TEMPERATURE = 0.2
+
+REPORT_SECTIONS = (
+    'executive_summary', 'mission_overview', 'technical_specifications',
+    'risk_mitigation', 'success_factors', 'contingency_plans',
+    'resource_allocation', 'timeline_details', 'conclusion'
+)
+
+_SEPARATOR = re.compile(r'[\s,]*')
+_COLON = re.compile(r'\s*:\s*')
+
+class ReportSectionParser:
+    """Incrementally extracts top-level "key": value pairs from a streamed JSON object.
+    
+    A pair is emitted once its value has fully arrived, so a section can be
+    shown while later sections are still being generated.
+    """
+    
     def __init__(self):
-        self.client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        self.buffer = ''
+        self.position = None  # index just past the last complete pair
+        self.decoder = json.JSONDecoder()
+    
+    def feed(self, text: str) -> List[Tuple[str, object]]:
+        self.buffer += text
+        sections = []
+        
+        while True:
+            if self.position is None:
+                opening = self.buffer.find('{')
+                if opening == -1:
+                    break
+                self.position = opening + 1
+            
+            start = _SEPARATOR.match(self.buffer, self.position).end()
+            if start >= len(self.buffer) or self.buffer[start] == '}':
+                break
+            
+            try:
+                key, end = self.decoder.raw_decode(self.buffer, start)
+                colon = _COLON.match(self.buffer, end)
+                if colon is None:
+                    break
+                value, end = self.decoder.raw_decode(self.buffer, colon.end())
+            except ValueError:
+                break  # incomplete, wait for more text
+            
+            # A bare number or literal at the end of the buffer may still be growing
+            if end == len(self.buffer) and not isinstance(value, (str, dict, list)):
+                break
+            
+            sections.append((str(key), value))
+            self.position = end
+        
+        return sections
+    
+    def close(self) -> List[Tuple[str, object]]:
+        """Flush a trailing scalar once the stream has ended"""
+        return self.feed('\n')
+
+class AIService:
+    def __init__(self, client=None, cache: Optional[AnalysisCache] = None, batch_size: Optional[int] = None):
+        self.client = client or get_client_pool(current_app.config)
+        self.cache = cache or AnalysisCache.from_config(current_app.config)
+        self.batch_size = batch_size or current_app.config.get('AI_BATCH_SIZE', 8)
         self.logger = logging.getLogger(__name__)
     
-    def analyze_mission_feasibility(self, mission_data: Dict, nasa_data: Dict) -> Dict:
-        """Analyze mission feasibility using AI"""
-        try:
-            # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-            # do not change this unless explicitly requested by the user
+    def analyze_mission_feasibility(self, mission_data: Dict, nasa_data: Dict, use_cache: bool = True) -> Dict:
+        """Analyze mission feasibility using AI, serving repeat inputs from the cache"""
+        cache_key = AnalysisCache.make_key(mission_data, nasa_data, FEASIBILITY_MODEL, FEASIBILITY_TEMPERATURE)
+        
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.info(f"AI analysis cache hit for {mission_data.get('name', 'Unknown')}")
+                cached['cache_hit'] = True
+                return cached
+        else:
+            self.cache.bypass()
+        
+        return self._request_analysis(mission_data, nasa_data, cache_key)
+    
+    def analyze_missions_feasibility(self, items: List[Tuple[Dict, Dict]], use_cache: bool = True) -> List[Dict]:
+        """Analyze several (mission_data, nasa_data) pairs, packing up to batch_size per request
+        
+        Each request carries the system message and schema once and each
+        distinct NASA payload once, and asks for a JSON array with one
+        analysis per mission. Elements that come back missing or malformed,
+        and every element of a request that fails outright, are retried
+        with a single-mission request. Results are in input order.
+        """
+        results: List[Optional[Dict]] = [None] * len(items)
+        keys = [AnalysisCache.make_key(mission_data, nasa_data, FEASIBILITY_MODEL, FEASIBILITY_TEMPERATURE)
+                for mission_data, nasa_data in items]
+        # Batched answers come from a different prompt, so they are cached apart and
+        # never served to single-mission requests; a batch may reuse single answers
+        batch_keys = [AnalysisCache.make_key(mission_data, nasa_data, FEASIBILITY_MODEL, FEASIBILITY_TEMPERATURE,
+                                             prompt='batch')
+                      for mission_data, nasa_data in items]
+        
+        pending = []
+        for index, (mission_data, _) in enumerate(items):
+            cached = None
+            if use_cache:
+                cached = self.cache.get(keys[index]) or self.cache.get(batch_keys[index])
+            if cached is not None:
+                cached['cache_hit'] = True
+                results[index] = cached
+            else:
+                if not use_cache:
+                    self.cache.bypass()
+                pending.append(index)
+        
+        for start in range(0, len(pending), max(self.batch_size, 1)):
+            chunk = pending[start:start + max(self.batch_size, 1)]
+            if len(chunk) == 1:
+                index = chunk[0]
+                results[index] = self._request_analysis(*items[index], keys[index])
+                continue
             
+            analyses = self._request_batch([items[index] for index in chunk])
+            for position, index in enumerate(chunk):
+                element = analyses.get(position)
+                if element is None:
+                    self.logger.warning(f"Batch element for {items[index][0].get('name', 'Unknown')} missing or invalid; retrying alone")
+                    results[index] = self._request_analysis(*items[index], keys[index])
+                    continue
+                processed = self._process_ai_response(element)
+                if 'error' not in processed:
+                    self.cache.set(batch_keys[index], FEASIBILITY_MODEL, processed)
+                results[index] = processed
+        
+        return results
+    
+    def _request_analysis(self, mission_data: Dict, nasa_data: Dict, cache_key: str) -> Dict:
+        """One single-mission feasibility request; caches the result unless it is a fallback"""
+        try:
             prompt = self._build_feasibility_prompt(mission_data, nasa_data)
             
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
+            response = self.client.create_chat_completion(
+                model=FEASIBILITY_MODEL,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are an expert space mission analyst with deep knowledge of orbital mechanics, spacecraft engineering, and mission planning. Provide detailed technical analysis in JSON format."
+                        "content": FEASIBILITY_SYSTEM_MESSAGE
                     },
                     {
                         "role": "user",
@@ -31,15 +206,107 @@ class AIService:
                 ],
                 response_format={"type": "json_object"},
                 max_tokens=2000,
-                temperature=0.3
+                temperature=FEASIBILITY_TEMPERATURE
             )
             
             result = json.loads(response.choices[0].message.content)
-            return self._process_ai_response(result)
+            processed = self._process_ai_response(result)
+            
+            # Fallback output means processing failed; only cache real analyses
+            if 'error' not in processed:
+                self.cache.set(cache_key, FEASIBILITY_MODEL, processed)
+            
+            return processed
             
         except Exception as e:
             self.logger.error(f"AI analysis failed: {e}")
-            return self._get_fallback_analysis(mission_data)
+            return self._get_fallback_analysis(mission_data, nasa_data)
+    
+    def _request_batch(self, items: List[Tuple[Dict, Dict]]) -> Dict[int, Dict]:
+        """One multi-mission request; returns the valid analyses keyed by position in items"""
+        try:
+            response = self.client.create_chat_completion(
+                model=FEASIBILITY_MODEL,
+                messages=self._build_batch_messages(items),
+                response_format={"type": "json_object"},
+                max_tokens=min(2000 * len(items), 16000),
+                temperature=FEASIBILITY_TEMPERATURE
+            )
+            
+            usage = getattr(response, 'usage', None)
+            if usage is not None:
+                self.logger.info(f"Batched analysis of {len(items)} missions: {usage.prompt_tokens} prompt tokens, "
+                                 f"{usage.completion_tokens} completion tokens")
+            if response.choices[0].finish_reason == 'length':
+                self.logger.warning(f"Batched analysis of {len(items)} missions was truncated")
+            
+            analyses = json.loads(response.choices[0].message.content).get('analyses', [])
+            
+        except Exception as e:
+            self.logger.error(f"Batched AI analysis of {len(items)} missions failed: {e}")
+            return {}
+        
+        valid = {}
+        for element in analyses if isinstance(analyses, list) else []:
+            if not isinstance(element, dict):
+                continue
+            position = element.pop('id', None)
+            if (isinstance(position, int) and 0 <= position < len(items) and position not in valid
+                    and isinstance(element.get('feasibility_score'), (int, float))
+                    and element.get('risk_level') in RISK_LEVELS):
+                valid[position] = element
+        return valid
+    
+    def _build_batch_messages(self, items: List[Tuple[Dict, Dict]]) -> List[Dict]:
+        """Chat messages for a batched request: instructions once, each distinct NASA value once"""
+        shared = {}
+        refs = {}
+        missions = []
+        for position, (mission_data, nasa_data) in enumerate(items):
+            nasa_refs = {}
+            for field, value in (nasa_data or {}).items():
+                if field in VOLATILE_NASA_FIELDS:
+                    continue
+                if not isinstance(value, (dict, list)):
+                    nasa_refs[field] = value
+                    continue
+                encoded = json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+                if encoded not in refs:
+                    refs[encoded] = f"#{len(refs)}"
+                    shared[refs[encoded]] = value
+                nasa_refs[field] = refs[encoded]
+            missions.append({
+                'id': position,
+                'destination': mission_data.get('destination', 'Unknown'),
+                'launch_date': mission_data.get('launch_date', 'Unknown'),
+                'duration_days': mission_data.get('mission_duration', 'Unknown'),
+                'crew_size': mission_data.get('crew_size', 'Unknown'),
+                'spacecraft': mission_data.get('spacecraft_type', 'Unknown'),
+                'payload_mass_kg': mission_data.get('payload_mass', 'Unknown'),
+                'nasa_data': nasa_refs
+            })
+        
+        instructions = (
+            f"{FEASIBILITY_SYSTEM_MESSAGE}\n\n"
+            "You will receive several missions with their NASA orbital data. A value of the form \"#<n>\" "
+            "in a mission's nasa_data stands for the entry with that key in shared_data. "
+            "Assess every mission independently and respond with a JSON object of the form "
+            '{"analyses": [<analysis>, ...]} containing exactly one analysis per mission. '
+            "Each analysis must include the mission's integer \"id\" plus every field of this structure:\n"
+            f"{FEASIBILITY_SCHEMA}"
+        )
+        content = json.dumps({'shared_data': shared, 'missions': missions}, separators=(',', ':'), default=str)
+        
+        return [
+            {
+                "role": "system",
+                "content": instructions
+            },
+            {
+                "role": "user",
+                "content": content
+            }
+        ]
     
     def _build_feasibility_prompt(self, mission_data: Dict, nasa_data: Dict) -> str:
         """Build the prompt for AI analysis"""
@@ -47,7 +314,6 @@ class AIService:
         Analyze the feasibility of this space mission and provide a comprehensive assessment in JSON format:
 
         Mission Details:
-        - Name: {mission_data.get('name', 'Unknown')}
         - Destination: {mission_data.get('destination', 'Unknown')}
         - Launch Date: {mission_data.get('launch_date', 'Unknown')}
         - Duration: {mission_data.get('mission_duration', 'Unknown')} days
@@ -59,41 +325,7 @@ class AIService:
         {json.dumps(nasa_data, indent=2)}
 
         Provide your analysis in the following JSON structure:
-        {{
-            "feasibility_score": <number 0-100>,
-            "risk_level": "<low|medium|high|critical>",
-            "summary": "<brief summary of overall assessment>",
-            "technical_analysis": {{
-                "trajectory": "<analysis of trajectory and orbital mechanics>",
-                "propulsion": "<fuel and propulsion requirements assessment>",
-                "life_support": "<life support systems analysis for crew missions>",
-                "communication": "<communication challenges and solutions>",
-                "landing": "<landing/docking feasibility if applicable>"
-            }},
-            "risk_assessment": {{
-                "primary_risks": ["<risk1>", "<risk2>", "<risk3>"],
-                "radiation_exposure": "<assessment of radiation risks>",
-                "micrometeorite_risk": "<assessment of debris/micrometeorite risks>",
-                "system_failures": "<critical system failure scenarios>"
-            }},
-            "resource_requirements": {{
-                "fuel_estimate": "<fuel requirements in kg>",
-                "power_requirements": "<power system needs>",
-                "water_requirements": "<water needs for crew>",
-                "food_requirements": "<food needs for crew>"
-            }},
-            "recommendations": [
-                "<recommendation1>",
-                "<recommendation2>",
-                "<recommendation3>"
-            ],
-            "timeline": {{
-                "launch_preparation": "<months>",
-                "transit_time": "<months>",
-                "mission_operations": "<months>",
-                "return_time": "<months if applicable>"
-            }}
-        }}
+        {FEASIBILITY_SCHEMA}
         """
     
     def _process_ai_response(self, ai_result: Dict) -> Dict:
@@ -109,7 +341,7 @@ class AIService:
                 'resource_requirements': ai_result.get('resource_requirements', {}),
                 'recommendations': ai_result.get('recommendations', []),
                 'timeline': ai_result.get('timeline', {}),
-                'ai_model': 'gpt-4o',
+                'ai_model': FEASIBILITY_MODEL,
                 'analysis_timestamp': self._get_current_timestamp()
             }
             
@@ -122,43 +354,17 @@ class AIService:
     def generate_mission_report(self, mission_data: Dict, analysis_result: Dict) -> Dict:
         """Generate comprehensive mission report"""
         try:
-            prompt = f"""
-            Generate a comprehensive mission report based on the following data:
-
-            Mission: {mission_data.get('name', 'Unknown Mission')}
-            Analysis: {json.dumps(analysis_result, indent=2)}
-
-            Create a detailed report in JSON format with:
-            {{
-                "executive_summary": "<2-3 paragraph summary>",
-                "mission_overview": "<detailed mission description>",
-                "technical_specifications": "<detailed technical specs>",
-                "risk_mitigation": "<risk mitigation strategies>",
-                "success_factors": "<key factors for mission success>",
-                "contingency_plans": "<backup plans and alternatives>",
-                "resource_allocation": "<detailed resource breakdown>",
-                "timeline_details": "<detailed mission timeline>",
-                "conclusion": "<final assessment and recommendations>"
-            }}
-            """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a senior space mission analyst creating formal mission reports for space agencies. Write professionally and technically accurate content."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+            response = self.client.create_chat_completion(
+                model=REPORT_MODEL,
+                messages=self._build_report_messages(mission_data, analysis_result),
                 response_format={"type": "json_object"},
                 max_tokens=3000,
-                temperature=0.2
+                temperature=REPORT_TEMPERATURE
             )
             
+            if response.choices[0].finish_reason == 'length':
+                raise ValueError('report was cut off at max_tokens')
+            
             return json.loads(response.choices[0].message.content)
             
         except Exception as e:
@@ -168,37 +374,81 @@ class AIService:
                 'error': str(e)
             }
     
-    def _get_fallback_analysis(self, mission_data: Dict) -> Dict:
-        """Provide fallback analysis when AI is unavailable"""
-        return {
-            'feasibility_score': 65,
-            'risk_level': 'medium',
-            'summary': 'AI analysis unavailable. Basic assessment provided.',
-            'technical_analysis': {
-                'trajectory': 'Trajectory analysis requires AI service',
-                'propulsion': 'Propulsion analysis requires AI service',
-                'life_support': 'Life support analysis requires AI service',
-                'communication': 'Communication analysis requires AI service'
-            },
-            'risk_assessment': {
-                'primary_risks': ['AI service unavailable'],
-                'radiation_exposure': 'Requires detailed analysis',
-                'micrometeorite_risk': 'Requires detailed analysis'
-            },
-            'resource_requirements': {
-                'fuel_estimate': 'Requires AI analysis',
-                'power_requirements': 'Requires AI analysis'
-            },
-            'recommendations': [
-                'Enable AI service for detailed analysis',
-                'Consult mission planning experts',
-                'Review historical mission data'
-            ],
-            'timeline': {
-                'analysis_status': 'AI service required for timeline analysis'
+    def stream_mission_report(self, mission_data: Dict, analysis_result: Dict) -> Iterator[Tuple[str, object]]:
+        """Generate a mission report, yielding (section, value) pairs as each one completes.
+        
+        On failure, including a response cut off at max_tokens, an
+        ('error', message) pair is yielded and the stream ends.
+        """
+        parser = ReportSectionParser()
+        finish_reason = None
+        try:
+            stream = self.client.create_chat_completion(
+                model=REPORT_MODEL,
+                messages=self._build_report_messages(mission_data, analysis_result),
+                response_format={"type": "json_object"},
+                max_tokens=3000,
+                temperature=REPORT_TEMPERATURE,
+                stream=True
+            )
+            
+            for chunk in stream:
+                if not chunk.choices:
+                    continue
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield from parser.feed(delta)
+            
+            yield from parser.close()
+            
+            if finish_reason == 'length':
+                self.logger.warning("Streamed report was truncated at max_tokens")
+                yield 'error', 'Report was cut off before it was complete'
+            
+        except Exception as e:
+            self.logger.error(f"Report streaming failed: {e}")
+            yield 'error', str(e)
+    
+    def _build_report_messages(self, mission_data: Dict, analysis_result: Dict) -> List[Dict]:
+        """Build the chat messages for report generation"""
+        prompt = f"""
+        Generate a comprehensive mission report based on the following data:
+
+        Mission: {mission_data.get('name', 'Unknown Mission')}
+        Analysis: {json.dumps(analysis_result, indent=2)}
+
+        Create a detailed report in JSON format with:
+        {{
+            "executive_summary": "<2-3 paragraph summary>",
+            "mission_overview": "<detailed mission description>",
+            "technical_specifications": "<detailed technical specs>",
+            "risk_mitigation": "<risk mitigation strategies>",
+            "success_factors": "<key factors for mission success>",
+            "contingency_plans": "<backup plans and alternatives>",
+            "resource_allocation": "<detailed resource breakdown>",
+            "timeline_details": "<detailed mission timeline>",
+            "conclusion": "<final assessment and recommendations>"
+        }}
+        """
+        
+        return [
+            {
+                "role": "system",
+                "content": "You are a senior space mission analyst creating formal mission reports for space agencies. Write professionally and technically accurate content."
             },
-            'error': 'AI service unavailable - using fallback analysis'
-        }
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    
+    def _get_fallback_analysis(self, mission_data: Dict, nasa_data: Optional[Dict] = None) -> Dict:
+        """Physics-based assessment when AI is unavailable"""
+        fallback = score_mission(mission_data, (nasa_data or {}).get('mission_window'))
+        fallback['analysis_timestamp'] = self._get_current_timestamp()
+        fallback['error'] = 'AI service unavailable - using physics-based fallback analysis'
+        return fallback
     
     def _get_current_timestamp(self) -> str:
         """Get current timestamp in ISO format"""
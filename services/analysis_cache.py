@@ -0,0 +1,161 @@
+import json
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+from models import AnalysisCacheEntry
+from app import db
+
+# Exactly the mission fields the feasibility prompts send; keep the two in
+# step. The name is not sent, so cloned templates that differ only by name
+# share one analysis.
+CACHE_KEY_FIELDS = (
+    'destination', 'launch_date', 'mission_duration', 'crew_size',
+    'spacecraft_type', 'payload_mass'
+)
+
+# NASA payload fields that change on every fetch without changing the data
+VOLATILE_NASA_FIELDS = ('retrieved_at', 'api_key_used')
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'bypassed': 0}
+
+def _count(name: str, amount: int = 1):
+    with _stats_lock:
+        _stats[name] += amount
+
+def _strip_volatile(value):
+    """Recursively drop fields that would make identical inputs hash differently"""
+    if isinstance(value, dict):
+        return {k: _strip_volatile(v) for k, v in value.items() if k not in VOLATILE_NASA_FIELDS}
+    if isinstance(value, list):
+        return [_strip_volatile(v) for v in value]
+    return value
+
+class AnalysisCache:
+    """Persistent, content-addressed cache of AI feasibility analyses"""
+
+    def __init__(self, ttl: int = 7 * 24 * 3600, max_entries: int = 10000, enabled: bool = True):
+        self.ttl = ttl                  # seconds, 0 = never expire
+        self.max_entries = max_entries  # LRU cap, 0 = unbounded
+        self.enabled = enabled
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config) -> 'AnalysisCache':
+        """Build a cache from the Flask app config"""
+        return cls(
+            ttl=config.get('AI_CACHE_TTL', 7 * 24 * 3600),
+            max_entries=config.get('AI_CACHE_MAX_ENTRIES', 10000),
+            enabled=config.get('AI_CACHE_ENABLED', True)
+        )
+
+    @staticmethod
+    def make_key(mission_data: Dict, nasa_data: Dict, model: str, temperature: float,
+                 prompt: str = 'single') -> str:
+        """Canonical hash of the prompt inputs, prompt variant, model and temperature"""
+        canonical = {
+            'mission': {field: mission_data.get(field) for field in CACHE_KEY_FIELDS},
+            'nasa': _strip_volatile(nasa_data or {}),
+            'prompt': prompt,
+            'model': model,
+            'temperature': temperature
+        }
+        encoded = json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return the cached analysis for key, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        try:
+            entry = AnalysisCacheEntry.query.filter_by(cache_key=key).first()
+            now = datetime.utcnow()
+
+            if entry is None:
+                _count('misses')
+                return None
+
+            if entry.expires_at and entry.expires_at <= now:
+                db.session.delete(entry)
+                db.session.commit()
+                _count('misses')
+                _count('evictions')
+                return None
+
+            entry.hit_count += 1
+            entry.last_accessed_at = now
+            db.session.commit()
+
+            _count('hits')
+            return dict(entry.payload)
+
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Analysis cache read failed: {e}")
+            _count('misses')
+            return None
+
+    def set(self, key: str, model: str, payload: Dict):
+        """Store an analysis and evict expired and least recently used entries"""
+        if not self.enabled:
+            return
+
+        try:
+            now = datetime.utcnow()
+            expires_at = now + timedelta(seconds=self.ttl) if self.ttl else None
+
+            entry = AnalysisCacheEntry.query.filter_by(cache_key=key).first()
+            if entry is None:
+                entry = AnalysisCacheEntry(cache_key=key, model=model)
+                db.session.add(entry)
+
+            entry.payload = payload
+            entry.created_at = now
+            entry.last_accessed_at = now
+            entry.expires_at = expires_at
+            db.session.commit()
+            _count('stores')
+
+            self._evict(now)
+
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Analysis cache write failed: {e}")
+
+    def bypass(self):
+        """Record a forced re-analysis that skipped the cache"""
+        _count('bypassed')
+
+    def _evict(self, now: datetime):
+        """Drop expired entries, then the least recently used ones over the cap"""
+        evicted = AnalysisCacheEntry.query.filter(
+            AnalysisCacheEntry.expires_at.isnot(None),
+            AnalysisCacheEntry.expires_at <= now
+        ).delete(synchronize_session=False)
+
+        if self.max_entries:
+            total = AnalysisCacheEntry.query.count()
+            overflow = total - self.max_entries
+            if overflow > 0:
+                stale_ids = [row.id for row in AnalysisCacheEntry.query.with_entities(
+                    AnalysisCacheEntry.id
+                ).order_by(AnalysisCacheEntry.last_accessed_at).limit(overflow)]
+                evicted += AnalysisCacheEntry.query.filter(
+                    AnalysisCacheEntry.id.in_(stale_ids)
+                ).delete(synchronize_session=False)
+
+        db.session.commit()
+        if evicted:
+            _count('evictions', evicted)
+
+    @staticmethod
+    def get_stats() -> Dict:
+        """Hit/miss counters for this process"""
+        with _stats_lock:
+            stats = dict(_stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups * 100, 2) if lookups else 0
+        return stats
@@ -0,0 +1,133 @@
+import os
+import time
+import signal
+import socket
+import logging
+import multiprocessing
+from typing import Optional
+from services.job_queue import JobLease
+
+class AnalysisWorker:
+    """Pulls analysis jobs off the queue and runs them one at a time"""
+
+    def __init__(self, queue, mission_service, worker_id: str, poll_interval: float = 2.0):
+        self.queue = queue
+        self.mission_service = mission_service
+        self.worker_id = worker_id
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger(__name__)
+
+    def run_once(self) -> bool:
+        """Process a single job. Returns False when the queue had nothing to claim."""
+        job = self.queue.claim(self.worker_id)
+        if job is None:
+            return False
+
+        if job.batch_id:
+            self._run_batch(self.queue.claim_batch(self.worker_id, job))
+            return True
+
+        # Captured now: the analysis commits and expires job before complete/fail run
+        lease = JobLease.of(job)
+        try:
+            result = self.mission_service.analyze_mission(job.mission_id, force_refresh=job.force_refresh)
+
+            if result['success']:
+                self.queue.complete(lease, result['analysis'].id)
+            else:
+                self.queue.fail(lease, result.get('error', 'Unknown error'))
+
+        except Exception as e:
+            self.logger.error(f"Worker {self.worker_id} crashed on job {lease.job_id}: {e}")
+            self.queue.fail(lease, str(e))
+
+        return True
+
+    def _run_batch(self, jobs):
+        """Analyze a group of jobs from one batch together"""
+        leases = [JobLease.of(job) for job in jobs]
+        try:
+            outcomes = self.mission_service.analyze_batch(
+                [job.mission_id for job in jobs],
+                force_refresh_ids={job.mission_id for job in jobs if job.force_refresh},
+                concurrency=self.queue.batch_concurrency
+            )
+        except Exception as e:
+            self.logger.error(f"Worker {self.worker_id} crashed on batch {jobs[0].batch_id}: {e}")
+            outcomes = {lease.mission_id: {'success': False, 'error': str(e)} for lease in leases}
+
+        for lease in leases:
+            outcome = outcomes.get(lease.mission_id, {'success': False, 'error': 'No result'})
+            if outcome['success']:
+                self.queue.complete(lease, outcome['analysis_id'])
+            else:
+                self.queue.fail(lease, outcome['error'])
+
+    def run(self, stop_event=None):
+        """Poll the queue until stop_event is set"""
+        self.logger.info(f"Analysis worker {self.worker_id} started")
+
+        while stop_event is None or not stop_event.is_set():
+            try:
+                if not self.run_once():
+                    time.sleep(self.poll_interval)
+            except Exception as e:
+                self.logger.error(f"Worker {self.worker_id} poll error: {e}")
+                time.sleep(self.poll_interval)
+
+        self.logger.info(f"Analysis worker {self.worker_id} stopped")
+
+def _worker_main(index: int, poll_interval: float, stop_event):
+    """Entry point for a worker process"""
+    # Children must not handle Ctrl-C themselves; the parent sets stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from app import app, db
+    from services.container import get_services
+
+    with app.app_context():
+        # Connections inherited across fork are not safe to reuse
+        db.engine.dispose(close=False)
+
+        # This process's own container: pooled HTTP session and OpenAI client pool
+        services = get_services()
+        worker = AnalysisWorker(
+            queue=services.jobs,
+            mission_service=services.missions,
+            worker_id=f"{socket.gethostname()}:{os.getpid()}:{index}",
+            poll_interval=poll_interval
+        )
+        try:
+            worker.run(stop_event)
+        finally:
+            services.close()
+
+def run_worker_pool(processes: int, poll_interval: float = 2.0, stop_event: Optional[object] = None):
+    """Run a pool of worker processes until interrupted"""
+    logger = logging.getLogger(__name__)
+    stop_event = stop_event or multiprocessing.Event()
+
+    workers = [
+        multiprocessing.Process(
+            target=_worker_main,
+            args=(index, poll_interval, stop_event),
+            name=f"analysis-worker-{index}",
+            daemon=True
+        )
+        for index in range(processes)
+    ]
+
+    def _shutdown(signum, frame):
+        logger.info("Stopping analysis workers")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    for worker in workers:
+        worker.start()
+
+    logger.info(f"Started {processes} analysis worker(s)")
+
+    for worker in workers:
+        worker.join()
@@ -0,0 +1,126 @@
+import os
+import json
+import logging
+from types import MappingProxyType
+from typing import Dict, NamedTuple, Optional
+from services.orbital_mechanics import OrbitalElements
+
+EARTH_ORBITAL_PERIOD = 365.25  # days
+
+class Body(NamedTuple):
+    """Physical and launch-window data for a mission destination"""
+    key: str
+    display_name: str
+    distance_from_earth: float  # km
+    velocity_magnitude: float   # km/s
+    orbital_period: float       # days
+    mass: float                 # kg
+    gravity: float              # m/s²
+    radius: float               # km
+    escape_velocity: float      # km/s
+    window_duration: int        # days the launch window stays open
+    synodic_period: float       # days between launch windows
+    horizons_id: Optional[str] = None  # JPL Horizons COMMAND for ephemeris lookups
+    elements: Optional[OrbitalElements] = None  # heliocentric orbit (parent planet's for moons)
+
+    def orbital_parameters(self) -> Dict:
+        """Orbital parameters in the shape stored on Mission.nasa_data"""
+        return {
+            'distance_from_earth': self.distance_from_earth,
+            'velocity_magnitude': self.velocity_magnitude,
+            'orbital_period': self.orbital_period,
+            'mass': self.mass,
+            'gravity': self.gravity,
+            'radius': self.radius,
+            'escape_velocity': self.escape_velocity
+        }
+
+def synodic_period(orbital_period: float) -> float:
+    """Days between successive Earth-body alignments"""
+    return round(1 / abs(1 / EARTH_ORBITAL_PERIOD - 1 / orbital_period), 1)
+
+# Moons of the outer planets share their parent's launch windows
+_JUPITER_SYNODIC = synodic_period(4333)
+_SATURN_SYNODIC = synodic_period(10759)
+
+# J2000 mean elements (Standish, JPL "Keplerian Elements for Approximate Positions")
+EARTH_ELEMENTS = OrbitalElements(1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0, 35999.37244981)
+_MARS = OrbitalElements(1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891, 19140.30268499)
+_VENUS = OrbitalElements(0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255, 58517.81538729)
+_JUPITER = OrbitalElements(5.20288700, 0.04838624, 1.30439695, 34.39644051, 14.72847983, 100.47390909, 3034.74612775)
+_SATURN = OrbitalElements(9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448, 1222.49362201)
+_CERES = OrbitalElements(2.7675, 0.0758, 10.59, 160.6, 153.84, 80.33, 7819.1)  # approximate, stands in for the belt
+
+_BUILTIN_BODIES = (
+    # key, display name, distance (km), velocity (km/s), period (days), mass (kg),
+    # gravity (m/s²), radius (km), escape velocity (km/s), window (days), synodic period (days),
+    # Horizons id, heliocentric elements
+    ('mars', 'Mars', 225000000, 24.077, 687, 6.42e23, 3.71, 3389.5, 5.03, 26, 780, '499', _MARS),
+    ('moon', 'Moon', 384400, 1.022, 27.3, 7.35e22, 1.62, 1737.4, 2.38, 28, 28, '301', None),
+    ('venus', 'Venus', 41400000, 35.02, 225, 4.87e24, 8.87, 6051.8, 10.36, 19, 584, '299', _VENUS),
+    ('jupiter', 'Jupiter', 628300000, 13.07, 4333, 1.898e27, 24.79, 69911, 59.5, 21, _JUPITER_SYNODIC, '599', _JUPITER),
+    ('saturn', 'Saturn', 1275000000, 9.68, 10759, 5.68e26, 10.44, 58232, 35.5, 21, _SATURN_SYNODIC, '699', _SATURN),
+    ('asteroid_belt', 'Asteroid Belt', 329000000, 20.0, 1460, 3.0e21, 0.0003, 473, 0.51, 21, synodic_period(1460), '1;', _CERES),
+    ('europa', 'Europa (Jupiter Moon)', 628300000, 13.74, 3.55, 4.8e22, 1.314, 1560.8, 2.025, 21, _JUPITER_SYNODIC, '502', _JUPITER),
+    ('titan', 'Titan (Saturn Moon)', 1275000000, 5.57, 15.95, 1.35e23, 1.352, 2574, 2.64, 21, _SATURN_SYNODIC, '606', _SATURN),
+    ('enceladus', 'Enceladus (Saturn Moon)', 1275000000, 12.64, 1.37, 1.08e20, 0.0113, 252.1, 0.239, 21, _SATURN_SYNODIC, '602', _SATURN),
+    ('io', 'Io (Jupiter Moon)', 628300000, 17.33, 1.77, 8.93e22, 1.796, 1821.6, 2.558, 21, _JUPITER_SYNODIC, '501', _JUPITER),
+)
+
+DEFAULT_BODY = 'mars'
+
+# Optional JSON file of extra or overriding bodies, e.g.
+# {"ceres": {"display_name": "Ceres", "distance_from_earth": 4.1e8, ...}}
+CATALOG_PATH = os.environ.get(
+    'BODY_CATALOG_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'bodies.json')
+)
+
+def _load_extra_bodies(path: str, base: Dict[str, Body]) -> Dict[str, Body]:
+    """Read bodies from a JSON file, filling missing fields from the entry being overridden"""
+    logger = logging.getLogger(__name__)
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path) as f:
+            raw = json.load(f)
+
+        bodies = {}
+        for key, fields in raw.items():
+            template = base.get(key)
+            values = template._asdict() if template else {}
+            values.update(fields)
+            values['key'] = key
+            values.setdefault('display_name', key.replace('_', ' ').title())
+            if isinstance(values.get('elements'), dict):
+                values['elements'] = OrbitalElements(**values['elements'])
+            if 'synodic_period' not in values and 'orbital_period' in values:
+                values['synodic_period'] = synodic_period(values['orbital_period'])
+            bodies[key] = Body(**values)
+
+        logger.info(f"Loaded {len(bodies)} bodies from {path}")
+        return bodies
+
+    except Exception as e:
+        logger.error(f"Ignoring invalid body catalog file {path}: {e}")
+        return {}
+
+def _build_catalog() -> MappingProxyType:
+    bodies = {row[0]: Body(*row) for row in _BUILTIN_BODIES}
+    bodies.update(_load_extra_bodies(CATALOG_PATH, bodies))
+    return MappingProxyType(bodies)
+
+BODY_CATALOG = _build_catalog()
+
+def get_body(destination: str) -> Body:
+    """Look up a destination, falling back to Mars for unknown keys"""
+    return BODY_CATALOG.get(destination, BODY_CATALOG[DEFAULT_BODY])
+
+def find_body(destination: str) -> Optional[Body]:
+    """Look up a destination without a fallback"""
+    return BODY_CATALOG.get(destination)
+
+def destination_choices():
+    """(key, label) pairs for form select fields"""
+    return [(body.key, body.display_name) for body in BODY_CATALOG.values()]
@@ -0,0 +1,91 @@
+import os
+import time
+import logging
+from typing import Dict
+from flask import current_app
+from services.ai_service import AIService
+from services.analysis_cache import AnalysisCache
+from services.data_providers import build_http_session
+from services.export_service import ExportService
+from services.history_service import HistoryService
+from services.job_queue import JobQueue
+from services.mission_events import get_event_bus
+from services.mission_service import MissionService
+from services.nasa_service import NASAService
+from services.openai_pool import get_client_pool
+from services.projection_service import ProjectionService
+from services.report_store import ReportStore
+from services.search_service import SearchService
+from services.simulation_service import SimulationService
+from services.statistics_service import StatisticsService
+
+class ServiceContainer:
+    """Services built once per worker process and shared by every request.
+
+    None of the services keep per-request state. Database work goes through
+    the scoped db.session, and the OpenAI pool and the pooled HTTP session
+    are safe to share between threads.
+    """
+
+    def __init__(self, config):
+        self.pid = os.getpid()
+        self.http_session = build_http_session(config.get('HTTP_POOL_SIZE', 10))
+
+        self.nasa = NASAService(session=self.http_session)
+        self.ai = AIService(
+            client=get_client_pool(config),
+            cache=AnalysisCache.from_config(config),
+            batch_size=config.get('AI_BATCH_SIZE', 8)
+        )
+        self.jobs = JobQueue.from_config(config)
+        self.reports = ReportStore()
+        self.missions = MissionService(
+            nasa_service=self.nasa, ai_service=self.ai, report_store=self.reports, job_queue=self.jobs
+        )
+        self.simulations = SimulationService.from_config(config, nasa_service=self.nasa)
+        self.statistics = StatisticsService.from_config(config)
+        self.history = HistoryService()
+        self.projections = ProjectionService()
+        self.search = SearchService()
+        self.exports = ExportService.from_config(config, search_service=self.search)
+        self.events = get_event_bus(config)
+        logging.getLogger(__name__).info(f"Service container ready in process {self.pid}")
+
+    def close(self):
+        self.http_session.close()
+
+def init_services(app):
+    """Build the container for this process; call inside an app context"""
+    app.extensions['services'] = ServiceContainer(app.config)
+
+def get_services() -> ServiceContainer:
+    """The current process's container, rebuilt after a fork so no sockets are shared with the parent"""
+    container = current_app.extensions.get('services')
+    if container is None or container.pid != os.getpid():
+        container = ServiceContainer(current_app.config)
+        current_app.extensions['services'] = container
+    return container
+
+def benchmark_construction(iterations: int = 2000) -> Dict:
+    """Per-request cost of building the services versus fetching them from the container, in µs"""
+    def per_call(factory):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            factory()
+        return (time.perf_counter() - started) / iterations * 1e6
+
+    def construct():
+        mission_service = MissionService()
+        SimulationService.from_config(current_app.config)
+        return mission_service
+
+    construct()
+    get_services()
+    constructed = per_call(construct)
+    shared = per_call(lambda: get_services().missions)
+    return {
+        'iterations': iterations,
+        'constructed_us': round(constructed, 2),
+        'container_us': round(shared, 2),
+        'saved_us': round(constructed - shared, 2)
+    }
@@ -0,0 +1,158 @@
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, FrozenSet, List, Optional
+from datetime import date, datetime, timedelta
+import requests
+from requests.adapters import HTTPAdapter
+from services.body_catalog import get_body
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.ephemeris import EphemerisSeries, parse_horizons_vectors
+
+ORBITAL_FIELDS = frozenset({
+    'distance_from_earth', 'velocity_magnitude', 'orbital_period',
+    'mass', 'gravity', 'radius', 'escape_velocity'
+})
+
+class PlanetaryDataProvider(ABC):
+    """Source of orbital parameters for a destination.
+
+    supplied_fields lists the fields the provider really produces; the
+    NASA service only consults a provider for those fields.
+    """
+
+    name = 'base'
+    label = 'Base provider'
+    supplied_fields: FrozenSet[str] = frozenset()
+    requires_network = False
+
+    @abstractmethod
+    def get_orbital_data(self, destination: str, on_date: Optional[date] = None) -> Dict:
+        """Orbital parameters for destination on on_date (today when None)"""
+
+class ComputedDataProvider(PlanetaryDataProvider):
+    """Reads the static body catalog; never touches the network"""
+
+    name = 'computed'
+    label = 'Body catalog'
+    supplied_fields = ORBITAL_FIELDS
+
+    def get_orbital_data(self, destination: str, on_date: Optional[date] = None) -> Dict:
+        return get_body(destination).orbital_parameters()
+
+class HorizonsDataProvider(PlanetaryDataProvider):
+    """Earth-relative distance and speed from the JPL Horizons API"""
+
+    name = 'horizons'
+    label = 'NASA JPL Horizons'
+    supplied_fields = frozenset({'distance_from_earth', 'velocity_magnitude'})
+    requires_network = True
+
+    base_url = "https://ssd-api.jpl.nasa.gov/api/horizons.api"
+
+    def __init__(self, session: Optional[requests.Session] = None, timeout: float = 10.0,
+                 cache_ttl: float = 6 * 3600, breaker: Optional[CircuitBreaker] = None):
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl  # seconds
+        self.breaker = breaker or CircuitBreaker('horizons', failure_threshold=3, reset_timeout=60)
+        self.logger = logging.getLogger(__name__)
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+
+    def get_orbital_data(self, destination: str, on_date: Optional[date] = None) -> Dict:
+        body = get_body(destination)
+        if not body.horizons_id:
+            return {}
+
+        on_date = on_date or date.today()
+        if isinstance(on_date, datetime):
+            on_date = on_date.date()
+
+        cache_key = (body.key, on_date)
+        with self._cache_lock:
+            cached = self._cache.get(cache_key)
+            if cached and cached[0] > time.monotonic():
+                return dict(cached[1])
+
+        try:
+            data = self.breaker.call(self._fetch, body.horizons_id, on_date)
+        except CircuitOpenError:
+            self.logger.info("Horizons circuit open, skipping remote lookup")
+            return {}
+        except Exception as e:
+            self.logger.error(f"Horizons request failed: {e}")
+            return {}
+
+        with self._cache_lock:
+            self._cache[cache_key] = (time.monotonic() + self.cache_ttl, data)
+        return dict(data)
+
+    def _request_params(self, horizons_id: str, start: date, stop: date, step: str = '1 d') -> Dict:
+        return {
+            'format': 'json',
+            'COMMAND': f"'{horizons_id}'",
+            'OBJ_DATA': 'NO',
+            'MAKE_EPHEM': 'YES',
+            'EPHEM_TYPE': 'VECTORS',
+            'CENTER': "'500@399'",  # geocentric
+            'START_TIME': f"'{start.isoformat()}'",
+            'STOP_TIME': f"'{stop.isoformat()}'",
+            'STEP_SIZE': f"'{step}'",
+            'VEC_TABLE': '2',
+            'OUT_UNITS': 'KM-S',
+            'CSV_FORMAT': 'YES'
+        }
+
+    def fetch_ephemeris(self, horizons_id: str, start: date, stop: date, step: str = '1 d') -> EphemerisSeries:
+        """Download and parse a block of state vectors"""
+        response = self.session.get(
+            self.base_url,
+            params=self._request_params(horizons_id, start, stop, step),
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        return parse_horizons_vectors(response.json().get('result', ''))
+
+    def _fetch(self, horizons_id: str, on_date: date) -> Dict:
+        series = self.fetch_ephemeris(horizons_id, on_date, on_date + timedelta(days=1))
+        if not len(series):
+            raise ValueError('No state vectors in Horizons response')
+        return {
+            'distance_from_earth': float(series.distance[0]),
+            'velocity_magnitude': float(series.speed[0])
+        }
+
+PROVIDERS = {
+    ComputedDataProvider.name: ComputedDataProvider,
+    HorizonsDataProvider.name: HorizonsDataProvider
+}
+
+def build_http_session(pool_size: int = 10) -> requests.Session:
+    """Session with a keep-alive connection pool of pool_size connections per host"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def create_provider(name: str, session: Optional[requests.Session] = None) -> PlanetaryDataProvider:
+    """New instance of a single provider; remote providers use session when given"""
+    provider_class = PROVIDERS[name]
+    if provider_class.requires_network and session is not None:
+        return provider_class(session=session)
+    return provider_class()
+
+def create_providers(names: str, session: Optional[requests.Session] = None) -> List[PlanetaryDataProvider]:
+    """Providers for a comma-separated list of names, computed data always first.
+
+    The caller owns the instances. NASAService holds them, and the
+    per-process service container holds NASAService, so remote caches and
+    circuit breakers survive across requests but never cross a fork.
+    """
+    selected = [ComputedDataProvider.name]
+    for name in (n.strip() for n in names.split(',')):
+        if name in PROVIDERS and name not in selected:
+            selected.append(name)
+    return [create_provider(name, session) for name in selected]
@@ -0,0 +1,134 @@
+import io
+import os
+import re
+import logging
+from typing import Dict, List, Optional
+import numpy as np
+
+# Calendar stamps in the text (non-CSV) VECTORS layout, e.g.
+# "2460000.500000000 = A.D. 2023-Feb-25 00:00:00.0000 TDB"
+_CALENDAR_STAMP = re.compile(r'=\s*A\.D\.[^\n]*?TDB')
+# A number at line start (the Julian date) or right after '=' (X =, VX=, ...)
+_LABELLED_NUMBER = re.compile(r'(?:^|=)\s*([-+]?\d+\.\d*(?:[Ee][-+]?\d+)?)', re.MULTILINE)
+
+class EphemerisSeries:
+    """State vectors for one body as contiguous float64 arrays.
+
+    epoch    (N,)   Julian date (TDB)
+    position (N, 3) km
+    velocity (N, 3) km/s
+    """
+
+    __slots__ = ('epoch', 'position', 'velocity')
+
+    def __init__(self, epoch: np.ndarray, position: np.ndarray, velocity: np.ndarray):
+        self.epoch = np.ascontiguousarray(epoch, dtype=np.float64)
+        self.position = np.ascontiguousarray(position, dtype=np.float64).reshape(-1, 3)
+        self.velocity = np.ascontiguousarray(velocity, dtype=np.float64).reshape(-1, 3)
+
+    def __len__(self) -> int:
+        return self.epoch.shape[0]
+
+    @property
+    def distance(self) -> np.ndarray:
+        """Distance from the ephemeris center for every row, km"""
+        return np.sqrt(np.einsum('ij,ij->i', self.position, self.position))
+
+    @property
+    def speed(self) -> np.ndarray:
+        """Speed relative to the ephemeris center for every row, km/s"""
+        return np.sqrt(np.einsum('ij,ij->i', self.velocity, self.velocity))
+
+    def summary(self) -> Dict:
+        """Scalar statistics over the whole series"""
+        if not len(self):
+            return {}
+
+        distance = self.distance
+        speed = self.speed
+        return {
+            'samples': len(self),
+            'start_epoch': float(self.epoch[0]),
+            'stop_epoch': float(self.epoch[-1]),
+            'distance_min': float(distance.min()),
+            'distance_max': float(distance.max()),
+            'distance_mean': float(distance.mean()),
+            'speed_min': float(speed.min()),
+            'speed_max': float(speed.max()),
+            'speed_mean': float(speed.mean())
+        }
+
+    def to_records(self, limit: Optional[int] = None) -> List[Dict]:
+        """Row dicts for JSON storage and display"""
+        rows = slice(0, limit)
+        return [
+            {
+                'epoch': float(epoch),
+                'x': float(p[0]), 'y': float(p[1]), 'z': float(p[2]),
+                'vx': float(v[0]), 'vy': float(v[1]), 'vz': float(v[2])
+            }
+            for epoch, p, v in zip(self.epoch[rows], self.position[rows], self.velocity[rows])
+        ]
+
+    def save(self, path: str):
+        """Persist as a compressed .npz file"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez_compressed(path, epoch=self.epoch, position=self.position, velocity=self.velocity)
+
+    @classmethod
+    def load(cls, path: str) -> 'EphemerisSeries':
+        with np.load(path) as data:
+            return cls(data['epoch'], data['position'], data['velocity'])
+
+def _data_block(result: str) -> str:
+    start = result.find('$$SOE')
+    stop = result.find('$$EOE')
+    if start == -1 or stop == -1 or stop < start:
+        raise ValueError('No $$SOE/$$EOE block in Horizons response')
+    return result[start + len('$$SOE'):stop].strip()
+
+def parse_horizons_vectors(result: str) -> EphemerisSeries:
+    """Parse a Horizons VECTORS (table 2) block into an EphemerisSeries.
+
+    Handles both CSV_FORMAT=YES rows (JDTDB, Calendar Date, X, Y, Z, VX, VY, VZ,)
+    and the default multi-line text layout.
+    """
+    block = _data_block(result)
+    if not block:
+        return EphemerisSeries(np.empty(0), np.empty((0, 3)), np.empty((0, 3)))
+
+    if ',' in block.split('\n', 1)[0]:
+        table = np.loadtxt(io.StringIO(block), delimiter=',', usecols=(0, 2, 3, 4, 5, 6, 7),
+                           dtype=np.float64, ndmin=2)
+    else:
+        numbers = _LABELLED_NUMBER.findall(_CALENDAR_STAMP.sub('', block))
+        table = np.array(numbers, dtype=np.float64)
+        if table.size % 7:
+            raise ValueError('Horizons text block is not VEC_TABLE=2 (7 values per record)')
+        table = table.reshape(-1, 7)
+
+    return EphemerisSeries(table[:, 0], table[:, 1:4], table[:, 4:7])
+
+class EphemerisStore:
+    """Compressed .npz files of ingested ephemerides, one per query"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.logger = logging.getLogger(__name__)
+
+    def _path(self, body: str, start: str, stop: str, step: str) -> str:
+        name = re.sub(r'[^A-Za-z0-9_.-]+', '_', f"{body}_{start}_{stop}_{step}")
+        return os.path.join(self.directory, f"{name}.npz")
+
+    def get(self, body: str, start: str, stop: str, step: str) -> Optional[EphemerisSeries]:
+        path = self._path(body, start, stop, step)
+        if not os.path.exists(path):
+            return None
+        try:
+            return EphemerisSeries.load(path)
+        except Exception as e:
+            self.logger.error(f"Unreadable ephemeris file {path}: {e}")
+            return None
+
+    def put(self, body: str, start: str, stop: str, step: str, series: EphemerisSeries):
+        series.save(self._path(body, start, stop, step))
@@ -0,0 +1,264 @@
+import io
+import csv
+import json
+import logging
+from typing import Iterator, List, Optional
+from sqlalchemy import func, select
+from app import db
+from models import Mission, MissionAnalysis, SimulationResult
+from services.search_service import SearchService
+from utils.validators import ValidationError
+
+EXPORT_FORMATS = {
+    'jsonl': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+# (name, column, kind) of every exported field; kind picks the encoding and the Parquet type
+EXPORT_COLUMNS = (
+    ('id', Mission.id, 'int'),
+    ('name', Mission.name, 'str'),
+    ('description', Mission.description, 'str'),
+    ('destination', Mission.destination, 'str'),
+    ('launch_date', Mission.launch_date, 'date'),
+    ('mission_duration', Mission.mission_duration, 'int'),
+    ('crew_size', Mission.crew_size, 'int'),
+    ('spacecraft_type', Mission.spacecraft_type, 'str'),
+    ('payload_mass', Mission.payload_mass, 'float'),
+    ('fuel_requirements', Mission.fuel_requirements, 'float'),
+    ('status', Mission.status, 'enum'),
+    ('risk_level', Mission.risk_level, 'enum'),
+    ('feasibility_score', Mission.feasibility_score, 'float'),
+    ('created_at', Mission.created_at, 'datetime'),
+    ('updated_at', Mission.updated_at, 'datetime'),
+    ('analyzed_at', Mission.analyzed_at, 'datetime'),
+    ('analysis_id', MissionAnalysis.id, 'int'),
+    ('analysis_version', MissionAnalysis.analysis_version, 'str'),
+    ('analysis_created_at', MissionAnalysis.created_at, 'datetime'),
+    ('trajectory_analysis', MissionAnalysis.trajectory_analysis, 'json'),
+    ('risk_assessment', MissionAnalysis.risk_assessment, 'json'),
+    ('resource_requirements', MissionAnalysis.resource_requirements, 'json'),
+    ('timeline_analysis', MissionAnalysis.timeline_analysis, 'json'),
+    ('recommendations', MissionAnalysis.recommendations, 'json'),
+    ('optimization_suggestions', MissionAnalysis.optimization_suggestions, 'json'),
+    ('simulation_id', SimulationResult.id, 'int'),
+    ('simulation_created_at', SimulationResult.created_at, 'datetime'),
+    ('simulation_trials', SimulationResult.trials, 'int'),
+    ('simulation_seed', SimulationResult.seed, 'int'),
+    ('success_probability', SimulationResult.success_probability, 'float'),
+    ('radiation_exposure', SimulationResult.radiation_exposure, 'float'),
+    ('micrometeorite_risk', SimulationResult.micrometeorite_risk, 'float'),
+    ('failure_modes', SimulationResult.failure_modes, 'json'),
+)
+COLUMN_NAMES = [name for name, _, _ in EXPORT_COLUMNS]
+
+def _pyarrow():
+    """pyarrow and pyarrow.parquet, imported on first use since Parquet export is optional"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValidationError("Parquet export needs pyarrow installed on the server; use jsonl or csv")
+    return pyarrow, pyarrow.parquet
+
+def _text_value(value, kind: str):
+    """Value for JSON Lines (JSON columns stay nested) and CSV"""
+    if value is None:
+        return None
+    if kind == 'enum':
+        return value.value
+    if kind in ('date', 'datetime'):
+        return value.isoformat()
+    return value
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain.
+
+    It reports the total bytes written as its position, which the Parquet
+    writer records as column chunk offsets, so draining never shifts them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+class MissionExport:
+    """One export run; iterate it for the encoded bytes.
+
+    rows and last_id are updated as the export streams, so a caller can
+    report where to resume (after_id=last_id) if the stream is cut short.
+    """
+
+    def __init__(self, service: 'ExportService', statement, fmt: str):
+        self.service = service
+        self.statement = statement
+        self.format = fmt
+        self.mimetype = EXPORT_FORMATS[fmt]
+        self.rows = 0
+        self.last_id: Optional[int] = None
+
+    def __iter__(self) -> Iterator[bytes]:
+        encoder = {'jsonl': self._jsonl, 'csv': self._csv, 'parquet': self._parquet}[self.format]
+        try:
+            yield from encoder(self._partitions())
+        except Exception as e:
+            self.service.logger.error(f"Export failed after {self.rows} rows (last id {self.last_id}): {e}")
+            raise
+
+    def _partitions(self) -> Iterator[List]:
+        # yield_per streams from a server-side cursor where the driver has one
+        result = db.session.execute(self.statement.execution_options(yield_per=self.service.batch_size))
+        for partition in result.partitions():
+            self.rows += len(partition)
+            self.last_id = partition[-1][0]
+            yield partition
+
+    def _jsonl(self, partitions) -> Iterator[bytes]:
+        for partition in partitions:
+            lines = []
+            for row in partition:
+                record = {name: _text_value(value, kind) for (name, _, kind), value in zip(EXPORT_COLUMNS, row)}
+                lines.append(json.dumps(record, separators=(',', ':')))
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+    def _csv(self, partitions) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(COLUMN_NAMES)
+        for partition in partitions:
+            for row in partition:
+                writer.writerow([
+                    json.dumps(value, separators=(',', ':')) if kind == 'json' and value is not None
+                    else _text_value(value, kind)
+                    for (_, _, kind), value in zip(EXPORT_COLUMNS, row)
+                ])
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+        if self.rows == 0:
+            yield buffer.getvalue().encode('utf-8')
+
+    def _parquet(self, partitions) -> Iterator[bytes]:
+        pa, pq = _pyarrow()
+        types = {'int': pa.int64(), 'float': pa.float64(), 'str': pa.string(), 'enum': pa.string(),
+                 'json': pa.string(), 'date': pa.date32(), 'datetime': pa.timestamp('us')}
+        schema = pa.schema([(name, types[kind]) for name, _, kind in EXPORT_COLUMNS])
+
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), schema, compression='snappy')
+        pending = []
+
+        def write_row_group():
+            columns = list(zip(*pending)) if pending else [[] for _ in EXPORT_COLUMNS]
+            arrays = []
+            for (_, _, kind), field, values in zip(EXPORT_COLUMNS, schema, columns):
+                if kind == 'enum':
+                    values = [value.value if value is not None else None for value in values]
+                elif kind == 'json':
+                    values = [json.dumps(value, separators=(',', ':')) if value is not None else None for value in values]
+                arrays.append(pa.array(values, type=field.type))
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            pending.clear()
+
+        for partition in partitions:
+            pending.extend(partition)
+            if len(pending) >= self.service.parquet_row_group_size:
+                write_row_group()
+                yield sink.drain()
+        if pending:
+            write_row_group()
+        writer.close()
+        yield sink.drain()
+
+class ExportService:
+    """Streams missions with their latest analysis and latest simulation.
+
+    Each mission is one flat row, ordered by id, read batch_size rows at a
+    time and encoded as it arrives. Memory stays flat whatever the table
+    size; Parquet holds at most one row group. Filters are those of the
+    search API. after_id resumes an interrupted export where it stopped.
+    """
+
+    def __init__(self, search_service: Optional[SearchService] = None, batch_size: int = 1000,
+                 parquet_row_group_size: int = 10000):
+        self.search_service = search_service or SearchService()
+        self.batch_size = batch_size
+        self.parquet_row_group_size = parquet_row_group_size
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config, search_service: Optional[SearchService] = None) -> 'ExportService':
+        """Build the service from the Flask app config"""
+        return cls(
+            search_service=search_service,
+            batch_size=config.get('EXPORT_BATCH_SIZE', 1000),
+            parquet_row_group_size=config.get('EXPORT_PARQUET_ROW_GROUP_SIZE', 10000)
+        )
+
+    def export(self, args, fmt: str = 'jsonl') -> MissionExport:
+        """Prepare an export from query arguments (a werkzeug MultiDict); raises ValidationError up front"""
+        fmt = (fmt or 'jsonl').lower()
+        if fmt not in EXPORT_FORMATS:
+            raise ValidationError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+        if fmt == 'parquet':
+            _pyarrow()
+        return MissionExport(self, self._statement(args), fmt)
+
+    def _statement(self, args):
+        latest_simulation = (select(func.max(SimulationResult.id))
+                             .where(SimulationResult.mission_id == Mission.id)
+                             .correlate(Mission)
+                             .scalar_subquery())
+        # latest_analysis_id is set on every save and backfilled by migration 0005; the
+        # lookup only runs for rows written without it (e.g. before `flask upgrade-schema`)
+        newest_analysis = (select(MissionAnalysis.id)
+                           .where(MissionAnalysis.mission_id == Mission.id)
+                           .order_by(MissionAnalysis.created_at.desc(), MissionAnalysis.id.desc())
+                           .limit(1)
+                           .correlate(Mission)
+                           .scalar_subquery())
+        latest_analysis = func.coalesce(Mission.latest_analysis_id, newest_analysis)
+        statement = (select(*(column.label(name) for name, column, _ in EXPORT_COLUMNS))
+                     .select_from(Mission)
+                     .outerjoin(MissionAnalysis, MissionAnalysis.id == latest_analysis)
+                     .outerjoin(SimulationResult, SimulationResult.id == latest_simulation))
+
+        for condition in self.search_service.filters(args):
+            statement = statement.where(condition)
+
+        after_id = args.get('after_id')
+        if after_id:
+            try:
+                statement = statement.where(Mission.id > int(after_id))
+            except ValueError:
+                raise ValidationError("after_id must be a mission id")
+
+        limit = args.get('limit')
+        if limit:
+            try:
+                limit = int(limit)
+            except ValueError:
+                raise ValidationError("limit must be a positive integer")
+            if limit < 1:
+                raise ValidationError("limit must be a positive integer")
+            statement = statement.limit(limit)
+
+        return statement.order_by(Mission.id)
@@ -0,0 +1,297 @@
+import math
+from typing import Dict, List, NamedTuple, Optional
+from services.body_catalog import EARTH_ELEMENTS, get_body
+from services.orbital_mechanics import AU, DAY, MU_SUN
+
+SCORER_VERSION = 'physics-1.2'
+
+G0 = 9.80665  # m/s²
+
+class SpacecraftProfile(NamedTuple):
+    isp: float        # s, main propulsion
+    dry_mass: float   # kg, vehicle without payload or propellant
+    max_crew: int
+
+SPACECRAFT_PROFILES = {
+    'orion': SpacecraftProfile(316, 16500, 4),     # AJ10 service module engine
+    'dragon': SpacecraftProfile(300, 9500, 7),
+    'soyuz': SpacecraftProfile(302, 6500, 3),
+    'artemis': SpacecraftProfile(450, 30000, 4),   # cryogenic transfer stage
+    'custom': SpacecraftProfile(350, 10000, 6)
+}
+DEFAULT_PROFILE = SPACECRAFT_PROFILES['custom']
+
+# Lunar orbit insertion (trans-lunar injection is flown by the launch vehicle)
+LUNAR_CAPTURE_DELTA_V = 0.9  # km/s
+LUNAR_TRANSIT_DAYS = 3.0
+
+CAPTURE_PERIAPSIS_RADII = 1.1
+CAPTURE_APOAPSIS_RADII = 100.0
+
+# Crewed missions return: time at the destination between capture and the departure burn home
+MIN_STAY_DAYS = 3.0
+
+# Uncrewed spacecraft: tanks and structure as a fraction of the payload
+UNCREWED_STRUCTURE_FRACTION = 0.2
+
+# Food, water and oxygen with partial recycling (NASA BVAD order of magnitude)
+CONSUMABLES_PER_CREW_DAY = 5.0  # kg
+
+# Radiation dose rates, mSv/day. Deep space from Curiosity RAD cruise data;
+# surfaces from RAD, LRO/CRaTER and Galileo-era Jovian estimates.
+DEEP_SPACE_DOSE_RATE = 1.84
+SURFACE_DOSE_RATES = {
+    'mars': 0.64,
+    'moon': 1.37,
+    'europa': 5400.0,
+    'io': 36000.0,
+    'titan': 0.01,
+}
+CAREER_DOSE_LIMIT = 600.0  # mSv, NASA-STD-3001 (2022)
+
+# A hard physical violation (Δv shortfall, ending before arrival) keeps the score in the critical band
+INFEASIBLE_SCORE_CAP = 25.0
+
+def _risk_level(score: float) -> str:
+    if score >= 75:
+        return 'low'
+    if score >= 55:
+        return 'medium'
+    if score >= 35:
+        return 'high'
+    return 'critical'
+
+def hohmann_estimate(semi_major_axis_au: float) -> Dict:
+    """Arrival v∞ and transit time of a Hohmann transfer between circular coplanar orbits"""
+    r1 = EARTH_ELEMENTS.semi_major_axis * AU
+    r2 = semi_major_axis_au * AU
+    a = (r1 + r2) / 2
+    return {
+        'arrival_vinf': abs(math.sqrt(MU_SUN / r2) - math.sqrt(MU_SUN * (2 / r2 - 1 / a))),
+        'transit_days': math.pi * math.sqrt(a ** 3 / MU_SUN) / DAY
+    }
+
+def capture_delta_v(body, vinf: float) -> float:
+    """Periapsis burn from a hyperbolic approach into a loose capture orbit, km/s
+
+    The capture orbit has periapsis at 1.1 and apoapsis at 100 body radii,
+    as orbiters typically use before lowering their orbit with aerobraking.
+    """
+    mu = body.gravity * body.radius ** 2 / 1000  # m/s² · km² -> km³/s²
+    periapsis = body.radius * CAPTURE_PERIAPSIS_RADII
+    apoapsis = body.radius * CAPTURE_APOAPSIS_RADII
+    hyperbolic = math.sqrt(vinf ** 2 + 2 * mu / periapsis)
+    elliptical = math.sqrt(mu * (2 / periapsis - 2 / (periapsis + apoapsis)))
+    return hyperbolic - elliptical
+
+def _number(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+class MissionPhysics(NamedTuple):
+    """Nominal quantities the scorer and the Monte Carlo simulation start from"""
+    body: object
+    profile: SpacecraftProfile
+    crew: int
+    duration: float              # days
+    payload: Optional[float]     # kg
+    fuel: Optional[float]        # kg
+    one_way_dv: float            # km/s spacecraft burn per leg
+    transit_days: float          # per leg
+    trajectory_source: str
+    legs: int
+    required_dv: float           # km/s
+    exhaust_velocity: float      # km/s
+    burnout_mass: float          # kg
+    required_ratio: float
+    fuel_needed: float           # kg
+    available_dv: Optional[float]
+    dv_margin: Optional[float]
+    consumables: float           # kg
+    space_days: float
+    surface_days: float
+    surface_dose_rate: float     # mSv/day
+    dose: float                  # mSv
+
+def nominal_physics(mission_data: Dict, launch_window: Optional[Dict] = None) -> MissionPhysics:
+    """Δv budget, propellant, consumables and dose for a mission as specified.
+
+    The launch vehicle flies the Earth departure, so the spacecraft's
+    propellant covers orbit capture at the destination and, for crewed
+    missions (assumed to return), the symmetric departure home; Earth
+    return is by direct entry. Arrival v∞ and transit time come from the
+    Lambert window in launch_window when available, else a Hohmann
+    estimate.
+    """
+    body = get_body(mission_data.get('destination') or '')
+    profile = SPACECRAFT_PROFILES.get(mission_data.get('spacecraft_type'), DEFAULT_PROFILE)
+    crew = int(_number(mission_data.get('crew_size')) or 0)
+    duration = _number(mission_data.get('mission_duration')) or 0
+    payload = _number(mission_data.get('payload_mass'))
+    fuel = _number(mission_data.get('fuel_requirements'))
+    window = launch_window or {}
+
+    # Spacecraft Δv and transit time for one leg
+    if body.elements is None:
+        one_way_dv, transit_days, trajectory_source = LUNAR_CAPTURE_DELTA_V, LUNAR_TRANSIT_DAYS, 'lunar transfer estimate'
+    elif window.get('launch_date_arrival_vinf') is not None and window.get('launch_date_time_of_flight_days'):
+        one_way_dv = capture_delta_v(body, float(window['launch_date_arrival_vinf']))
+        transit_days = float(window['launch_date_time_of_flight_days'])
+        trajectory_source = 'Lambert porkchop'
+    else:
+        estimate = hohmann_estimate(body.elements.semi_major_axis)
+        one_way_dv = capture_delta_v(body, estimate['arrival_vinf'])
+        transit_days = estimate['transit_days']
+        trajectory_source = 'Hohmann estimate'
+
+    legs = 2 if crew > 0 else 1
+    required_dv = one_way_dv * legs
+
+    # Rocket equation, km/s
+    exhaust_velocity = profile.isp * G0 / 1000
+    if crew or not payload:
+        burnout_mass = profile.dry_mass + (payload or 0)
+    else:
+        burnout_mass = payload * (1 + UNCREWED_STRUCTURE_FRACTION)
+    required_ratio = math.exp(required_dv / exhaust_velocity)
+    fuel_needed = burnout_mass * (required_ratio - 1)
+    available_dv = exhaust_velocity * math.log((burnout_mass + fuel) / burnout_mass) if fuel else None
+    dv_margin = available_dv / required_dv if available_dv is not None else None
+
+    consumables = crew * duration * CONSUMABLES_PER_CREW_DAY
+    space_days = min(duration, transit_days * legs)
+    surface_days = max(duration - transit_days * legs, 0)
+    surface_dose_rate = SURFACE_DOSE_RATES.get(body.key, DEEP_SPACE_DOSE_RATE)
+    dose = (space_days * DEEP_SPACE_DOSE_RATE + surface_days * surface_dose_rate) if crew else 0.0
+
+    return MissionPhysics(
+        body, profile, crew, duration, payload, fuel, one_way_dv, transit_days, trajectory_source,
+        legs, required_dv, exhaust_velocity, burnout_mass, required_ratio, fuel_needed,
+        available_dv, dv_margin, consumables, space_days, surface_days, surface_dose_rate, dose
+    )
+
+def score_mission(mission_data: Dict, launch_window: Optional[Dict] = None) -> Dict:
+    """Score feasibility and risk from first-principles quantities.
+
+    See nominal_physics for the model. Pure arithmetic; runs in tens of
+    microseconds and returns the same shape as an AI analysis.
+    """
+    physics = nominal_physics(mission_data, launch_window)
+    body, profile, crew, duration, payload = physics.body, physics.profile, physics.crew, physics.duration, physics.payload
+    one_way_dv, transit_days, trajectory_source = physics.one_way_dv, physics.transit_days, physics.trajectory_source
+    legs, required_dv, required_ratio = physics.legs, physics.required_dv, physics.required_ratio
+    fuel_needed, available_dv, dv_margin = physics.fuel_needed, physics.available_dv, physics.dv_margin
+    consumables, surface_days, dose = physics.consumables, physics.surface_days, physics.dose
+
+    score = 100.0
+    infeasible = False
+    risks: List[str] = []
+    recommendations: List[str] = []
+
+    if dv_margin is None:
+        score -= 10
+        risks.append('Propellant load not specified')
+        recommendations.append(f"Budget at least {fuel_needed:,.0f} kg of propellant for {required_dv:.2f} km/s")
+    elif dv_margin < 1:
+        score -= 50
+        infeasible = True
+        risks.append(f"Δv shortfall: {available_dv:.2f} of {required_dv:.2f} km/s available")
+        recommendations.append(f"Increase propellant to {fuel_needed:,.0f} kg or use a higher-Isp stage")
+    elif dv_margin < 1.1:
+        score -= 20
+        risks.append(f"Thin Δv margin ({(dv_margin - 1) * 100:.0f}%)")
+        recommendations.append('Carry at least 10% Δv reserve for trajectory corrections')
+
+    if required_ratio > 20:
+        score -= 15
+        risks.append(f"Mass ratio {required_ratio:.1f} exceeds single-stage practicality")
+        recommendations.append('Stage the transfer or pre-position propellant')
+
+    if duration and duration < transit_days:
+        score -= 40
+        infeasible = True
+        risks.append(f"Mission ends before arrival ({duration:.0f} d vs {transit_days:.0f} d transit)")
+    elif crew and duration < transit_days * 2 + MIN_STAY_DAYS:
+        score -= 20
+        risks.append('Duration too short for a crewed return leg')
+        recommendations.append(f"Extend the mission to at least {transit_days * 2 + MIN_STAY_DAYS:.0f} days for the return")
+
+    if crew > profile.max_crew:
+        score -= 15
+        risks.append(f"Crew of {crew} exceeds {profile.max_crew}-seat capacity")
+
+    if crew:
+        if payload is None:
+            score -= 5
+            recommendations.append(f"Allocate about {consumables:,.0f} kg of payload to consumables")
+        elif payload < consumables:
+            score -= 25
+            risks.append(f"Payload {payload:,.0f} kg below {consumables:,.0f} kg of crew consumables")
+            recommendations.append('Increase payload mass or add closed-loop life support')
+
+        # Dose is a risk to mitigate (shielding, shorter stays), not a physical impossibility
+        dose_fraction = dose / CAREER_DOSE_LIMIT
+        if dose_fraction > 1.5:
+            score -= 35
+            risks.append(f"Radiation dose {dose:,.0f} mSv far exceeds the {CAREER_DOSE_LIMIT:.0f} mSv career limit")
+            recommendations.append('Shorten transit and surface stay or add storm-shelter shielding')
+        elif dose_fraction > 1:
+            score -= 25
+            risks.append(f"Radiation dose {dose:,.0f} mSv exceeds the {CAREER_DOSE_LIMIT:.0f} mSv career limit")
+            recommendations.append('Shorten transit or add storm-shelter shielding')
+        elif dose_fraction > 0.5:
+            score -= 10
+            risks.append(f"Radiation dose {dose:,.0f} mSv is over half the career limit")
+
+    score = max(0.0, min(INFEASIBLE_SCORE_CAP if infeasible else 100.0, score))
+    risk_level = 'critical' if infeasible else _risk_level(score)
+    if not risks:
+        risks.append('No first-order physical constraints violated')
+
+    return {
+        'feasibility_score': round(score, 1),
+        'risk_level': risk_level,
+        'infeasible': infeasible,
+        'summary': (f"Physics assessment for {body.display_name}: "
+                    f"{'not feasible as specified' if infeasible else f'{risk_level} risk'}, "
+                    f"{required_dv:.2f} km/s over {transit_days * legs:.0f} transit days."),
+        'technical_analysis': {
+            'trajectory': f"{trajectory_source}: {one_way_dv:.2f} km/s capture burn and {transit_days:.0f} days per leg, {legs} leg(s)",
+            'propulsion': (f"Isp {profile.isp:.0f} s needs mass ratio {required_ratio:.2f} "
+                           f"({fuel_needed:,.0f} kg propellant)"
+                           + (f"; {available_dv:.2f} km/s available" if available_dv is not None else '')),
+            'life_support': (f"{consumables:,.0f} kg consumables for {crew * duration:,.0f} crew-days"
+                             if crew else 'Uncrewed mission'),
+            'communication': (f"One-way light time up to {body.distance_from_earth / 299792.458 / 60:.1f} min"
+                              if body.distance_from_earth else 'Not assessed')
+        },
+        'risk_assessment': {
+            'primary_risks': risks,
+            'radiation_exposure': f"{dose:,.0f} mSv estimated crew dose" if crew else 'No crew exposure',
+            'micrometeorite_risk': 'Not modelled by the physics scorer'
+        },
+        'resource_requirements': {
+            'fuel_estimate': f"{fuel_needed:,.0f} kg",
+            'water_requirements': f"{consumables:,.0f} kg total consumables" if crew else 'None'
+        },
+        'recommendations': recommendations,
+        'timeline': {
+            'transit_time': f"{transit_days / 30.44:.1f} months",
+            'mission_operations': f"{surface_days / 30.44:.1f} months",
+            'return_time': f"{transit_days / 30.44:.1f} months" if legs == 2 else 'Not applicable'
+        },
+        'physics': {
+            'delta_v_required': round(required_dv, 3),
+            'delta_v_available': round(available_dv, 3) if available_dv is not None else None,
+            'delta_v_margin': round(dv_margin, 3) if dv_margin is not None else None,
+            'mass_ratio_required': round(required_ratio, 3),
+            'fuel_required_kg': round(fuel_needed, 1),
+            'consumables_kg': round(consumables, 1),
+            'radiation_dose_msv': round(dose, 1),
+            'transit_days': round(transit_days, 1),
+            'trajectory_source': trajectory_source
+        },
+        'ai_model': SCORER_VERSION
+    }
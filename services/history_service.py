@@ -0,0 +1,133 @@
+import base64
+import logging
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import text, tuple_
+from sqlalchemy.orm import load_only
+from models import Mission, MissionStatistics
+from app import db
+from services.statistics_service import SUMMARY_ROW_ID
+
+# Everything a history row shows; the JSON blobs stay deferred
+LIST_COLUMNS = (
+    Mission.id, Mission.name, Mission.description, Mission.destination,
+    Mission.launch_date, Mission.mission_duration, Mission.crew_size,
+    Mission.spacecraft_type, Mission.payload_mass, Mission.fuel_requirements,
+    Mission.status, Mission.risk_level, Mission.feasibility_score,
+    Mission.created_at, Mission.analyzed_at, Mission.display_summary
+)
+
+class HistoryPage(NamedTuple):
+    missions: List[Mission]
+    next_cursor: Optional[str]   # older missions
+    prev_cursor: Optional[str]   # newer missions
+    approximate_total: int
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+def encode_cursor(mission: Mission) -> str:
+    raw = f"{mission.created_at.isoformat()}|{mission.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for malformed input"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, mission_id = base64.urlsafe_b64decode(padded).decode('utf-8').split('|')
+        return datetime.fromisoformat(created_at), int(mission_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+class HistoryService:
+    """Newest-first mission history with keyset pagination on (created_at, id).
+
+    Pages are found by seeking the ix_mission_created index from the cursor
+    row, so page 1000 costs the same as page 1 and no COUNT(*) is needed.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def get_page(self, cursor: Optional[str] = None, direction: str = 'next', per_page: int = 10) -> HistoryPage:
+        """Missions after (older than) or before (newer than) the cursor row"""
+        query = Mission.query.options(load_only(*LIST_COLUMNS))
+        key = tuple_(Mission.created_at, Mission.id)
+        backwards = cursor is not None and direction == 'prev'
+
+        if cursor is not None:
+            position = decode_cursor(cursor)
+            query = query.filter(key > position if backwards else key < position)
+
+        if backwards:
+            query = query.order_by(Mission.created_at.asc(), Mission.id.asc())
+        else:
+            query = query.order_by(Mission.created_at.desc(), Mission.id.desc())
+
+        # One extra row tells us whether another page exists in this direction
+        rows = query.limit(per_page + 1).all()
+        has_more = len(rows) > per_page
+        missions = rows[:per_page]
+        if backwards:
+            missions.reverse()
+
+        if not missions:
+            return HistoryPage([], None, None, self.approximate_count())
+
+        if backwards:
+            next_cursor = encode_cursor(missions[-1])
+            prev_cursor = encode_cursor(missions[0]) if has_more else None
+        else:
+            next_cursor = encode_cursor(missions[-1]) if has_more else None
+            prev_cursor = encode_cursor(missions[0]) if cursor is not None else None
+
+        return HistoryPage(missions, next_cursor, prev_cursor, self.approximate_count())
+
+    def approximate_count(self) -> int:
+        """Mission count without scanning the table where possible.
+
+        Uses the statistics summary row when it is maintained, then the planner's
+        row estimate on PostgreSQL, and only falls back to COUNT(*) elsewhere.
+        """
+        try:
+            if current_app.config.get('STATS_SUMMARY_ENABLED', False):
+                summary = db.session.get(MissionStatistics, SUMMARY_ROW_ID)
+                if summary is not None:
+                    return summary.total_missions
+
+            if db.engine.dialect.name == 'postgresql':
+                estimate = db.session.execute(
+                    text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'mission'::regclass")
+                ).scalar()
+                if estimate is not None and estimate >= 0:
+                    return int(estimate)
+
+            return db.session.query(db.func.count(Mission.id)).scalar() or 0
+
+        except Exception as e:
+            self.logger.error(f"Error estimating mission count: {e}")
+            return 0
+
+    @staticmethod
+    def to_dict(mission: Mission) -> Dict:
+        """List-row fields for the JSON API"""
+        return {
+            'id': mission.id,
+            'name': mission.name,
+            'destination': mission.destination,
+            'launch_date': mission.launch_date.isoformat(),
+            'mission_duration': mission.mission_duration,
+            'crew_size': mission.crew_size,
+            'spacecraft_type': mission.spacecraft_type,
+            'status': mission.status.value,
+            'risk_level': mission.risk_level.value if mission.risk_level else None,
+            'feasibility_score': mission.feasibility_score,
+            'created_at': mission.created_at.isoformat(),
+            'analyzed_at': mission.analyzed_at.isoformat() if mission.analyzed_at else None
+        }
@@ -0,0 +1,368 @@
+import math
+import uuid
+import logging
+import random
+from typing import List, NamedTuple, Optional, Tuple
+from datetime import datetime, timedelta
+from sqlalchemy import update, or_, and_, func, select, text
+from sqlalchemy.orm import aliased
+from models import AnalysisJob, JobStatus, Mission, MissionStatus
+from app import db
+
+# Serializes claims on Postgres when max_concurrency is set (see JobQueue.claim)
+_PG_CLAIM_LOCK_KEY = 72823502
+
+class JobLease(NamedTuple):
+    """One worker's claim on a job, captured when it was claimed.
+
+    complete() and fail() only apply while the job is still RUNNING under
+    this worker and attempt; once the lease has expired and another worker
+    reclaimed the job, they change nothing.
+    """
+    job_id: int
+    mission_id: int
+    worker_id: str
+    attempt: int
+    max_attempts: int
+
+    @classmethod
+    def of(cls, job: AnalysisJob) -> 'JobLease':
+        return cls(job.id, job.mission_id, job.locked_by, job.attempts, job.max_attempts)
+
+    def conditions(self) -> tuple:
+        return (
+            AnalysisJob.id == self.job_id,
+            AnalysisJob.status == JobStatus.RUNNING,
+            AnalysisJob.locked_by == self.worker_id,
+            AnalysisJob.attempts == self.attempt
+        )
+
+class JobQueue:
+    """Database-backed queue of mission analysis jobs.
+
+    Jobs are claimed with a compare-and-set UPDATE so several worker
+    processes can poll the same table safely. A claimed job holds a lease
+    (the visibility timeout); if the worker dies the lease expires and the
+    job becomes claimable again.
+    """
+
+    ACTIVE_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+    def __init__(self, max_attempts: int = 3, visibility_timeout: int = 300,
+                 max_concurrency: int = 0, retry_backoff: float = 15.0,
+                 batch_claim_size: int = 20, batch_concurrency: int = 4):
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout  # seconds
+        self.max_concurrency = max_concurrency        # 0 = unlimited
+        self.retry_backoff = retry_backoff            # seconds, doubled per attempt
+        self.batch_claim_size = batch_claim_size      # jobs of one batch claimed together
+        self.batch_concurrency = batch_concurrency    # AI calls in flight per claimed batch
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config) -> 'JobQueue':
+        """Build a queue from the Flask app config"""
+        return cls(
+            max_attempts=config.get('ANALYSIS_JOB_MAX_ATTEMPTS', 3),
+            visibility_timeout=config.get('ANALYSIS_JOB_VISIBILITY_TIMEOUT', 300),
+            max_concurrency=config.get('ANALYSIS_JOB_MAX_CONCURRENCY', 0),
+            retry_backoff=config.get('ANALYSIS_JOB_RETRY_BACKOFF', 15.0),
+            batch_claim_size=config.get('ANALYSIS_BATCH_CLAIM_SIZE', 20),
+            batch_concurrency=config.get('ANALYSIS_BATCH_AI_CONCURRENCY', 4)
+        )
+
+    def enqueue(self, mission_id: int, force_refresh: bool = False) -> AnalysisJob:
+        """Queue a mission for analysis, reusing an in-flight job if one exists"""
+        try:
+            mission = Mission.query.get_or_404(mission_id)
+
+            existing = self.get_active_job(mission_id)
+            if existing:
+                if force_refresh and not existing.force_refresh:
+                    existing.force_refresh = True
+                    db.session.commit()
+                return existing
+
+            job = AnalysisJob(
+                mission_id=mission.id,
+                status=JobStatus.QUEUED,
+                max_attempts=self.max_attempts,
+                force_refresh=force_refresh,
+                available_at=datetime.utcnow()
+            )
+            mission.status = MissionStatus.ANALYZING
+
+            db.session.add(job)
+            db.session.commit()
+
+            self.logger.info(f"Queued analysis job {job.id} for mission {mission.id}")
+            return job
+
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Error queueing analysis for mission {mission_id}: {e}")
+            raise
+
+    def enqueue_batch(self, mission_ids: List[int], force_refresh: bool = False) -> Tuple[str, List[AnalysisJob]]:
+        """Queue several missions under one batch id in a single transaction.
+
+        Missions that already have an in-flight job keep it and are not
+        re-queued.
+        """
+        try:
+            batch_id = str(uuid.uuid4())
+            missions = Mission.query.filter(Mission.id.in_(mission_ids)).all()
+
+            active = {
+                job.mission_id for job in AnalysisJob.query.filter(
+                    AnalysisJob.mission_id.in_(mission_ids),
+                    AnalysisJob.status.in_(self.ACTIVE_STATUSES)
+                )
+            }
+
+            now = datetime.utcnow()
+            jobs = []
+            for mission in missions:
+                if mission.id in active:
+                    continue
+                jobs.append(AnalysisJob(
+                    mission_id=mission.id,
+                    status=JobStatus.QUEUED,
+                    max_attempts=self.max_attempts,
+                    force_refresh=force_refresh,
+                    batch_id=batch_id,
+                    available_at=now
+                ))
+                mission.status = MissionStatus.ANALYZING
+
+            db.session.add_all(jobs)
+            db.session.commit()
+
+            self.logger.info(f"Queued batch {batch_id} with {len(jobs)} mission(s)")
+            return batch_id, jobs
+
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Error queueing analysis batch: {e}")
+            raise
+
+    def get_batch_jobs(self, batch_id: str) -> List[AnalysisJob]:
+        """All jobs of a batch, for progress reporting"""
+        return AnalysisJob.query.filter_by(batch_id=batch_id).order_by(AnalysisJob.id).all()
+
+    def claim_batch(self, worker_id: str, job: AnalysisJob) -> List[AnalysisJob]:
+        """Claim queued siblings of a claimed batch job so they are analyzed together"""
+        if not job.batch_id:
+            return [job]
+
+        now = datetime.utcnow()
+        limit = max(self.batch_claim_size - 1, 0)
+        if self.max_concurrency:
+            self._lock_claims()
+            # The claimed job is already running, so it is part of the count
+            limit = min(limit, self.max_concurrency - self._running_count(now))
+
+        candidate_ids = []
+        if limit > 0:
+            candidate_ids = [row.id for row in AnalysisJob.query.with_entities(AnalysisJob.id).filter(
+                AnalysisJob.batch_id == job.batch_id,
+                AnalysisJob.status == JobStatus.QUEUED,
+                AnalysisJob.available_at <= now
+            ).order_by(AnalysisJob.id).limit(limit)]
+
+        jobs = [job]
+        if candidate_ids:
+            # The whole group shares one lease sized for the AI calls it will make
+            rounds = math.ceil((len(candidate_ids) + 1) / max(self.batch_concurrency, 1))
+            locked_until = now + timedelta(seconds=self.visibility_timeout * rounds)
+
+            conditions = [AnalysisJob.id.in_(candidate_ids), AnalysisJob.status == JobStatus.QUEUED]
+            if self.max_concurrency:
+                # Rechecked in the UPDATE: all of the group fits under the cap, or none of it is claimed
+                conditions.append(self._has_capacity(now, len(candidate_ids)))
+            db.session.execute(
+                update(AnalysisJob)
+                .where(*conditions)
+                .values(
+                    status=JobStatus.RUNNING,
+                    attempts=AnalysisJob.attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=locked_until,
+                    started_at=now
+                )
+            )
+            job.locked_until = locked_until
+        # Also ends the transaction holding the claim lock
+        db.session.commit()
+
+        if candidate_ids:
+            jobs += AnalysisJob.query.populate_existing().filter(
+                AnalysisJob.id.in_(candidate_ids),
+                AnalysisJob.status == JobStatus.RUNNING,
+                AnalysisJob.locked_by == worker_id
+            ).all()
+
+        self.logger.info(f"Worker {worker_id} claimed {len(jobs)} job(s) of batch {job.batch_id}")
+        return jobs
+
+    def get_job(self, job_id: int) -> Optional[AnalysisJob]:
+        """Get a job by id"""
+        return db.session.get(AnalysisJob, job_id)
+
+    def get_active_job(self, mission_id: int) -> Optional[AnalysisJob]:
+        """Get the queued or running job for a mission, if any"""
+        return AnalysisJob.query.filter(
+            AnalysisJob.mission_id == mission_id,
+            AnalysisJob.status.in_(self.ACTIVE_STATUSES)
+        ).order_by(AnalysisJob.id.desc()).first()
+
+    def get_latest_job(self, mission_id: int) -> Optional[AnalysisJob]:
+        """Get the most recent job for a mission"""
+        return AnalysisJob.query.filter_by(mission_id=mission_id).order_by(
+            AnalysisJob.id.desc()
+        ).first()
+
+    def claim(self, worker_id: str, batch: int = 5) -> Optional[AnalysisJob]:
+        """Claim the next available job, or return None if nothing is claimable"""
+        now = datetime.utcnow()
+
+        # Cheap early exit; the claiming UPDATE below is what enforces the limit
+        if self.max_concurrency and self._running_count(now) >= self.max_concurrency:
+            return None
+
+        # Queued jobs that are due, plus running jobs whose lease has expired
+        candidates = AnalysisJob.query.filter(or_(
+            and_(AnalysisJob.status == JobStatus.QUEUED, AnalysisJob.available_at <= now),
+            and_(AnalysisJob.status == JobStatus.RUNNING, AnalysisJob.locked_until <= now)
+        )).order_by(AnalysisJob.available_at, AnalysisJob.id).limit(batch).all()
+
+        for job in candidates:
+            if job.attempts >= job.max_attempts:
+                self._mark_failed(job.id, job.mission_id, job.last_error or 'Lease expired after final attempt',
+                                  AnalysisJob.status == job.status, AnalysisJob.attempts == job.attempts)
+                continue
+
+            # Compare-and-set on (status, attempts) so only one worker wins the job
+            conditions = [
+                AnalysisJob.id == job.id,
+                AnalysisJob.status == job.status,
+                AnalysisJob.attempts == job.attempts
+            ]
+            if self.max_concurrency:
+                self._lock_claims()
+                conditions.append(self._has_capacity(now, 1))
+
+            result = db.session.execute(
+                update(AnalysisJob)
+                .where(*conditions)
+                .values(
+                    status=JobStatus.RUNNING,
+                    attempts=AnalysisJob.attempts + 1,
+                    locked_by=worker_id,
+                    locked_until=now + timedelta(seconds=self.visibility_timeout),
+                    started_at=now
+                )
+            )
+            db.session.commit()
+
+            if result.rowcount == 1:
+                claimed = db.session.get(AnalysisJob, job.id, populate_existing=True)
+                self.logger.info(f"Worker {worker_id} claimed job {claimed.id} (attempt {claimed.attempts})")
+                return claimed
+
+        return None
+
+    def _lock_claims(self):
+        """Hold the claim lock until commit on Postgres, where concurrent UPDATEs
+        would each count the others' claims as not yet running"""
+        if db.session.get_bind().dialect.name == 'postgresql':
+            db.session.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': _PG_CLAIM_LOCK_KEY})
+
+    def _has_capacity(self, now: datetime, claiming: int):
+        """UPDATE condition: claiming more jobs keeps the running count within max_concurrency"""
+        running = aliased(AnalysisJob)
+        return select(func.count()).select_from(running).where(
+            running.status == JobStatus.RUNNING,
+            running.locked_until > now
+        ).scalar_subquery() <= self.max_concurrency - claiming
+
+    def _running_count(self, now: datetime) -> int:
+        return AnalysisJob.query.filter(
+            AnalysisJob.status == JobStatus.RUNNING,
+            AnalysisJob.locked_until > now
+        ).count()
+
+    def complete(self, lease: JobLease, analysis_id: Optional[int] = None) -> bool:
+        """Mark a job as succeeded; False if the lease was lost and the job left untouched"""
+        result = db.session.execute(
+            update(AnalysisJob)
+            .where(*lease.conditions())
+            .values(
+                status=JobStatus.SUCCEEDED,
+                analysis_id=analysis_id,
+                locked_until=None,
+                finished_at=datetime.utcnow()
+            )
+        )
+        db.session.commit()
+
+        if result.rowcount != 1:
+            self.logger.warning(f"Job {lease.job_id} was reclaimed before {lease.worker_id} completed it")
+            return False
+        return True
+
+    def fail(self, lease: JobLease, error: str) -> bool:
+        """Record a failed attempt, rescheduling the job if attempts remain; False if the lease was lost"""
+        if lease.attempt >= lease.max_attempts:
+            return self._mark_failed(lease.job_id, lease.mission_id, error, *lease.conditions())
+
+        delay = self.retry_backoff * (2 ** (lease.attempt - 1))
+        delay += random.uniform(0, self.retry_backoff)
+        result = db.session.execute(
+            update(AnalysisJob)
+            .where(*lease.conditions())
+            .values(
+                status=JobStatus.QUEUED,
+                last_error=error,
+                locked_by=None,
+                locked_until=None,
+                available_at=datetime.utcnow() + timedelta(seconds=delay)
+            )
+        )
+        if result.rowcount != 1:
+            db.session.rollback()
+            self.logger.warning(f"Job {lease.job_id} was reclaimed before {lease.worker_id} recorded its failure")
+            return False
+
+        # The mission is still in flight while a retry is pending
+        mission = db.session.get(Mission, lease.mission_id)
+        if mission:
+            mission.status = MissionStatus.ANALYZING
+
+        db.session.commit()
+        self.logger.warning(f"Job {lease.job_id} failed (attempt {lease.attempt}), retrying in {delay:.0f}s: {error}")
+        return True
+
+    def _mark_failed(self, job_id: int, mission_id: int, error: str, *conditions) -> bool:
+        """Mark a job and its mission as permanently failed, if the job still matches conditions"""
+        result = db.session.execute(
+            update(AnalysisJob)
+            .where(AnalysisJob.id == job_id, *conditions)
+            .values(
+                status=JobStatus.FAILED,
+                last_error=error,
+                locked_until=None,
+                finished_at=datetime.utcnow()
+            )
+        )
+        if result.rowcount != 1:
+            db.session.rollback()
+            return False
+
+        mission = db.session.get(Mission, mission_id)
+        if mission:
+            mission.status = MissionStatus.FAILED
+
+        db.session.commit()
+        self.logger.error(f"Job {job_id} failed permanently: {error}")
+        return True
@@ -0,0 +1,151 @@
+from functools import lru_cache
+from typing import Dict, NamedTuple
+from datetime import date, timedelta
+import numpy as np
+from services.body_catalog import EARTH_ELEMENTS, get_body
+from services.orbital_mechanics import (
+    AU, DAY, departure_delta_v, hohmann_transfer_time, lambert, propagate, state_vectors
+)
+
+JD_ORDINAL_OFFSET = 1721424.5  # Julian date of date.fromordinal(0) at midnight
+
+def to_julian_date(day: date) -> float:
+    return day.toordinal() + JD_ORDINAL_OFFSET
+
+def from_julian_date(jd: float) -> date:
+    return date.fromordinal(int(round(jd - JD_ORDINAL_OFFSET)))
+
+class Porkchop(NamedTuple):
+    """Lambert transfer costs over a departure × time-of-flight grid"""
+    destination: str
+    departure_jd: np.ndarray   # (D,)
+    tof_days: np.ndarray       # (T,)
+    c3: np.ndarray             # (D, T) km²/s²
+    arrival_vinf: np.ndarray   # (D, T) km/s
+    delta_v: np.ndarray        # (D, T) km/s, LEO departure burn + arrival v∞
+
+    def best(self) -> Dict:
+        """The minimum-Δv transfer and the minimum-C3 transfer"""
+        dv_index = np.unravel_index(np.nanargmin(self.delta_v), self.delta_v.shape)
+        c3_index = np.unravel_index(np.nanargmin(self.c3), self.c3.shape)
+        departure = from_julian_date(self.departure_jd[dv_index[0]])
+        tof = float(self.tof_days[dv_index[1]])
+
+        return {
+            'departure_date': departure.isoformat(),
+            'arrival_date': (departure + timedelta(days=round(tof))).isoformat(),
+            'time_of_flight_days': round(tof, 1),
+            'delta_v': round(float(self.delta_v[dv_index]), 3),
+            'c3': round(float(self.c3[dv_index]), 3),
+            'arrival_vinf': round(float(self.arrival_vinf[dv_index]), 3),
+            'min_c3': round(float(self.c3[c3_index]), 3),
+            'min_c3_departure_date': from_julian_date(self.departure_jd[c3_index[0]]).isoformat(),
+            'min_c3_time_of_flight_days': round(float(self.tof_days[c3_index[1]]), 1)
+        }
+
+    def best_on(self, day: date) -> Dict:
+        """Cheapest transfer departing on the grid row nearest to a date"""
+        row = int(np.abs(self.departure_jd - to_julian_date(day)).argmin())
+        column = int(np.nanargmin(self.delta_v[row]))
+        return {
+            'delta_v': float(self.delta_v[row, column]),
+            'c3': float(self.c3[row, column]),
+            'arrival_vinf': float(self.arrival_vinf[row, column]),
+            'time_of_flight_days': float(self.tof_days[column])
+        }
+
+    def to_dict(self) -> Dict:
+        """Grid for charting; unsolvable cells become None"""
+        def grid(values):
+            return np.where(np.isfinite(values), np.round(values, 3), np.nan).tolist()
+
+        return {
+            'destination': self.destination,
+            'departure_dates': [from_julian_date(jd).isoformat() for jd in self.departure_jd],
+            'time_of_flight_days': np.round(self.tof_days, 1).tolist(),
+            'c3': [[None if np.isnan(v) else v for v in row] for row in grid(self.c3)],
+            'delta_v': [[None if np.isnan(v) else v for v in row] for row in grid(self.delta_v)],
+            'best': self.best()
+        }
+
+@lru_cache(maxsize=256)
+def compute_porkchop(destination: str, departure_start: date, departure_end: date,
+                     tof_min: float, tof_max: float, departures: int = 60, tofs: int = 60) -> Porkchop:
+    """Solve Lambert's problem for every (departure, time of flight) cell at once.
+
+    Memoized per argument tuple; the returned arrays are read-only because
+    they are shared between callers.
+    """
+    body = get_body(destination)
+    if body.elements is None:
+        raise ValueError(f"No heliocentric elements for {destination}")
+
+    departure_jd = np.linspace(to_julian_date(departure_start), to_julian_date(departure_end), departures)
+    tof_days = np.linspace(tof_min, tof_max, tofs)
+    arrival_jd = departure_jd[:, None] + tof_days[None, :]
+
+    r_earth, v_earth = state_vectors(EARTH_ELEMENTS, departure_jd)
+    r_target, v_target = state_vectors(body.elements, arrival_jd)
+
+    shape = arrival_jd.shape + (3,)
+    v1, v2 = lambert(
+        np.broadcast_to(r_earth[:, None, :], shape),
+        r_target,
+        np.broadcast_to(tof_days[None, :] * DAY, arrival_jd.shape)
+    )
+
+    c3 = np.sum((v1 - v_earth[:, None, :]) ** 2, axis=-1)
+    arrival_vinf = np.linalg.norm(v2 - v_target, axis=-1)
+    delta_v = departure_delta_v(c3) + arrival_vinf
+
+    for values in (departure_jd, tof_days, c3, arrival_vinf, delta_v):
+        values.setflags(write=False)
+
+    return Porkchop(destination, departure_jd, tof_days, c3, arrival_vinf, delta_v)
+
+def search_range(destination: str, launch_date: date):
+    """Departure and time-of-flight ranges around a launch date.
+
+    The departure span is centred on the first of the launch month so
+    missions launching in the same month share one memoized grid.
+    """
+    body = get_body(destination)
+    half_span = int(min(body.synodic_period / 2, 200))
+    center = launch_date.replace(day=1)
+
+    hohmann = hohmann_transfer_time(1.0, body.elements.semi_major_axis)
+    return (
+        center - timedelta(days=half_span),
+        center + timedelta(days=half_span),
+        round(hohmann * 0.5, 1),
+        round(hohmann * 1.5, 1)
+    )
+
+def porkchop_for_launch(destination: str, launch_date: date) -> Porkchop:
+    return compute_porkchop(destination, *search_range(destination, launch_date))
+
+def transfer_trajectory(destination: str, departure: date, tof_days: float, samples: int = 2000) -> Dict[str, np.ndarray]:
+    """Heliocentric transfer arc sampled at evenly spaced times.
+
+    Solves Lambert's problem from Earth's position on the departure date
+    to the destination's position at arrival, then propagates the
+    departure state along the arc. Positions are in AU.
+    """
+    body = get_body(destination)
+    if body.elements is None:
+        raise ValueError(f"No heliocentric elements for {destination}")
+
+    departure_jd = to_julian_date(departure)
+    r_earth, _ = state_vectors(EARTH_ELEMENTS, np.array([departure_jd]))
+    r_target, _ = state_vectors(body.elements, np.array([departure_jd + tof_days]))
+    v1, _ = lambert(r_earth, r_target, np.array([tof_days * DAY]))
+
+    days = np.linspace(0.0, tof_days, samples)
+    position, velocity = propagate(r_earth[0], v1[0], days * DAY)
+    return {
+        'day': days,
+        'x': position[:, 0] / AU,
+        'y': position[:, 1] / AU,
+        'z': position[:, 2] / AU,
+        'speed': np.linalg.norm(velocity, axis=-1)
+    }
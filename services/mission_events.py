@@ -0,0 +1,317 @@
+import os
+import json
+import time
+import queue
+from select import select as wait_readable
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect, select, text
+from app import db
+from models import Mission
+
+# Postgres NOTIFY channel shared by every process writing missions
+CHANNEL = 'mission_events'
+
+# Mission attributes whose changes are pushed to subscribers
+TRACKED_ATTRIBUTES = ('status', 'feasibility_score', 'risk_level')
+
+# Put on a subscriber's stream when it may have missed events; the client re-reads the current state
+RESYNC = {'type': 'resync'}
+
+# How far behind the newest updated_at the poller looks again, for transactions that
+# stamped their rows before a poll but committed after it
+POLL_LAG = timedelta(seconds=30)
+
+def _enum_value(value):
+    return value.value if value is not None and hasattr(value, 'value') else value
+
+def _state(mission) -> tuple:
+    return tuple(_enum_value(getattr(mission, name)) for name in TRACKED_ATTRIBUTES)
+
+def mission_event(mission: Mission, previous_status=None) -> Dict:
+    """Status payload for a mission, as streamed to clients"""
+    return {
+        'mission_id': mission.id,
+        'status': _enum_value(mission.status),
+        'previous_status': _enum_value(previous_status),
+        'feasibility_score': mission.feasibility_score,
+        'risk_level': _enum_value(mission.risk_level),
+        'analyzed_at': mission.analyzed_at.isoformat() if mission.analyzed_at else None,
+        'timestamp': datetime.utcnow().isoformat()
+    }
+
+def use_notify(config, dialect_name: str) -> bool:
+    """Whether events travel through Postgres NOTIFY (every process) or stay in this process"""
+    backend = config.get('MISSION_EVENTS_BACKEND', 'auto')
+    if backend == 'auto':
+        return dialect_name == 'postgresql'
+    return backend == 'postgres'
+
+class Subscription:
+    """One client's bounded queue of events, optionally limited to some missions"""
+
+    def __init__(self, mission_ids: Optional[Iterable[int]], queue_size: int):
+        self.mission_ids = frozenset(mission_ids) if mission_ids else None
+        self.overflowed = False
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    def wants(self, payload: Dict) -> bool:
+        return self.mission_ids is None or payload.get('mission_id') in self.mission_ids
+
+    def offer(self, payload: Dict) -> bool:
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except queue.Full:
+            self.overflowed = True
+            return False
+
+    def get(self, timeout: float) -> Optional[Dict]:
+        """Next event, RESYNC after an overflow, or None when timeout passes quietly"""
+        if self.overflowed:
+            return RESYNC
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class MissionEventBus:
+    """Fans mission status events out to the SSE streams of this process.
+
+    Events are published after the transaction that produced them
+    commits. With the NOTIFY backend a listener thread relays every
+    process's notifications. Without it, commits made in this process are
+    published directly and a poller thread picks up the rest (analyses run
+    by separate worker processes) from recently updated missions, every
+    poll interval. A subscriber that falls queue_size events behind is
+    dropped and told to resync, so one stalled client never holds memory
+    or slows publishers.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self.logger = logging.getLogger(__name__)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._listening = False
+        self._poller: Optional[threading.Thread] = None
+        # Last published (status, score, risk) per recently changed mission, while polling
+        self._states: Dict[int, tuple] = {}
+        self._stats = {'published': 0, 'delivered': 0, 'dropped_subscribers': 0, 'listener_reconnects': 0,
+                       'polls': 0, 'poll_errors': 0}
+
+    def subscribe(self, mission_ids: Optional[Iterable[int]] = None) -> Subscription:
+        subscription = Subscription(mission_ids, self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, payload: Dict):
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._stats['published'] += 1
+            if self._poller is not None:
+                self._states[payload['mission_id']] = tuple(payload.get(name) for name in TRACKED_ATTRIBUTES)
+
+        for subscription in subscribers:
+            if not subscription.wants(payload):
+                continue
+            if subscription.offer(payload):
+                with self._lock:
+                    self._stats['delivered'] += 1
+            else:
+                self.unsubscribe(subscription)
+                with self._lock:
+                    self._stats['dropped_subscribers'] += 1
+
+    def resync_all(self):
+        """Tell every subscriber to re-read state, e.g. after notifications may have been lost"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._subscribers.clear()
+        for subscription in subscribers:
+            subscription.overflowed = True
+
+    def ensure_listener(self, engine):
+        """Start the LISTEN thread for this process if it is not running"""
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(target=self._listen, args=(engine,),
+                                              name='mission-events-listener', daemon=True)
+            self._listener.start()
+
+    def _listen(self, engine):
+        delay = 1.0
+        while True:
+            connection = None
+            try:
+                # A dedicated connection, kept out of the pool for as long as it listens
+                connection = engine.raw_connection()
+                connection.detach()
+                dbapi_connection = connection.dbapi_connection
+                dbapi_connection.autocommit = True
+                with dbapi_connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                # Anything committed while disconnected was missed
+                self.resync_all()
+                self._listening = True
+                self.logger.info(f"Listening for {CHANNEL} notifications in process {os.getpid()}")
+                delay = 1.0
+
+                while True:
+                    if wait_readable([dbapi_connection], [], [], 30) == ([], [], []):
+                        continue
+                    dbapi_connection.poll()
+                    while dbapi_connection.notifies:
+                        notification = dbapi_connection.notifies.pop(0)
+                        try:
+                            self.publish(json.loads(notification.payload))
+                        except ValueError:
+                            self.logger.warning(f"Ignoring malformed {CHANNEL} payload")
+
+            except Exception as e:
+                self._listening = False
+                with self._lock:
+                    self._stats['listener_reconnects'] += 1
+                self.logger.error(f"{CHANNEL} listener failed, reconnecting in {delay:.0f}s: {e}")
+                time.sleep(delay)
+                delay = min(delay * 2, 30.0)
+            finally:
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def ensure_poller(self, engine, interval: float):
+        """Start the polling thread for this process if it is not running"""
+        with self._lock:
+            if self._poller is not None and self._poller.is_alive():
+                return
+            self._poller = threading.Thread(target=self._poll, args=(engine, interval),
+                                            name='mission-events-poller', daemon=True)
+            self._poller.start()
+
+    def _poll(self, engine, interval: float):
+        table = Mission.__table__
+        columns = [table.c.id, table.c.updated_at, table.c.analyzed_at] + [table.c[name] for name in TRACKED_ATTRIBUTES]
+        watermark = None
+        observed: Dict[int, datetime] = {}
+        while True:
+            try:
+                with engine.connect() as connection:
+                    if watermark is None:
+                        # Start from now: earlier changes are in every new stream's snapshot
+                        watermark = connection.execute(select(func.max(table.c.updated_at))).scalar()
+                        seeding = True
+                    else:
+                        seeding = False
+                    query = select(*columns)
+                    if watermark is not None:
+                        query = query.where(table.c.updated_at >= watermark - POLL_LAG)
+                    rows = connection.execute(query).all()
+
+                for row in rows:
+                    state = _state(row)
+                    observed[row.id] = row.updated_at
+                    with self._lock:
+                        previous = self._states.get(row.id)
+                        self._states[row.id] = state
+                    if not seeding and previous != state:
+                        self.publish(mission_event(row, previous_status=previous[0] if previous else None))
+                    if row.updated_at is not None and (watermark is None or row.updated_at > watermark):
+                        watermark = row.updated_at
+
+                if watermark is not None:
+                    # Rows older than the window can only come back with a newer updated_at
+                    cutoff = watermark - POLL_LAG
+                    stale = [mission_id for mission_id, updated_at in observed.items()
+                             if updated_at is None or updated_at < cutoff]
+                    with self._lock:
+                        for mission_id in stale:
+                            del observed[mission_id]
+                            self._states.pop(mission_id, None)
+                with self._lock:
+                    self._stats['polls'] += 1
+            except Exception as e:
+                with self._lock:
+                    self._stats['poll_errors'] += 1
+                self.logger.error(f"Mission event poll failed: {e}")
+            time.sleep(interval)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['subscribers'] = len(self._subscribers)
+        stats['listening'] = self._listening
+        stats['polling'] = self._poller is not None and self._poller.is_alive()
+        return stats
+
+_bus: Optional[MissionEventBus] = None
+_bus_pid: Optional[int] = None
+_bus_lock = threading.Lock()
+
+def get_event_bus(config=None) -> MissionEventBus:
+    """The process-wide bus, created on first use (and again in a forked worker)"""
+    global _bus, _bus_pid
+    with _bus_lock:
+        if _bus is None or _bus_pid != os.getpid():
+            queue_size = (config or {}).get('MISSION_EVENTS_QUEUE_SIZE', 100)
+            _bus = MissionEventBus(queue_size=queue_size)
+            _bus_pid = os.getpid()
+        return _bus
+
+def _collect_events(session) -> List[Dict]:
+    events = []
+    for obj in session.new:
+        if isinstance(obj, Mission):
+            events.append(mission_event(obj))
+
+    for obj in session.dirty:
+        if not isinstance(obj, Mission) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[name].history.has_changes() for name in TRACKED_ATTRIBUTES):
+            continue
+        history = state.attrs['status'].history
+        previous = history.deleted[0] if history.deleted else obj.status
+        events.append(mission_event(obj, previous_status=previous))
+    return events
+
+@event.listens_for(db.session, 'after_flush')
+def _capture_events(session, flush_context):
+    """NOTIFY inside the transaction (delivered on commit), or hold events until commit"""
+    if not has_app_context():
+        return
+    events = _collect_events(session)
+    if not events:
+        return
+
+    if use_notify(current_app.config, session.get_bind().dialect.name):
+        connection = session.connection()
+        for payload in events:
+            connection.execute(text('SELECT pg_notify(:channel, :payload)'),
+                               {'channel': CHANNEL, 'payload': json.dumps(payload)})
+    else:
+        session.info.setdefault('mission_events', []).extend(events)
+
+@event.listens_for(db.session, 'after_commit')
+def _publish_events(session):
+    events = session.info.pop('mission_events', None)
+    if events:
+        bus = get_event_bus()
+        for payload in events:
+            bus.publish(payload)
+
+@event.listens_for(db.session, 'after_rollback')
+def _discard_events(session):
+    session.info.pop('mission_events', None)
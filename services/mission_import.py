@@ -0,0 +1,181 @@
+import io
+import csv
+import json
+import time
+import logging
+from datetime import datetime
+from itertools import islice
+from types import SimpleNamespace
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from app import db
+from models import Mission, MissionStatus
+from services.projection_service import build_detail, build_summary
+from services.statistics_service import record_bulk_insert
+from utils.validators import MissionBatchValidator
+
+SUPPORTED_FORMATS = ('csv', 'jsonl')
+REQUIRED_COLUMNS = ('name', 'destination', 'launch_date', 'mission_duration', 'crew_size', 'spacecraft_type')
+
+class ImportFormatError(ValueError):
+    """Raised when the input as a whole cannot be read (unknown format, missing CSV columns)"""
+    pass
+
+def detect_format(explicit: Optional[str] = None, filename: Optional[str] = None,
+                  content_type: Optional[str] = None) -> str:
+    """Import format from an explicit name, the file extension or the content type"""
+    if explicit:
+        fmt = explicit.lower()
+    elif filename and '.' in filename:
+        fmt = filename.rsplit('.', 1)[1].lower()
+    elif content_type and 'csv' in content_type:
+        fmt = 'csv'
+    elif content_type and ('ndjson' in content_type or 'jsonl' in content_type):
+        fmt = 'jsonl'
+    else:
+        fmt = None
+
+    fmt = {'ndjson': 'jsonl'}.get(fmt, fmt)
+    if fmt not in SUPPORTED_FORMATS:
+        raise ImportFormatError(f"Unsupported import format; use one of: {', '.join(SUPPORTED_FORMATS)}")
+    return fmt
+
+class MissionImporter:
+    """Streams missions from CSV or JSON Lines into the database.
+
+    Input is read incrementally and handled batch_size records at a time,
+    so memory stays bounded whatever the file size. Each batch is
+    validated together, and its valid rows are written with multi-row
+    INSERTs of insert_chunk_size rows, each committed on its own. A chunk
+    the database rejects is retried row by row so only the offending rows
+    fail. Invalid rows are reported with their line number and never stop
+    the import.
+    """
+
+    def __init__(self, batch_size: int = 1000, insert_chunk_size: int = 500, max_errors: int = 1000,
+                 validator: Optional[MissionBatchValidator] = None):
+        self.batch_size = batch_size
+        self.insert_chunk_size = insert_chunk_size
+        self.max_errors = max_errors  # errors listed in the report; all are counted
+        self.validator = validator or MissionBatchValidator()
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config) -> 'MissionImporter':
+        """Build the importer from the Flask app config"""
+        return cls(
+            batch_size=config.get('MISSION_IMPORT_BATCH_SIZE', 1000),
+            insert_chunk_size=config.get('MISSION_IMPORT_CHUNK_SIZE', 500),
+            max_errors=config.get('MISSION_IMPORT_MAX_ERRORS', 1000)
+        )
+
+    def import_stream(self, stream: BinaryIO, fmt: str, dry_run: bool = False) -> Dict:
+        """Import every record of a binary stream; dry_run validates without writing"""
+        started = time.perf_counter()
+        report = {'success': True, 'format': fmt, 'dry_run': dry_run, 'processed': 0, 'imported': 0,
+                  'failed': 0, 'errors': [], 'errors_truncated': False}
+
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', errors='replace', newline='')
+        try:
+            records = self._records(text, fmt)
+            while True:
+                batch = list(islice(records, self.batch_size))
+                if not batch:
+                    break
+                self._import_batch(batch, report, dry_run)
+        except ImportFormatError as e:
+            report.update(success=False, error=str(e))
+        finally:
+            text.detach()
+
+        report['duration_seconds'] = round(time.perf_counter() - started, 3)
+        self.logger.info(
+            f"Mission import ({fmt}{', dry run' if dry_run else ''}): {report['processed']} processed, "
+            f"{report['imported']} imported, {report['failed']} failed in {report['duration_seconds']}s"
+        )
+        return report
+
+    def _records(self, text: io.TextIOBase, fmt: str) -> Iterator[Tuple[int, Optional[Dict], Optional[str]]]:
+        """(line number, record, parse error) for each input record"""
+        if fmt == 'csv':
+            reader = csv.DictReader(text)
+            missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+            if missing:
+                raise ImportFormatError(f"CSV header is missing columns: {', '.join(missing)}")
+            for record in reader:
+                yield reader.line_num, record, None
+            return
+
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if isinstance(record, dict):
+                yield line_number, record, None
+            else:
+                yield line_number, None, "Each line must be a JSON object"
+
+    def _import_batch(self, batch: List[Tuple[int, Optional[Dict], Optional[str]]], report: Dict, dry_run: bool):
+        report['processed'] += len(batch)
+        parsed = [(line, record) for line, record, error in batch if error is None]
+        for line, _, error in batch:
+            if error is not None:
+                self._record_error(report, line, [error])
+
+        cleaned, errors = self.validator.validate([record for _, record in parsed])
+        rows = []
+        for (line, _), mission, messages in zip(parsed, cleaned, errors):
+            if messages:
+                self._record_error(report, line, messages)
+            else:
+                rows.append((line, mission))
+
+        if dry_run:
+            report['imported'] += len(rows)
+            return
+
+        created_at = datetime.utcnow()
+        for start in range(0, len(rows), self.insert_chunk_size):
+            self._insert_chunk(rows[start:start + self.insert_chunk_size], created_at, report)
+
+    def _insert_chunk(self, rows: List[Tuple[int, Dict]], created_at: datetime, report: Dict):
+        values = [self._row_values(mission, created_at) for _, mission in rows]
+        try:
+            # A Core insert keeps the chunk one executemany; the ORM bulk path splits rows by which values are NULL
+            db.session.execute(Mission.__table__.insert(), values)
+            record_bulk_insert(db.session, len(values))
+            db.session.commit()
+            report['imported'] += len(values)
+            return
+        except Exception as e:
+            db.session.rollback()
+            # The driver's message, without the statement and its parameters
+            e = getattr(e, 'orig', None) or e
+            if len(rows) == 1:
+                self.logger.warning(f"Import row on line {rows[0][0]} rejected: {e}")
+                self._record_error(report, rows[0][0], ['Rejected by the database'])
+                return
+            self.logger.warning(f"Import chunk of {len(rows)} rows rejected, retrying row by row: {e}")
+
+        for row in rows:
+            self._insert_chunk([row], created_at, report)
+
+    @staticmethod
+    def _row_values(mission: Dict, created_at: datetime) -> Dict:
+        """Column values for one INSERT row, with the display projections the flush hook would write"""
+        values = dict(mission, status=MissionStatus.DRAFT, created_at=created_at, updated_at=created_at)
+        fields = SimpleNamespace(id=None, risk_level=None, feasibility_score=None, analyzed_at=None,
+                                 ai_analysis=None, nasa_data=None, **values)
+        values['display_summary'] = build_summary(fields)
+        values['display_detail'] = build_detail(fields)
+        return values
+
+    def _record_error(self, report: Dict, line: int, messages: List[str]):
+        report['failed'] += 1
+        if len(report['errors']) < self.max_errors:
+            report['errors'].append({'line': line, 'errors': messages})
+        else:
+            report['errors_truncated'] = True
@@ -1,15 +1,29 @@
+import time
 import logging
-from typing import Dict, List, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
-from models import Mission, MissionAnalysis, SimulationResult, MissionStatus, RiskLevel
+from sqlalchemy import insert
+from flask import current_app
+from models import Mission, MissionAnalysis, MissionReport, SimulationResult, MissionStatus, RiskLevel
 from app import db
 from services.nasa_service import NASAService
-from services.ai_service import AIService
+from services.ai_service import AIService, REPORT_MODEL, REPORT_SECTIONS
+from services.job_queue import JobQueue
+from services.statistics_service import StatisticsService
+from services.pipeline import Pipeline, Stage
+from services.feasibility_scorer import score_mission
+from services.report_store import ReportStore
+from utils.validators import MissionValidator, ValidationError
 
 class MissionService:
-    def __init__(self):
-        self.nasa_service = NASAService()
-        self.ai_service = AIService()
+    def __init__(self, nasa_service: Optional[NASAService] = None, ai_service: Optional[AIService] = None,
+                 report_store: Optional[ReportStore] = None, job_queue: Optional[JobQueue] = None):
+        self.nasa_service = nasa_service or NASAService()
+        self.ai_service = ai_service or AIService()
+        self.report_store = report_store or ReportStore()
+        self.job_queue = job_queue
         self.logger = logging.getLogger(__name__)
     
     def create_mission(self, mission_data: Dict) -> Mission:
@@ -39,8 +53,48 @@ class MissionService:
             self.logger.error(f"Error creating mission: {e}")
             raise
     
-    def analyze_mission(self, mission_id: int) -> Dict:
-        """Perform comprehensive mission analysis"""
+    def queue_analysis(self, mission_id: int, force_refresh: bool = False) -> Dict:
+        """Queue a mission for analysis by the background workers"""
+        try:
+            job_queue = self.job_queue or JobQueue.from_config(current_app.config)
+            job = job_queue.enqueue(mission_id, force_refresh=force_refresh)
+            
+            return {
+                'job': job,
+                'success': True
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error queueing analysis for mission {mission_id}: {e}")
+            return {
+                'error': str(e),
+                'success': False
+            }
+    
+    def queue_batch_analysis(self, mission_ids: List[int], force_refresh: bool = False) -> Dict:
+        """Queue several missions for analysis as one batch"""
+        try:
+            job_queue = self.job_queue or JobQueue.from_config(current_app.config)
+            batch_id, jobs = job_queue.enqueue_batch(mission_ids, force_refresh=force_refresh)
+            
+            return {
+                'batch_id': batch_id,
+                'jobs': jobs,
+                'success': True
+            }
+            
+        except Exception as e:
+            self.logger.error(f"Error queueing analysis batch: {e}")
+            return {
+                'error': str(e),
+                'success': False
+            }
+    
+    def analyze_mission(self, mission_id: int, force_refresh: bool = False) -> Dict:
+        """Perform comprehensive mission analysis
+
+        force_refresh skips the AI analysis cache and always calls the model.
+        """
         try:
             mission = Mission.query.get_or_404(mission_id)
             
@@ -48,65 +102,26 @@ class MissionService:
             mission.status = MissionStatus.ANALYZING
             db.session.commit()
             
-            # Get NASA data
-            self.logger.info(f"Fetching NASA data for mission {mission.name}")
-            nasa_data = self.nasa_service.get_planetary_data(
-                mission.destination, 
-                mission.launch_date
-            )
+            # Prepare mission data for AI analysis
+            mission_data = self._mission_payload(mission)
             
-            # Get mission window data
-            window_data = self.nasa_service.get_mission_window(
+            self.logger.info(f"Running analysis pipeline for mission {mission.name}")
+            results, stage_timings = self._build_analysis_pipeline(
                 mission.destination,
-                mission.launch_date
-            )
-            
-            # Combine NASA data
-            combined_nasa_data = {
-                **nasa_data,
-                'mission_window': window_data
-            }
-            
-            # Prepare mission data for AI analysis
-            mission_data = {
-                'name': mission.name,
-                'description': mission.description,
-                'destination': mission.destination,
-                'launch_date': mission.launch_date.isoformat(),
-                'mission_duration': mission.mission_duration,
-                'crew_size': mission.crew_size,
-                'spacecraft_type': mission.spacecraft_type,
-                'payload_mass': mission.payload_mass,
-                'fuel_requirements': mission.fuel_requirements
-            }
+                mission.launch_date,
+                mission_data,
+                force_refresh
+            ).run()
             
-            # Perform AI analysis
-            self.logger.info(f"Performing AI analysis for mission {mission.name}")
-            ai_analysis = self.ai_service.analyze_mission_feasibility(
-                mission_data, 
-                combined_nasa_data
-            )
+            combined_nasa_data = results['nasa_data']
+            ai_analysis = {**results['ai_analysis'], 'prechecks': results['precheck']}
             
-            # Update mission with results
-            mission.nasa_data = combined_nasa_data
-            mission.ai_analysis = ai_analysis
-            mission.feasibility_score = ai_analysis.get('feasibility_score', 50)
-            mission.risk_level = RiskLevel(ai_analysis.get('risk_level', 'medium'))
-            mission.status = MissionStatus.COMPLETED
-            mission.analyzed_at = datetime.utcnow()
-            
-            # Create detailed analysis record
-            analysis = MissionAnalysis(
-                mission_id=mission.id,
-                trajectory_analysis=ai_analysis.get('technical_analysis', {}),
-                risk_assessment=ai_analysis.get('risk_assessment', {}),
-                resource_requirements=ai_analysis.get('resource_requirements', {}),
-                timeline_analysis=ai_analysis.get('timeline', {}),
-                recommendations=ai_analysis.get('recommendations', []),
-                optimization_suggestions=self._generate_optimization_suggestions(ai_analysis)
-            )
+            # Update mission with results and create detailed analysis record
+            analysis = MissionAnalysis(**self._apply_analysis(mission, combined_nasa_data, ai_analysis, stage_timings))
             
             db.session.add(analysis)
+            db.session.flush()
+            mission.latest_analysis_id = analysis.id
             db.session.commit()
             
             self.logger.info(f"Completed analysis for mission {mission.name}")
@@ -129,6 +144,237 @@ class MissionService:
                 'success': False
             }
     
+    def analyze_batch(self, mission_ids: List[int], force_refresh_ids=(), concurrency: int = 4) -> Dict[int, Dict]:
+        """Analyze several missions together
+        
+        Orbital data is fetched once per destination, AI calls run with at
+        most `concurrency` in flight, and all MissionAnalysis rows are written
+        with one bulk INSERT. Returns a result dict per mission id.
+        """
+        outcomes = {}
+        try:
+            missions = Mission.query.filter(Mission.id.in_(mission_ids)).all()
+            
+            # Shared NASA work: orbital data per body, launch windows per (body, launch date)
+            by_destination = defaultdict(list)
+            for mission in missions:
+                by_destination[mission.destination].append(mission)
+            
+            nasa_started = time.perf_counter()
+            orbital_data = {
+                destination: self.nasa_service._get_astronomical_data(destination, group[0].launch_date)
+                for destination, group in by_destination.items()
+            }
+            windows = {}
+            payloads = {}
+            for mission in missions:
+                window_key = (mission.destination, mission.launch_date)
+                if window_key not in windows:
+                    windows[window_key] = self.nasa_service.get_mission_window(*window_key)
+                astronomical_data, field_sources = orbital_data[mission.destination]
+                nasa_data = self.nasa_service.build_planetary_data(
+                    mission.destination, astronomical_data, field_sources, windows[window_key]
+                )
+                mission_data = self._mission_payload(mission)
+                payloads[mission.id] = (
+                    mission_data,
+                    {**nasa_data, 'mission_window': windows[window_key]},
+                    self._run_prechecks(mission_data, windows[window_key])
+                )
+            nasa_ms = round((time.perf_counter() - nasa_started) * 1000, 2)
+            self.logger.info(f"Batch NASA data for {len(missions)} mission(s) across {len(by_destination)} destination(s) in {nasa_ms} ms")
+            
+            app = current_app._get_current_object()
+            batch_size = max(self.ai_service.batch_size, 1)
+            
+            # Most promising missions go to the model first
+            ordered = sorted(missions, key=lambda mission: -payloads[mission.id][2]['physics']['feasibility_score'])
+            
+            ai_results = {}
+            needs_ai = defaultdict(list)  # use_cache -> mission ids
+            for mission in ordered:
+                mission_data, _, precheck = payloads[mission.id]
+                skipped = self._physics_skip(mission_data, precheck)
+                if skipped is not None:
+                    ai_results[mission.id] = (skipped, 0.0)
+                else:
+                    needs_ai[mission.id not in force_refresh_ids].append(mission.id)
+            
+            # Each chunk becomes one multi-mission prompt (AI_BATCH_SIZE missions per request)
+            chunks = [
+                (use_cache, ids[start:start + batch_size])
+                for use_cache, ids in needs_ai.items()
+                for start in range(0, len(ids), batch_size)
+            ]
+            
+            def run_ai(use_cache, chunk):
+                started = time.perf_counter()
+                with app.app_context():
+                    results = self.ai_service.analyze_missions_feasibility(
+                        [payloads[mission_id][:2] for mission_id in chunk], use_cache=use_cache
+                    )
+                elapsed = round((time.perf_counter() - started) * 1000, 2)
+                return {mission_id: (result, elapsed) for mission_id, result in zip(chunk, results)}
+            
+            with ThreadPoolExecutor(max_workers=max(concurrency, 1), thread_name_prefix='batch-ai') as pool:
+                futures = {pool.submit(run_ai, use_cache, chunk): chunk for use_cache, chunk in chunks}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    chunk = futures[future]
+                    try:
+                        ai_results.update(future.result())
+                    except Exception as e:
+                        for mission_id in chunk:
+                            outcomes[mission_id] = {'success': False, 'error': str(e)}
+                    self.logger.info(f"Batch progress: {done}/{len(futures)} AI request group(s), {len(chunk)} mission(s)")
+            
+            rows = []
+            for mission in missions:
+                if mission.id not in ai_results:
+                    continue
+                _, nasa_data, precheck = payloads[mission.id]
+                ai_result, ai_ms = ai_results[mission.id]
+                rows.append(self._apply_analysis(
+                    mission,
+                    nasa_data,
+                    {**ai_result, 'prechecks': precheck},
+                    {'nasa_data': nasa_ms, 'ai_analysis': ai_ms, 'batch_size': len(missions)}
+                ))
+            
+            inserted = []
+            if rows:
+                inserted = db.session.execute(
+                    insert(MissionAnalysis).returning(
+                        MissionAnalysis.id, MissionAnalysis.mission_id, sort_by_parameter_order=True
+                    ),
+                    rows
+                ).all()
+                by_id = {mission.id: mission for mission in missions}
+                for analysis_id, mission_id in inserted:
+                    by_id[mission_id].latest_analysis_id = analysis_id
+            
+            db.session.commit()
+            # Reported as successful only once the analyses are committed
+            for analysis_id, mission_id in inserted:
+                outcomes[mission_id] = {'success': True, 'analysis_id': analysis_id}
+            
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Error analyzing mission batch: {e}")
+            for mission_id in mission_ids:
+                outcomes.setdefault(mission_id, {'success': False, 'error': str(e)})
+            for mission_id, outcome in outcomes.items():
+                if not outcome['success']:
+                    mission = db.session.get(Mission, mission_id)
+                    if mission:
+                        mission.status = MissionStatus.FAILED
+            db.session.commit()
+        
+        for mission_id in mission_ids:
+            outcomes.setdefault(mission_id, {'success': False, 'error': 'Mission not found'})
+        return outcomes
+    
+    def _mission_payload(self, mission: Mission) -> Dict:
+        """Mission fields sent to the analysis stages"""
+        return {
+            'name': mission.name,
+            'description': mission.description,
+            'destination': mission.destination,
+            'launch_date': mission.launch_date.isoformat(),
+            'mission_duration': mission.mission_duration,
+            'crew_size': mission.crew_size,
+            'spacecraft_type': mission.spacecraft_type,
+            'payload_mass': mission.payload_mass,
+            'fuel_requirements': mission.fuel_requirements
+        }
+    
+    def _apply_analysis(self, mission: Mission, nasa_data: Dict, ai_analysis: Dict, stage_timings: Dict) -> Dict:
+        """Copy analysis results onto the mission and return the MissionAnalysis column values"""
+        mission.nasa_data = nasa_data
+        mission.ai_analysis = ai_analysis
+        mission.feasibility_score = ai_analysis.get('feasibility_score', 50)
+        mission.risk_level = RiskLevel(ai_analysis.get('risk_level', 'medium'))
+        mission.status = MissionStatus.COMPLETED
+        mission.analyzed_at = datetime.utcnow()
+        
+        return {
+            'mission_id': mission.id,
+            'trajectory_analysis': ai_analysis.get('technical_analysis', {}),
+            'risk_assessment': ai_analysis.get('risk_assessment', {}),
+            'resource_requirements': ai_analysis.get('resource_requirements', {}),
+            'timeline_analysis': ai_analysis.get('timeline', {}),
+            'recommendations': ai_analysis.get('recommendations', []),
+            'optimization_suggestions': self._generate_optimization_suggestions(ai_analysis),
+            'stage_timings': stage_timings,
+            'created_at': datetime.utcnow()
+        }
+    
+    def _build_analysis_pipeline(self, destination: str, launch_date, mission_data: Dict,
+                                 force_refresh: bool = False) -> Pipeline:
+        """Analysis stages: orbital data and launch window run concurrently, then the
+        pre-checks and NASA payload, which feed the AI stage"""
+        nasa = self.nasa_service
+        
+        def combine_nasa_data(results):
+            astronomical_data, field_sources = results['orbital_data']
+            planetary_data = nasa.build_planetary_data(
+                destination, astronomical_data, field_sources, results['launch_window']
+            )
+            return {**planetary_data, 'mission_window': results['launch_window']}
+        
+        return Pipeline([
+            Stage('orbital_data', lambda _: nasa._get_astronomical_data(destination, launch_date)),
+            Stage('launch_window', lambda _: nasa.get_mission_window(destination, launch_date)),
+            Stage('precheck', lambda results: self._run_prechecks(mission_data, results['launch_window']),
+                  ('launch_window',)),
+            Stage('nasa_data', combine_nasa_data, ('orbital_data', 'launch_window')),
+            Stage('ai_analysis', lambda results: self._assess_feasibility(
+                mission_data,
+                results['nasa_data'],
+                results['precheck'],
+                use_cache=not force_refresh
+            ), ('nasa_data', 'precheck'))
+        ])
+    
+    def _assess_feasibility(self, mission_data: Dict, nasa_data: Dict, precheck: Dict, use_cache: bool = True) -> Dict:
+        """AI feasibility analysis, skipped for missions the physics scorer rules out"""
+        skipped = self._physics_skip(mission_data, precheck)
+        if skipped is not None:
+            return skipped
+        
+        return self.ai_service.analyze_mission_feasibility(mission_data, nasa_data, use_cache=use_cache)
+    
+    def _physics_skip(self, mission_data: Dict, precheck: Dict) -> Optional[Dict]:
+        """The physics assessment to use instead of AI when the mission is infeasible, else None"""
+        physics = precheck['physics']
+        if physics['infeasible'] and current_app.config.get('PHYSICS_SKIP_INFEASIBLE', True):
+            self.logger.info(f"Skipping AI analysis for {mission_data.get('name')}: physically infeasible")
+            return {**physics, 'llm_skipped': True, 'analysis_timestamp': datetime.utcnow().isoformat()}
+        return None
+    
+    def _run_prechecks(self, mission_data: Dict, launch_window: Optional[Dict] = None) -> Dict:
+        """Deterministic checks that do not need AI: parameter validation and a physics score"""
+        checks = [
+            (MissionValidator.validate_destination, 'destination'),
+            (MissionValidator.validate_mission_duration, 'mission_duration'),
+            (MissionValidator.validate_crew_size, 'crew_size'),
+            (MissionValidator.validate_spacecraft_type, 'spacecraft_type'),
+            (MissionValidator.validate_payload_mass, 'payload_mass'),
+            (MissionValidator.validate_fuel_requirements, 'fuel_requirements')
+        ]
+        
+        issues = []
+        for validator, field in checks:
+            try:
+                validator(mission_data.get(field))
+            except (ValidationError, TypeError) as e:
+                issues.append(str(e))
+        
+        return {
+            'passed': not issues,
+            'issues': issues,
+            'physics': score_mission(mission_data, launch_window)
+        }
+    
     def get_mission_history(self, limit: int = 50) -> List[Mission]:
         """Get mission history"""
         try:
@@ -141,29 +387,8 @@ class MissionService:
     def get_mission_statistics(self) -> Dict:
         """Get mission statistics"""
         try:
-            total_missions = Mission.query.count()
-            completed_missions = Mission.query.filter_by(status=MissionStatus.COMPLETED).count()
-            failed_missions = Mission.query.filter_by(status=MissionStatus.FAILED).count()
-            
-            # Risk level distribution
-            risk_distribution = {}
-            for risk_level in RiskLevel:
-                count = Mission.query.filter_by(risk_level=risk_level).count()
-                risk_distribution[risk_level.value] = count
-            
-            # Average feasibility score
-            avg_feasibility = db.session.query(
-                db.func.avg(Mission.feasibility_score)
-            ).filter(Mission.feasibility_score.isnot(None)).scalar() or 0
-            
-            return {
-                'total_missions': total_missions,
-                'completed_missions': completed_missions,
-                'failed_missions': failed_missions,
-                'success_rate': (completed_missions / total_missions * 100) if total_missions > 0 else 0,
-                'risk_distribution': risk_distribution,
-                'average_feasibility': round(avg_feasibility, 2)
-            }
+            statistics_service = StatisticsService.from_config(current_app.config)
+            return statistics_service.get_statistics()
             
         except Exception as e:
             self.logger.error(f"Error calculating statistics: {e}")
@@ -219,24 +444,24 @@ class MissionService:
             return {'error': str(e)}
     
     def generate_mission_report(self, mission_id: int) -> Dict:
-        """Generate comprehensive mission report"""
+        """Generate comprehensive mission report, reusing a stored one when available"""
         try:
             mission = Mission.query.get_or_404(mission_id)
             
             if mission.status != MissionStatus.COMPLETED:
                 return {'error': 'Mission analysis not completed'}
             
-            mission_data = {
-                'name': mission.name,
-                'description': mission.description,
-                'destination': mission.destination,
-                'launch_date': mission.launch_date.isoformat(),
-                'mission_duration': mission.mission_duration,
-                'crew_size': mission.crew_size,
-                'spacecraft_type': mission.spacecraft_type,
-                'feasibility_score': mission.feasibility_score,
-                'risk_level': mission.risk_level.value if mission.risk_level else 'unknown'
-            }
+            mission_data = self._report_mission_data(mission)
+            inputs = self.report_store.inputs_for(mission, mission_data)
+            
+            stored = self.report_store.get_current(mission.id, inputs['input_hash'])
+            if stored is not None:
+                return {
+                    'mission': mission,
+                    'report': stored.content,
+                    'report_version': stored.version,
+                    'success': True
+                }
             
             # Generate comprehensive report using AI
             report = self.ai_service.generate_mission_report(
@@ -244,9 +469,12 @@ class MissionService:
                 mission.ai_analysis or {}
             )
             
+            saved = self._save_report(mission, report, inputs)
+            
             return {
                 'mission': mission,
                 'report': report,
+                'report_version': saved.version if saved else None,
                 'success': True
             }
             
@@ -257,6 +485,77 @@ class MissionService:
                 'success': False
             }
     
+    def stream_mission_report(self, mission_id: int) -> Iterator[Tuple[str, Dict]]:
+        """Yield (event, data) pairs for a report as its sections are generated.
+        
+        A stored report for the current inputs is replayed at once. Otherwise
+        sections are yielded as the model finishes them and the complete
+        report is saved as a new version at the end.
+        """
+        mission = db.session.get(Mission, mission_id)
+        if mission is None:
+            yield 'error', {'error': 'Mission not found'}
+            return
+        
+        if mission.status != MissionStatus.COMPLETED:
+            yield 'error', {'error': 'Mission analysis not completed'}
+            return
+        
+        mission_data = self._report_mission_data(mission)
+        inputs = self.report_store.inputs_for(mission, mission_data)
+        
+        stored = self.report_store.get_current(mission.id, inputs['input_hash'])
+        if stored is not None:
+            for name, content in stored.content.items():
+                yield 'section', {'name': name, 'content': content}
+            yield 'done', {'report_version': stored.version, 'stored': True}
+            return
+        
+        report = {}
+        for name, content in self.ai_service.stream_mission_report(mission_data, mission.ai_analysis or {}):
+            if name == 'error':
+                yield 'error', {'error': content}
+                return
+            report[name] = content
+            yield 'section', {'name': name, 'content': content}
+        
+        missing = [name for name in REPORT_SECTIONS if name not in report]
+        if missing:
+            self.logger.warning(f"Report for mission {mission.id} is missing sections: {', '.join(missing)}")
+            yield 'error', {'error': 'Report is incomplete', 'missing_sections': missing}
+            return
+        
+        saved = self._save_report(mission, report, inputs)
+        yield 'done', {'report_version': saved.version if saved else None, 'stored': False}
+    
+    def get_stored_report(self, mission: Mission) -> Optional[MissionReport]:
+        """Stored report for the mission's current inputs, or None if it is stale or missing"""
+        inputs = self.report_store.inputs_for(mission, self._report_mission_data(mission))
+        return self.report_store.get_current(mission.id, inputs['input_hash'])
+    
+    def _save_report(self, mission: Mission, report: Dict, inputs: Dict) -> Optional[MissionReport]:
+        """Persist a generated report as a new version; failed or incomplete generations are not kept"""
+        if not report or 'error' in report or any(name not in report for name in REPORT_SECTIONS):
+            return None
+        
+        ordered = {name: report[name] for name in REPORT_SECTIONS if name in report}
+        ordered.update((name, value) for name, value in report.items() if name not in ordered)
+        return self.report_store.save(mission.id, ordered, REPORT_MODEL, inputs)
+    
+    def _report_mission_data(self, mission: Mission) -> Dict:
+        """Mission fields given to the report prompt"""
+        return {
+            'name': mission.name,
+            'description': mission.description,
+            'destination': mission.destination,
+            'launch_date': mission.launch_date.isoformat(),
+            'mission_duration': mission.mission_duration,
+            'crew_size': mission.crew_size,
+            'spacecraft_type': mission.spacecraft_type,
+            'feasibility_score': mission.feasibility_score,
+            'risk_level': mission.risk_level.value if mission.risk_level else 'unknown'
+        }
+    
     def _generate_optimization_suggestions(self, ai_analysis: Dict) -> List[str]:
         """Generate optimization suggestions based on AI analysis"""
         suggestions = []
@@ -0,0 +1,216 @@
+import os
+import time
+from typing import Dict, NamedTuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from services.feasibility_scorer import (
+    CAREER_DOSE_LIMIT, CONSUMABLES_PER_CREW_DAY, DEEP_SPACE_DOSE_RATE, MIN_STAY_DAYS, MissionPhysics
+)
+
+CHUNK_SIZE = 50000  # trials per array batch; bounds peak memory to a few MB per array
+
+# Uncertainty model (1σ unless noted)
+DELTA_V_SIGMA = 0.05              # fraction of the nominal Δv requirement
+TCM_MEAN = 0.05                   # km/s of trajectory correction per leg (gamma distributed)
+ISP_SIGMA = 0.015                 # fraction of nominal Isp
+BOIL_OFF_MAX = 0.02               # fraction of propellant lost, uniform
+TRANSIT_SIGMA = 0.05              # fraction of nominal transit time
+CONSUMPTION_SIGMA = 0.1           # fraction of the nominal kg per crew-day
+GCR_SIGMA = 0.15                  # fraction of the deep-space dose rate
+SPE_RATE = 1.0                    # significant solar particle events per year in deep space
+SPE_DOSE_MEDIAN = 30.0            # mSv per event behind storm shelter, lognormal
+SPE_DOSE_LOG_SIGMA = 1.0
+MICROMETEOROID_RATE = 2e-6        # mission-ending impacts per day
+BELT_MICROMETEOROID_FACTOR = 20.0
+ENGINE_FAILURE_PER_BURN = 0.002
+
+class TrialInputs(NamedTuple):
+    """Plain-number inputs for a trial batch; picklable for process pools"""
+    required_dv: float
+    legs: int
+    exhaust_velocity: float
+    burnout_mass: float
+    propellant: float
+    transit_days: float
+    duration: float
+    crew: int
+    consumables_capacity: float
+    surface_dose_rate: float
+    micrometeoroid_rate: float
+
+    @classmethod
+    def from_physics(cls, physics: MissionPhysics) -> 'TrialInputs':
+        """Nominal inputs; an unspecified propellant load is sized with a 10% reserve"""
+        crew_capacity = physics.payload if physics.payload is not None else physics.consumables
+        rate = MICROMETEOROID_RATE * (BELT_MICROMETEOROID_FACTOR if physics.body.key == 'asteroid_belt' else 1)
+        return cls(
+            required_dv=physics.required_dv,
+            legs=physics.legs,
+            exhaust_velocity=physics.exhaust_velocity,
+            burnout_mass=physics.burnout_mass,
+            propellant=physics.fuel if physics.fuel else physics.fuel_needed * 1.1,
+            transit_days=physics.transit_days,
+            duration=physics.duration,
+            crew=physics.crew,
+            consumables_capacity=crew_capacity,
+            surface_dose_rate=physics.surface_dose_rate,
+            micrometeoroid_rate=rate
+        )
+
+def run_trials(inputs: TrialInputs, trials: int, rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """Sample one batch of trials. Every quantity is a (trials,) array."""
+    n = trials
+
+    # Propulsion: Δv needed vs Δv the loaded propellant can deliver
+    dv_needed = (inputs.required_dv * rng.normal(1, DELTA_V_SIGMA, n)
+                 + rng.gamma(2.0, TCM_MEAN / 2, (inputs.legs, n)).sum(axis=0))
+    exhaust_velocity = inputs.exhaust_velocity * rng.normal(1, ISP_SIGMA, n)
+    propellant = inputs.propellant * (1 - rng.uniform(0, BOIL_OFF_MAX, n))
+    dv_available = exhaust_velocity * np.log1p(propellant / inputs.burnout_mass)
+    propellant_used = np.minimum(inputs.burnout_mass * np.expm1(dv_needed / exhaust_velocity), propellant)
+    propellant_remaining = propellant - propellant_used
+
+    # Timeline
+    transit = np.maximum(inputs.transit_days * rng.normal(1, TRANSIT_SIGMA, n), 1.0)
+    space_days = np.minimum(inputs.duration, transit * inputs.legs)
+    surface_days = np.maximum(inputs.duration - transit * inputs.legs, 0)
+
+    # Crew: consumables and radiation
+    if inputs.crew:
+        consumption = CONSUMABLES_PER_CREW_DAY * np.maximum(rng.normal(1, CONSUMPTION_SIGMA, n), 0.5)
+        consumables_margin = inputs.consumables_capacity - inputs.crew * inputs.duration * consumption
+
+        events = rng.poisson(SPE_RATE * space_days / 365.25)
+        most = int(events.max()) if n else 0
+        event_doses = rng.lognormal(np.log(SPE_DOSE_MEDIAN), SPE_DOSE_LOG_SIGMA, (most, n))
+        spe_dose = (event_doses * (np.arange(most)[:, None] < events)).sum(axis=0)
+        dose = (space_days * DEEP_SPACE_DOSE_RATE * rng.normal(1, GCR_SIGMA, n)
+                + surface_days * inputs.surface_dose_rate + spe_dose)
+    else:
+        consumables_margin = np.zeros(n)
+        dose = np.zeros(n)
+
+    # Hazards
+    impacts = rng.poisson(inputs.micrometeoroid_rate * inputs.duration, n) > 0
+    burns = inputs.legs + 1
+    engine_failure = rng.random(n) < 1 - (1 - ENGINE_FAILURE_PER_BURN) ** burns
+
+    return {
+        'dv_needed': dv_needed,
+        'dv_available': dv_available,
+        'propellant': propellant,
+        'propellant_used': propellant_used,
+        'propellant_remaining': propellant_remaining,
+        'transit_days': transit,
+        'consumables_margin': consumables_margin,
+        'dose': dose,
+        'micrometeoroid_impact': impacts,
+        'engine_failure': engine_failure
+    }
+
+def _run_chunk(inputs: TrialInputs, trials: int, seed: np.random.SeedSequence) -> Dict[str, np.ndarray]:
+    return run_trials(inputs, trials, np.random.default_rng(seed))
+
+def simulate(inputs: TrialInputs, trials: int, seed: Optional[int] = None, processes: int = 1) -> Dict[str, np.ndarray]:
+    """Run trials in CHUNK_SIZE batches, optionally spread over a process pool.
+
+    Each chunk gets an independent stream spawned from one SeedSequence, so
+    a seed reproduces the same results for any number of processes.
+    """
+    sizes = [CHUNK_SIZE] * (trials // CHUNK_SIZE)
+    if trials % CHUNK_SIZE:
+        sizes.append(trials % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if processes > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(max_workers=min(processes, len(sizes))) as pool:
+            chunks = list(pool.map(_run_chunk, [inputs] * len(sizes), sizes, seeds))
+    else:
+        chunks = [_run_chunk(inputs, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)]
+
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+
+def _distribution(values: np.ndarray, bins: int = 20) -> Dict:
+    counts, edges = np.histogram(values, bins=bins)
+    p5, p50, p95 = np.percentile(values, [5, 50, 95])
+    return {
+        'mean': round(float(values.mean()), 4),
+        'std': round(float(values.std()), 4),
+        'p5': round(float(p5), 4),
+        'p50': round(float(p50), 4),
+        'p95': round(float(p95), 4),
+        'histogram': {'counts': counts.tolist(), 'edges': np.round(edges, 4).tolist()}
+    }
+
+def summarize(results: Dict[str, np.ndarray], inputs: TrialInputs) -> Dict:
+    """Success probability, failure-mode rates and summary distributions"""
+    # Uncrewed missions only have to arrive; crewed ones fly out, stay and fly home
+    days_needed = results['transit_days'] * inputs.legs + (MIN_STAY_DAYS if inputs.legs == 2 else 0.0)
+    failures = {
+        'insufficient_delta_v': results['dv_available'] < results['dv_needed'],
+        'consumables_exhausted': results['consumables_margin'] < 0,
+        'radiation_limit': results['dose'] > CAREER_DOSE_LIMIT,
+        'micrometeoroid_impact': results['micrometeoroid_impact'],
+        'engine_failure': results['engine_failure'],
+        'mission_too_short': days_needed > inputs.duration
+    }
+    failed = np.zeros(len(results['dose']), dtype=bool)
+    for mask in failures.values():
+        failed |= mask
+
+    return {
+        'trials': int(failed.size),
+        'success_probability': round(float(1 - failed.mean()), 4),
+        'failure_modes': {name: round(float(mask.mean()), 4) for name, mask in failures.items()},
+        'delta_v_margin': _distribution(results['dv_available'] - results['dv_needed']),
+        'propellant_remaining': _distribution(results['propellant_remaining']),
+        'transit_days': _distribution(results['transit_days']),
+        'consumables_margin': _distribution(results['consumables_margin']) if inputs.crew else None,
+        'radiation_dose': _distribution(results['dose']) if inputs.crew else None
+    }
+
+def propellant_timeline(inputs: TrialInputs, results: Dict[str, np.ndarray], points: int = 500,
+                        sample: int = 2000) -> Dict[str, np.ndarray]:
+    """Percentiles of propellant on board over the mission, kg.
+
+    Boil-off is spread evenly over the mission and the Δv is split equally
+    between the capture burn (end of the outbound leg) and, for two-leg
+    missions, the departure burn of the return leg. Trials are already in
+    random order, so the first `sample` of them stand in for the rest.
+    """
+    propellant = results['propellant'][:sample]
+    used = results['propellant_used'][:sample]
+    transit = results['transit_days'][:sample]
+
+    days = np.linspace(0.0, max(inputs.duration, float(transit.max()) if transit.size else 0.0), points)
+    boil_off = (inputs.propellant - propellant)[:, None] * np.minimum(days / max(inputs.duration, 1.0), 1.0)
+    on_board = inputs.propellant - boil_off
+
+    if inputs.legs == 2:
+        # Equal Δv halves: the later burn pushes only the burnout mass
+        second = np.minimum(inputs.burnout_mass * (np.sqrt(1 + used / inputs.burnout_mass) - 1), used)
+        first = used - second
+        return_burn = np.maximum(inputs.duration - transit, transit)
+        on_board = on_board - second[:, None] * (days >= return_burn[:, None])
+    else:
+        first = used
+    on_board = on_board - first[:, None] * (days >= transit[:, None])
+
+    p5, p50, p95 = np.percentile(np.maximum(on_board, 0.0), [5, 50, 95], axis=0)
+    return {'day': days, 'p5': p5, 'p50': p50, 'p95': p95}
+
+def benchmark(inputs: TrialInputs, trials: int = 200000, processes: int = 1, seed: int = 0) -> Dict:
+    """Throughput of simulate() in trials per second, overall and per process"""
+    simulate(inputs, min(trials, CHUNK_SIZE), seed=seed)  # warm up
+    started = time.perf_counter()
+    simulate(inputs, trials, seed=seed, processes=processes)
+    elapsed = time.perf_counter() - started
+    workers = max(processes, 1)
+    return {
+        'trials': trials,
+        'processes': workers,
+        'cpu_count': os.cpu_count(),
+        'seconds': round(elapsed, 4),
+        'trials_per_second': round(trials / elapsed),
+        'trials_per_second_per_core': round(trials / elapsed / min(workers, os.cpu_count() or 1))
+    }
@@ -1,224 +1,145 @@
 import os
-import requests
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List
+import threading
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, List, Tuple
+from services.body_catalog import get_body
+from services.data_providers import HorizonsDataProvider, create_provider, create_providers
+from services.ephemeris import EphemerisSeries, EphemerisStore, parse_horizons_vectors
+from services.launch_windows import porkchop_for_launch
 
 class NASAService:
-    def __init__(self):
+    def __init__(self, session=None):
         self.horizons_base_url = "https://ssd-api.jpl.nasa.gov/api/horizons.api"
         self.nasa_api_key = os.environ.get("NASA_API_KEY", "DEMO_KEY")  # For basic usage
+        self.session = session  # shared requests.Session for remote providers
+        self.providers = create_providers(os.environ.get("PLANETARY_DATA_PROVIDERS", "computed"), session=session)
+        self._horizons = None  # created on first ephemeris ingest when not a configured provider
+        self._horizons_lock = threading.Lock()
+        self.ephemeris_store = EphemerisStore(os.environ.get("EPHEMERIS_DIR", os.path.join("data", "ephemeris")))
         self.logger = logging.getLogger(__name__)
     
     def get_planetary_data(self, destination: str, launch_date: datetime) -> Dict:
         """Get planetary data from NASA API services"""
         try:
-            # Try to get real-time data from NASA APIs
-            astronomical_data = self._get_astronomical_data(destination)
+            astronomical_data, field_sources = self._get_astronomical_data(destination, launch_date)
             
             # Add launch window calculations
             launch_window = self.get_mission_window(destination, launch_date)
             
-            # Combine the data
-            result = {
-                'destination': destination,
-                'orbital_parameters': astronomical_data,
-                'launch_window': launch_window,
-                'data_source': 'NASA APIs + Calculations',
-                'retrieved_at': datetime.now().isoformat(),
-                'api_key_used': self.nasa_api_key != "DEMO_KEY"
-            }
-            
-            return result
+            return self.build_planetary_data(destination, astronomical_data, field_sources, launch_window)
                 
         except Exception as e:
             self.logger.error(f"Error processing NASA data: {e}")
             return self._get_fallback_data(destination)
     
-    def _get_astronomical_data(self, destination: str) -> Dict:
-        """Get astronomical data from NASA APIs"""
+    def build_planetary_data(self, destination: str, astronomical_data: Dict, field_sources: Dict,
+                             launch_window: Dict) -> Dict:
+        """Combine separately computed orbital and launch window data"""
+        return {
+            'destination': destination,
+            'orbital_parameters': astronomical_data,
+            'launch_window': launch_window,
+            'data_source': ' + '.join(dict.fromkeys(field_sources.values())),
+            'field_sources': field_sources,
+            'retrieved_at': datetime.now().isoformat(),
+            'api_key_used': self.nasa_api_key != "DEMO_KEY"
+        }
+    
+    def _get_astronomical_data(self, destination: str, launch_date: Optional[datetime] = None) -> Tuple[Dict, Dict]:
+        """Merge orbital data from the configured providers
+        
+        Later providers override earlier ones, but only for the fields they
+        declare in supplied_fields. Returns the data and the provider label
+        each field came from.
+        """
+        orbital_data = {}
+        field_sources = {}
+        
+        for provider in self.providers:
+            try:
+                provider_data = provider.get_orbital_data(destination, launch_date)
+            except Exception as e:
+                self.logger.error(f"Planetary data provider '{provider.name}' failed: {e}")
+                continue
+            
+            for field, value in provider_data.items():
+                if field in provider.supplied_fields and value is not None:
+                    orbital_data[field] = value
+                    field_sources[field] = provider.label
+        
+        return orbital_data, field_sources
+    
+    def _calculate_orbital_data(self, destination: str) -> Dict:
+        """Calculate orbital parameters for destinations"""
+        return get_body(destination).orbital_parameters()
+    
+    def get_ephemeris(self, destination: str, start_date: date, stop_date: date, step: str = '1 d') -> Dict:
+        """Ingest Horizons state vectors for a date range, reusing stored series"""
+        body = get_body(destination)
+        key = (body.key, start_date.isoformat(), stop_date.isoformat(), step)
+        
         try:
-            # Use NASA's general planetary API
-            nasa_url = "https://api.nasa.gov/planetary/apod"
-            params = {
-                'api_key': self.nasa_api_key,
-                'count': 1
-            }
+            series = self.ephemeris_store.get(*key)
+            if series is None:
+                horizons = self._horizons_provider()
+                series = horizons.breaker.call(
+                    horizons.fetch_ephemeris, body.horizons_id, start_date, stop_date, step
+                )
+                self.ephemeris_store.put(*key, series)
             
-            response = requests.get(nasa_url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            # Return calculated orbital parameters based on destination
-            return self._calculate_orbital_data(destination)
+            return self._build_ephemeris_result(series, destination)
             
         except Exception as e:
-            self.logger.error(f"NASA API error: {e}")
-            return self._calculate_orbital_data(destination)
+            self.logger.error(f"Error ingesting ephemeris for {destination}: {e}")
+            return self._get_fallback_data(destination)
     
-    def _calculate_orbital_data(self, destination: str) -> Dict:
-        """Calculate orbital parameters for destinations"""
-        # Scientific data for celestial bodies
-        orbital_data = {
-            'mars': {
-                'distance_from_earth': 225000000,  # km (average)
-                'velocity_magnitude': 24.077,      # km/s
-                'orbital_period': 687,             # days
-                'mass': 6.42e23,                  # kg
-                'gravity': 3.71,                  # m/s²
-                'radius': 3389.5,                 # km
-                'escape_velocity': 5.03           # km/s
-            },
-            'moon': {
-                'distance_from_earth': 384400,    # km
-                'velocity_magnitude': 1.022,      # km/s
-                'orbital_period': 27.3,           # days
-                'mass': 7.35e22,                  # kg
-                'gravity': 1.62,                  # m/s²
-                'radius': 1737.4,                 # km
-                'escape_velocity': 2.38           # km/s
-            },
-            'venus': {
-                'distance_from_earth': 41400000,  # km (closest approach)
-                'velocity_magnitude': 35.02,      # km/s
-                'orbital_period': 225,            # days
-                'mass': 4.87e24,                  # kg
-                'gravity': 8.87,                  # m/s²
-                'radius': 6051.8,                 # km
-                'escape_velocity': 10.36          # km/s
-            },
-            'jupiter': {
-                'distance_from_earth': 628300000, # km (average)
-                'velocity_magnitude': 13.07,      # km/s
-                'orbital_period': 4333,           # days
-                'mass': 1.898e27,                 # kg
-                'gravity': 24.79,                 # m/s²
-                'radius': 69911,                  # km
-                'escape_velocity': 59.5           # km/s
-            },
-            'saturn': {
-                'distance_from_earth': 1275000000, # km (average)
-                'velocity_magnitude': 9.68,       # km/s
-                'orbital_period': 10759,          # days
-                'mass': 5.68e26,                  # kg
-                'gravity': 10.44,                 # m/s²
-                'radius': 58232,                  # km
-                'escape_velocity': 35.5           # km/s
-            },
-            'europa': {
-                'distance_from_earth': 628300000, # km (Jupiter distance)
-                'velocity_magnitude': 13.74,      # km/s
-                'orbital_period': 3.55,           # days
-                'mass': 4.8e22,                   # kg
-                'gravity': 1.314,                 # m/s²
-                'radius': 1560.8,                 # km
-                'escape_velocity': 2.025          # km/s
-            },
-            'titan': {
-                'distance_from_earth': 1275000000, # km (Saturn distance)
-                'velocity_magnitude': 5.57,       # km/s
-                'orbital_period': 15.95,          # days
-                'mass': 1.35e23,                  # kg
-                'gravity': 1.352,                 # m/s²
-                'radius': 2574,                   # km
-                'escape_velocity': 2.64           # km/s
-            },
-            'enceladus': {
-                'distance_from_earth': 1275000000, # km (Saturn distance)
-                'velocity_magnitude': 12.64,      # km/s
-                'orbital_period': 1.37,           # days
-                'mass': 1.08e20,                  # kg
-                'gravity': 0.0113,                # m/s²
-                'radius': 252.1,                  # km
-                'escape_velocity': 0.239          # km/s
-            },
-            'io': {
-                'distance_from_earth': 628300000, # km (Jupiter distance)
-                'velocity_magnitude': 17.33,      # km/s
-                'orbital_period': 1.77,           # days
-                'mass': 8.93e22,                  # kg
-                'gravity': 1.796,                 # m/s²
-                'radius': 1821.6,                 # km
-                'escape_velocity': 2.558          # km/s
-            },
-            'asteroid_belt': {
-                'distance_from_earth': 329000000, # km (average)
-                'velocity_magnitude': 20.0,       # km/s
-                'orbital_period': 1460,           # days (average)
-                'mass': 3.0e21,                   # kg (estimated total)
-                'gravity': 0.0003,                # m/s² (Ceres)
-                'radius': 473,                    # km (Ceres)
-                'escape_velocity': 0.51           # km/s (Ceres)
-            }
-        }
-        
-        return orbital_data.get(destination, orbital_data['mars'])
+    def _horizons_provider(self) -> HorizonsDataProvider:
+        """The configured Horizons provider, or one owned by this service"""
+        for provider in self.providers:
+            if provider.name == HorizonsDataProvider.name:
+                return provider
+        with self._horizons_lock:
+            if self._horizons is None:
+                self._horizons = create_provider(HorizonsDataProvider.name, session=self.session)
+            return self._horizons
     
     def _parse_horizons_response(self, result: str, destination: str) -> Dict:
         """Parse Horizons API response"""
         try:
-            # Extract position and velocity vectors
-            lines = result.split('\n')
-            ephemeris_data = []
-            
-            # Look for ephemeris data section
-            in_data_section = False
-            for line in lines:
-                if '$$SOE' in line:
-                    in_data_section = True
-                    continue
-                elif '$$EOE' in line:
-                    break
-                elif in_data_section and line.strip():
-                    # Parse ephemeris line
-                    parts = line.split()
-                    if len(parts) >= 7:
-                        ephemeris_data.append({
-                            'date': parts[0],
-                            'x': float(parts[2]),
-                            'y': float(parts[3]),
-                            'z': float(parts[4]),
-                            'vx': float(parts[5]),
-                            'vy': float(parts[6]),
-                            'vz': float(parts[7])
-                        })
-            
-            # Calculate orbital parameters
-            orbital_data = self._calculate_orbital_parameters(ephemeris_data)
-            
-            return {
-                'destination': destination,
-                'ephemeris': ephemeris_data[:10],  # First 10 days
-                'orbital_parameters': orbital_data,
-                'data_source': 'NASA JPL Horizons',
-                'retrieved_at': datetime.utcnow().isoformat()
-            }
+            series = parse_horizons_vectors(result)
+            return self._build_ephemeris_result(series, destination)
             
         except Exception as e:
             self.logger.error(f"Error parsing Horizons response: {e}")
             return self._get_fallback_data(destination)
     
-    def _calculate_orbital_parameters(self, ephemeris_data: List[Dict]) -> Dict:
-        """Calculate basic orbital parameters from ephemeris data"""
-        if not ephemeris_data:
+    def _build_ephemeris_result(self, series: EphemerisSeries, destination: str) -> Dict:
+        return {
+            'destination': destination,
+            'ephemeris': series.to_records(limit=10),  # First 10 samples
+            'orbital_parameters': self._calculate_orbital_parameters(series),
+            'data_source': 'NASA JPL Horizons',
+            'retrieved_at': datetime.utcnow().isoformat()
+        }
+    
+    def _calculate_orbital_parameters(self, series: EphemerisSeries) -> Dict:
+        """Calculate orbital parameters over every ephemeris sample"""
+        if not len(series):
             return {}
         
         try:
-            # Use first data point for calculations
-            first_point = ephemeris_data[0]
-            
-            # Calculate distance from Earth center
-            distance = (first_point['x']**2 + first_point['y']**2 + first_point['z']**2)**0.5
-            
-            # Calculate velocity magnitude
-            velocity = (first_point['vx']**2 + first_point['vy']**2 + first_point['vz']**2)**0.5
+            distance = series.distance
+            speed = series.speed
             
             return {
-                'distance_from_earth': distance,  # km
-                'velocity_magnitude': velocity,   # km/s
-                'position_vector': [first_point['x'], first_point['y'], first_point['z']],
-                'velocity_vector': [first_point['vx'], first_point['vy'], first_point['vz']],
-                'calculation_date': first_point['date']
+                'distance_from_earth': float(distance[0]),  # km
+                'velocity_magnitude': float(speed[0]),      # km/s
+                'position_vector': series.position[0].tolist(),
+                'velocity_vector': series.velocity[0].tolist(),
+                'calculation_date': float(series.epoch[0]),  # Julian date (TDB)
+                'series': series.summary()
             }
             
         except Exception as e:
@@ -227,31 +148,7 @@ class NASAService:
     
     def _get_fallback_data(self, destination: str) -> Dict:
         """Provide fallback data when NASA API is unavailable"""
-        fallback_data = {
-            'mars': {
-                'distance_from_earth': 225000000,  # km (average)
-                'velocity_magnitude': 24.0,        # km/s
-                'orbital_period': 687,             # days
-                'mass': 6.42e23,                  # kg
-                'gravity': 3.71                    # m/s²
-            },
-            'moon': {
-                'distance_from_earth': 384400,    # km
-                'velocity_magnitude': 1.0,        # km/s
-                'orbital_period': 27.3,           # days
-                'mass': 7.35e22,                  # kg
-                'gravity': 1.62                   # m/s²
-            },
-            'venus': {
-                'distance_from_earth': 41000000,  # km (closest approach)
-                'velocity_magnitude': 35.0,       # km/s
-                'orbital_period': 225,            # days
-                'mass': 4.87e24,                  # kg
-                'gravity': 8.87                   # m/s²
-            }
-        }
-        
-        base_data = fallback_data.get(destination, fallback_data['mars'])
+        base_data = get_body(destination).orbital_parameters()
         
         return {
             'destination': destination,
@@ -262,26 +159,57 @@ class NASAService:
         }
     
     def get_mission_window(self, destination: str, launch_date: datetime) -> Dict:
-        """Calculate optimal launch window"""
+        """Calculate optimal launch window from a Lambert porkchop grid"""
         try:
-            # This is a simplified calculation - in reality, this would use
-            # complex orbital mechanics calculations
-            
-            window_data = {
-                'mars': {'duration': 26, 'frequency': 780},  # 26 months apart every 2.1 years
-                'moon': {'duration': 28, 'frequency': 28},    # Every month
-                'venus': {'duration': 19, 'frequency': 584}   # 19 months apart every 1.6 years
-            }
-            
-            dest_data = window_data.get(destination, window_data['mars'])
+            body = get_body(destination)
+            if isinstance(launch_date, datetime):
+                launch_date = launch_date.date()
+            
+            if body.elements is None:
+                # No heliocentric transfer to solve (e.g. the Moon); windows recur every synodic period
+                return {
+                    'destination': destination,
+                    'launch_date': launch_date.isoformat(),
+                    'window_duration': body.window_duration,
+                    'next_window_in_days': 0,
+                    'optimal_window': True,
+                    'recommendation': f'Transfer opportunities recur every {round(body.synodic_period)} days',
+                    'method': 'synodic_period'
+                }
+            
+            porkchop = porkchop_for_launch(body.key, launch_date)
+            best = porkchop.best()
+            on_launch_date = porkchop.best_on(launch_date)
+            launch_delta_v = on_launch_date['delta_v']
+            
+            # Within 5% of the cheapest transfer in the search range counts as optimal
+            optimal = launch_delta_v <= best['delta_v'] * 1.05
+            days_to_best = (date.fromisoformat(best['departure_date']) - launch_date).days
+            if optimal:
+                next_window = 0
+            elif days_to_best < 0:
+                next_window = days_to_best + round(body.synodic_period)
+            else:
+                next_window = days_to_best
             
             return {
                 'destination': destination,
                 'launch_date': launch_date.isoformat(),
-                'window_duration': dest_data['duration'],
-                'next_window_in_days': dest_data['frequency'],
-                'optimal_window': True if launch_date.day <= 15 else False,
-                'recommendation': 'Optimal launch window' if launch_date.day <= 15 else 'Consider adjusting launch date'
+                'window_duration': body.window_duration,
+                'next_window_in_days': next_window,
+                'optimal_window': optimal,
+                'recommendation': 'Optimal launch window' if optimal else
+                    f"Consider launching on {best['departure_date']} (Δv {best['delta_v']:.2f} km/s vs {launch_delta_v:.2f} km/s)",
+                'optimal_departure_date': best['departure_date'],
+                'optimal_arrival_date': best['arrival_date'],
+                'time_of_flight_days': best['time_of_flight_days'],
+                'min_delta_v': best['delta_v'],
+                'min_c3': best['min_c3'],
+                'launch_date_delta_v': round(launch_delta_v, 3),
+                'launch_date_c3': round(on_launch_date['c3'], 3),
+                'launch_date_arrival_vinf': round(on_launch_date['arrival_vinf'], 3),
+                'launch_date_time_of_flight_days': round(on_launch_date['time_of_flight_days'], 1),
+                'method': 'lambert_porkchop'
             }
             
         except Exception as e:
@@ -291,3 +219,7 @@ class NASAService:
                 'launch_date': launch_date.isoformat(),
                 'error': 'Unable to calculate mission window'
             }
+    
+    def get_porkchop(self, destination: str, launch_date: date) -> Dict:
+        """Full porkchop grid around a launch date for charting"""
+        return porkchop_for_launch(get_body(destination).key, launch_date).to_dict()
@@ -0,0 +1,336 @@
+import os
+import time
+import random
+import logging
+import threading
+from typing import Dict, Optional
+import openai
+from openai import OpenAI
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a call cannot finish before its deadline"""
+    pass
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at per_minute / 60 per second.
+
+    A per_minute of 0 disables the limit. The bucket may be driven below
+    zero by reconciling an estimate with actual usage; later callers then
+    wait for the debt to refill.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float, deadline: float) -> bool:
+        """Take amount, waiting up to the monotonic deadline; False if it would not fit in time"""
+        if not self.per_minute:
+            return True
+        amount = min(amount, self.capacity)
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return True
+                wait = (amount - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(min(wait, 1.0))
+
+    def adjust(self, amount: float):
+        """Return (positive) or charge (negative) tokens after the fact"""
+        if not self.per_minute:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+def _is_upstream_failure(error: Exception) -> bool:
+    """Errors that say the upstream is unhealthy (these trip the breaker)"""
+    if isinstance(error, (openai.APITimeoutError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+def _is_retryable(error: Exception) -> bool:
+    return isinstance(error, openai.RateLimitError) or _is_upstream_failure(error)
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header, if the server sent one"""
+    response = getattr(error, 'response', None)
+    value = response.headers.get('retry-after') if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+class _SlotStream:
+    """A streamed response that gives back its pool's concurrency slot exactly once.
+
+    The slot is released when the stream is exhausted, fails, is closed
+    (also via ``with``) or is garbage-collected without ever being
+    iterated, so an abandoned stream cannot shrink the pool for good.
+    """
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._iterator = None
+        self._release = release
+        self._released = False
+        self._lock = threading.Lock()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._released:
+            raise StopIteration
+        if self._iterator is None:
+            self._iterator = iter(self._stream)
+        try:
+            return next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        try:
+            close = getattr(self._stream, 'close', None)
+            if close is not None:
+                close()
+        finally:
+            self._release()
+
+    def __del__(self):
+        self.close()
+
+class OpenAIClientPool:
+    """One OpenAI client per process, shared by every AIService.
+
+    Each call waits for a concurrency slot and for request and token
+    budgets, then makes up to max_retries + 1 attempts. 429s, 5xx,
+    timeouts and connection errors are retried with full-jitter
+    exponential backoff, honouring Retry-After. Upstream failures feed a
+    circuit breaker. While it is open, calls fail at once with
+    CircuitOpenError so callers reach their fallback quickly. No step may
+    run past the call's deadline.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                 max_concurrency: int = 8, requests_per_minute: float = 500,
+                 tokens_per_minute: float = 150000, timeout: float = 60.0, deadline: float = 120.0,
+                 max_retries: int = 4, backoff_base: float = 0.5, backoff_max: float = 20.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        # Retries are done here, not by the SDK, so they share the deadline and the breaker
+        self.client = OpenAI(api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0)
+        self.timeout = timeout          # seconds per attempt
+        self.deadline = deadline        # seconds per call, including waits and retries
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker or CircuitBreaker('openai', failure_threshold=5, reset_timeout=30)
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_concurrency = max_concurrency
+        self.logger = logging.getLogger(__name__)
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'calls': 0, 'attempts': 0, 'successes': 0, 'failures': 0, 'retries': 0,
+            'rate_limited': 0, 'upstream_errors': 0, 'circuit_rejections': 0, 'deadline_exceeded': 0,
+            'in_flight': 0, 'limiter_wait_seconds': 0.0, 'latency_seconds_total': 0.0,
+            'latency_seconds_max': 0.0, 'prompt_tokens': 0, 'completion_tokens': 0
+        }
+
+    @classmethod
+    def from_config(cls, config) -> 'OpenAIClientPool':
+        """Build the pool from the Flask app config"""
+        return cls(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+            max_concurrency=config.get('OPENAI_MAX_CONCURRENCY', 8),
+            requests_per_minute=config.get('OPENAI_REQUESTS_PER_MINUTE', 500),
+            tokens_per_minute=config.get('OPENAI_TOKENS_PER_MINUTE', 150000),
+            timeout=config.get('OPENAI_TIMEOUT', 60.0),
+            deadline=config.get('OPENAI_DEADLINE', 120.0),
+            max_retries=config.get('OPENAI_MAX_RETRIES', 4),
+            backoff_base=config.get('OPENAI_BACKOFF_BASE', 0.5),
+            backoff_max=config.get('OPENAI_BACKOFF_MAX', 20.0),
+            breaker=CircuitBreaker(
+                'openai',
+                failure_threshold=config.get('OPENAI_BREAKER_THRESHOLD', 5),
+                reset_timeout=config.get('OPENAI_BREAKER_RESET', 30.0)
+            )
+        )
+
+    def _count(self, name: str, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    @staticmethod
+    def estimate_tokens(kwargs: Dict) -> int:
+        """Rough token cost of a chat request: about 4 characters per prompt token plus max_tokens"""
+        prompt_chars = sum(len(str(message.get('content', ''))) for message in kwargs.get('messages', []))
+        return prompt_chars // 4 + kwargs.get('max_tokens', 1000)
+
+    def create_chat_completion(self, deadline: Optional[float] = None, **kwargs):
+        """chat.completions.create through the limiter, retries and breaker.
+
+        deadline is in seconds from now (default: the pool's deadline). With
+        stream=True the concurrency slot is held until the returned stream
+        is exhausted, closed or garbage-collected.
+        """
+        self._count('calls')
+        if self.breaker.state == CircuitBreaker.OPEN:
+            self._count('circuit_rejections')
+            raise CircuitOpenError("Circuit 'openai' is open")
+
+        expires = time.monotonic() + (deadline or self.deadline)
+        estimate = self.estimate_tokens(kwargs)
+
+        waited = time.monotonic()
+        if not self._slots.acquire(timeout=max(expires - time.monotonic(), 0)):
+            self._count('deadline_exceeded')
+            raise DeadlineExceededError('No OpenAI concurrency slot before the deadline')
+        self._count('in_flight')
+
+        streaming = False
+        try:
+            if not self.request_bucket.acquire(1, expires):
+                raise DeadlineExceededError('Request rate limit would be exceeded past the deadline')
+            if not self.token_bucket.acquire(estimate, expires):
+                self.request_bucket.adjust(1)
+                raise DeadlineExceededError('Token rate limit would be exceeded past the deadline')
+            self._count('limiter_wait_seconds', time.monotonic() - waited)
+
+            response = self._call_with_retries(expires, kwargs)
+
+            usage = getattr(response, 'usage', None)
+            if usage is not None:
+                self._count('prompt_tokens', usage.prompt_tokens)
+                self._count('completion_tokens', usage.completion_tokens)
+                self.token_bucket.adjust(estimate - usage.total_tokens)
+
+            if kwargs.get('stream'):
+                streaming = True
+                return self._hold_slot(response)
+            return response
+
+        except DeadlineExceededError:
+            self._count('deadline_exceeded')
+            raise
+        finally:
+            if not streaming:
+                self._release()
+
+    def _call_with_retries(self, expires: float, kwargs: Dict):
+        attempt = 0
+        while True:
+            remaining = expires - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceededError('OpenAI call deadline exceeded')
+            if not self.breaker.allow_request():
+                self._count('circuit_rejections')
+                raise CircuitOpenError("Circuit 'openai' is open")
+
+            self._count('attempts')
+            started = time.monotonic()
+            try:
+                response = self.client.chat.completions.create(timeout=min(self.timeout, remaining), **kwargs)
+            except Exception as e:
+                if _is_upstream_failure(e):
+                    self._count('upstream_errors')
+                    self.breaker.record_failure()
+                else:
+                    # The upstream answered (a 429 or a client error), so it is healthy
+                    self.breaker.record_success()
+                if isinstance(e, openai.RateLimitError):
+                    self._count('rate_limited')
+
+                if not _is_retryable(e) or attempt >= self.max_retries:
+                    self._count('failures')
+                    raise
+
+                delay = _retry_after(e) or random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                if time.monotonic() + delay >= expires:
+                    self._count('failures')
+                    raise
+                self.logger.warning(f"OpenAI attempt {attempt + 1} failed ({e.__class__.__name__}); retrying in {delay:.2f}s")
+                self._count('retries')
+                attempt += 1
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            elapsed = time.monotonic() - started
+            with self._stats_lock:
+                self._stats['successes'] += 1
+                self._stats['latency_seconds_total'] += elapsed
+                self._stats['latency_seconds_max'] = max(self._stats['latency_seconds_max'], elapsed)
+            return response
+
+    def _hold_slot(self, stream) -> '_SlotStream':
+        return _SlotStream(stream, self._release)
+
+    def _release(self):
+        self._count('in_flight', -1)
+        self._slots.release()
+
+    def get_stats(self) -> Dict:
+        """Counters for this process, plus limiter levels and breaker state"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['latency_seconds_avg'] = round(stats['latency_seconds_total'] / stats['successes'], 4) if stats['successes'] else 0
+        for key in ('limiter_wait_seconds', 'latency_seconds_total', 'latency_seconds_max'):
+            stats[key] = round(stats[key], 4)
+        stats['max_concurrency'] = self.max_concurrency
+        stats['request_budget'] = round(self.request_bucket.available, 1) if self.request_bucket.per_minute else None
+        stats['token_budget'] = round(self.token_bucket.available) if self.token_bucket.per_minute else None
+        stats['circuit'] = self.breaker.get_stats()
+        return stats
+
+_pool: Optional[OpenAIClientPool] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+def get_client_pool(config) -> OpenAIClientPool:
+    """The process-wide pool, created on first use (and again in a forked worker)"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = OpenAIClientPool.from_config(config)
+            _pool_pid = os.getpid()
+        return _pool
+
+def get_client_pool_stats() -> Optional[Dict]:
+    """Stats of this process's pool, or None if no AI call has been made yet"""
+    pool = _pool
+    return pool.get_stats() if pool is not None and _pool_pid == os.getpid() else None
@@ -0,0 +1,186 @@
+from typing import NamedTuple, Tuple
+import numpy as np
+
+MU_SUN = 1.32712440018e11   # km³/s²
+MU_EARTH = 398600.4418      # km³/s²
+AU = 1.495978707e8          # km
+DAY = 86400.0               # s
+J2000 = 2451545.0           # Julian date
+PARKING_ORBIT_RADIUS = 6678.0  # km, 300 km circular LEO
+
+class OrbitalElements(NamedTuple):
+    """Heliocentric J2000 mean elements (ecliptic and equinox of J2000)"""
+    semi_major_axis: float       # AU
+    eccentricity: float
+    inclination: float           # deg
+    mean_longitude: float        # deg at J2000
+    longitude_perihelion: float  # deg
+    longitude_node: float        # deg
+    mean_longitude_rate: float   # deg per Julian century
+
+def julian_date(days_since_epoch, epoch_jd: float = J2000) -> np.ndarray:
+    return epoch_jd + np.asarray(days_since_epoch, dtype=np.float64)
+
+def state_vectors(elements: OrbitalElements, jd) -> Tuple[np.ndarray, np.ndarray]:
+    """Heliocentric position (km) and velocity (km/s) for an array of Julian dates"""
+    jd = np.asarray(jd, dtype=np.float64)
+    a = elements.semi_major_axis * AU
+    e = elements.eccentricity
+    inc = np.radians(elements.inclination)
+    node = np.radians(elements.longitude_node)
+    arg_peri = np.radians(elements.longitude_perihelion - elements.longitude_node)
+
+    centuries = (jd - J2000) / 36525.0
+    mean_longitude = elements.mean_longitude + elements.mean_longitude_rate * centuries
+    mean_anomaly = np.radians(np.mod(mean_longitude - elements.longitude_perihelion, 360.0))
+
+    # Kepler's equation by Newton iteration, converges in a few steps for e < 0.3
+    ecc_anomaly = mean_anomaly + e * np.sin(mean_anomaly)
+    for _ in range(8):
+        ecc_anomaly -= (ecc_anomaly - e * np.sin(ecc_anomaly) - mean_anomaly) / (1 - e * np.cos(ecc_anomaly))
+
+    cos_e = np.cos(ecc_anomaly)
+    sin_e = np.sin(ecc_anomaly)
+    root = np.sqrt(1 - e * e)
+    mean_motion = np.sqrt(MU_SUN / a ** 3)  # rad/s
+    rate = mean_motion * a / (1 - e * cos_e)
+
+    # Perifocal frame
+    x_p = a * (cos_e - e)
+    y_p = a * root * sin_e
+    vx_p = -rate * sin_e
+    vy_p = rate * root * cos_e
+
+    # Rotate to the ecliptic frame
+    cos_w, sin_w = np.cos(arg_peri), np.sin(arg_peri)
+    cos_n, sin_n = np.cos(node), np.sin(node)
+    cos_i, sin_i = np.cos(inc), np.sin(inc)
+    rotation = np.array([
+        [cos_w * cos_n - sin_w * sin_n * cos_i, -sin_w * cos_n - cos_w * sin_n * cos_i],
+        [cos_w * sin_n + sin_w * cos_n * cos_i, -sin_w * sin_n + cos_w * cos_n * cos_i],
+        [sin_w * sin_i, cos_w * sin_i]
+    ])
+
+    position = np.stack([x_p, y_p], axis=-1) @ rotation.T
+    velocity = np.stack([vx_p, vy_p], axis=-1) @ rotation.T
+    return position, velocity
+
+def _stumpff(psi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    c2 = np.empty_like(psi)
+    c3 = np.empty_like(psi)
+
+    pos = psi > 1e-6
+    neg = psi < -1e-6
+    small = ~(pos | neg)
+
+    sp = np.sqrt(psi[pos])
+    c2[pos] = (1 - np.cos(sp)) / psi[pos]
+    c3[pos] = (sp - np.sin(sp)) / sp ** 3
+
+    sn = np.sqrt(-psi[neg])
+    c2[neg] = (1 - np.cosh(sn)) / psi[neg]
+    c3[neg] = (np.sinh(sn) - sn) / sn ** 3
+
+    c2[small] = 0.5
+    c3[small] = 1 / 6.0
+    return c2, c3
+
+def lambert(r1: np.ndarray, r2: np.ndarray, tof: np.ndarray, mu: float = MU_SUN,
+            iterations: int = 60) -> Tuple[np.ndarray, np.ndarray]:
+    """Zero-revolution prograde Lambert solutions for arrays of boundary conditions.
+
+    r1, r2 are (..., 3) positions in km, tof is (...) seconds. Uses the
+    universal-variable formulation with bisection on psi, so every element
+    converges in the same fixed number of iterations and the whole grid is
+    solved with array operations. Returns departure and arrival velocities
+    in km/s; unsolvable cases come back as NaN.
+    """
+    r1 = np.asarray(r1, dtype=np.float64)
+    r2 = np.asarray(r2, dtype=np.float64)
+    tof = np.asarray(tof, dtype=np.float64)
+
+    r1n = np.linalg.norm(r1, axis=-1)
+    r2n = np.linalg.norm(r2, axis=-1)
+    cos_dnu = np.clip(np.einsum('...i,...i->...', r1, r2) / (r1n * r2n), -1.0, 1.0)
+
+    # Prograde: take the long way round when the transfer plane normal points south
+    long_way = np.cross(r1, r2)[..., 2] < 0
+    direction = np.where(long_way, -1.0, 1.0)
+    A = direction * np.sqrt(r1n * r2n * (1 + cos_dnu))
+
+    psi_low = np.full_like(tof, -4 * np.pi)
+    psi_up = np.full_like(tof, 4 * np.pi ** 2)
+    psi = np.zeros_like(tof)
+    sqrt_mu = np.sqrt(mu)
+
+    for _ in range(iterations):
+        c2, c3 = _stumpff(psi)
+        y = r1n + r2n + A * (psi * c3 - 1) / np.sqrt(c2)
+        y_ok = y > 0
+        chi = np.sqrt(np.where(y_ok, y, 0) / c2)
+        dt = (chi ** 3 * c3 + A * np.sqrt(np.where(y_ok, y, 0))) / sqrt_mu
+
+        # y < 0 means psi is too small; treat it like a transfer that is too fast
+        too_fast = ~y_ok | (dt <= tof)
+        psi_low = np.where(too_fast, psi, psi_low)
+        psi_up = np.where(too_fast, psi_up, psi)
+        psi = (psi_low + psi_up) / 2
+
+    c2, c3 = _stumpff(psi)
+    y = r1n + r2n + A * (psi * c3 - 1) / np.sqrt(c2)
+    y = np.where(y > 0, y, np.nan)
+
+    f = 1 - y / r1n
+    g = A * np.sqrt(y / mu)
+    g_dot = 1 - y / r2n
+
+    v1 = (r2 - f[..., None] * r1) / g[..., None]
+    v2 = (g_dot[..., None] * r2 - r1) / g[..., None]
+    return v1, v2
+
+def hohmann_transfer_time(r1_au: float, r2_au: float) -> float:
+    """Hohmann transfer time in days between circular orbits"""
+    a = (r1_au + r2_au) / 2 * AU
+    return np.pi * np.sqrt(a ** 3 / MU_SUN) / DAY
+
+def departure_delta_v(c3: np.ndarray, parking_radius: float = PARKING_ORBIT_RADIUS) -> np.ndarray:
+    """Δv to reach a hyperbolic excess energy C3 from a circular parking orbit, km/s"""
+    return np.sqrt(c3 + 2 * MU_EARTH / parking_radius) - np.sqrt(MU_EARTH / parking_radius)
+
+def propagate(r0: np.ndarray, v0: np.ndarray, t: np.ndarray, mu: float = MU_SUN,
+              iterations: int = 30) -> Tuple[np.ndarray, np.ndarray]:
+    """Two-body positions and velocities at times t (s) after the state (r0, v0).
+
+    Solves the universal Kepler equation for every time at once with Newton
+    iteration and applies the Lagrange f and g coefficients. Returns (T, 3)
+    arrays in km and km/s.
+    """
+    r0 = np.asarray(r0, dtype=np.float64)
+    v0 = np.asarray(v0, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)
+
+    r0n = np.linalg.norm(r0)
+    vr0 = r0 @ v0 / r0n
+    alpha = 2 / r0n - (v0 @ v0) / mu
+    sqrt_mu = np.sqrt(mu)
+
+    chi = sqrt_mu * abs(alpha) * t
+    for _ in range(iterations):
+        z = alpha * chi ** 2
+        c2, c3 = _stumpff(z)
+        f_chi = (r0n * vr0 / sqrt_mu * chi ** 2 * c2 + (1 - alpha * r0n) * chi ** 3 * c3
+                 + r0n * chi - sqrt_mu * t)
+        df_chi = (r0n * vr0 / sqrt_mu * chi * (1 - z * c3) + (1 - alpha * r0n) * chi ** 2 * c2 + r0n)
+        chi -= f_chi / df_chi
+
+    z = alpha * chi ** 2
+    c2, c3 = _stumpff(z)
+    f = 1 - chi ** 2 / r0n * c2
+    g = t - chi ** 3 * c3 / sqrt_mu
+    position = f[:, None] * r0 + g[:, None] * v0
+
+    rn = np.linalg.norm(position, axis=-1)
+    f_dot = sqrt_mu / (rn * r0n) * (z * chi * c3 - chi)
+    g_dot = 1 - chi ** 2 / rn * c2
+    velocity = f_dot[:, None] * r0 + g_dot[:, None] * v0
+    return position, velocity
@@ -0,0 +1,113 @@
+import os
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from flask import current_app, has_app_context
+
+class Stage(NamedTuple):
+    """A unit of pipeline work. func receives a dict of its dependencies' results."""
+    name: str
+    func: Callable[[Dict], object]
+    depends_on: Tuple[str, ...] = ()
+
+class StageError(Exception):
+    """Raised when a pipeline stage fails"""
+
+    def __init__(self, stage: str, error: Exception):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+# Stage threads shared by every pipeline in the process; sized by whichever run creates them
+DEFAULT_STAGE_WORKERS = 8
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """The process-wide stage pool, created on first use (and again in a forked worker)"""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-stage')
+            _executor_pid = os.getpid()
+        return _executor
+
+class Pipeline:
+    """Runs a DAG of stages, starting each one as soon as its dependencies finish.
+
+    Stages are registered by name, so adding the same stage twice keeps
+    one copy and its work is done once per run. Stages run on a pool shared
+    by all pipelines of the process, sized from ANALYSIS_STAGE_WORKERS (or
+    max_workers outside an app) when the first run creates it.
+    """
+
+    def __init__(self, stages: Iterable[Stage] = (), max_workers: Optional[int] = None):
+        self.stages: Dict[str, Stage] = {}
+        self.max_workers = max_workers
+        self.logger = logging.getLogger(__name__)
+        for stage in stages:
+            self.add(stage)
+
+    def add(self, stage: Stage) -> 'Pipeline':
+        self.stages.setdefault(stage.name, stage)
+        return self
+
+    def _check_graph(self):
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.depends_on if dep not in self.stages]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stage(s): {', '.join(missing)}")
+
+    def run(self) -> Tuple[Dict[str, object], Dict[str, float]]:
+        """Execute every stage. Returns (results, timings in ms)."""
+        self._check_graph()
+
+        app = current_app._get_current_object() if has_app_context() else None
+        max_workers = self.max_workers
+        if max_workers is None:
+            max_workers = app.config.get('ANALYSIS_STAGE_WORKERS', DEFAULT_STAGE_WORKERS) if app else DEFAULT_STAGE_WORKERS
+        executor = _get_executor(max_workers)
+        results: Dict[str, object] = {}
+        timings: Dict[str, float] = {}
+        pending = dict(self.stages)
+        running = {}
+        run_started = time.perf_counter()
+
+        def execute(stage: Stage, inputs: Dict):
+            started = time.perf_counter()
+            if app is None:
+                value = stage.func(inputs)
+            else:
+                with app.app_context():
+                    value = stage.func(inputs)
+            return value, (time.perf_counter() - started) * 1000
+
+        while pending or running:
+            ready: List[Stage] = [
+                stage for stage in pending.values()
+                if all(dep in results for dep in stage.depends_on)
+            ]
+            for stage in ready:
+                del pending[stage.name]
+                inputs = {dep: results[dep] for dep in stage.depends_on}
+                running[executor.submit(execute, stage, inputs)] = stage.name
+
+            if not running:
+                raise ValueError(f"Unresolvable stage dependencies: {', '.join(pending)}")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name], timings[name] = future.result()
+                except Exception as e:
+                    for other in running:
+                        other.cancel()
+                    raise StageError(name, e) from e
+
+        timings['total'] = (time.perf_counter() - run_started) * 1000  # wall clock
+        return results, {name: round(ms, 2) for name, ms in timings.items()}
@@ -0,0 +1,125 @@
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy import bindparam, event, inspect
+from app import db
+from models import Mission, MissionStatus
+from utils.formatters import MissionFormatter
+
+# Bump whenever a MissionFormatter change alters the display output. Stored
+# projections carry the version they were built with, and older ones are
+# rebuilt the next time a page reads them.
+PROJECTION_VERSION = 1
+
+# Mission attributes each projection is built from
+SUMMARY_SOURCES = (
+    'name', 'description', 'destination', 'launch_date', 'mission_duration', 'crew_size',
+    'spacecraft_type', 'payload_mass', 'fuel_requirements', 'status', 'risk_level',
+    'feasibility_score', 'created_at', 'analyzed_at'
+)
+DETAIL_SOURCES = ('ai_analysis', 'nasa_data')
+
+def build_summary(mission: Mission) -> Dict:
+    """List/header projection; the id is left out because it is known when reading"""
+    summary = MissionFormatter.format_mission_data(mission)
+    summary.pop('id')
+    summary['v'] = PROJECTION_VERSION
+    return summary
+
+def build_detail(mission: Mission) -> Dict:
+    """Results-page projection of the AI analysis and NASA data"""
+    return {
+        'v': PROJECTION_VERSION,
+        'analysis': MissionFormatter.format_ai_analysis(mission.ai_analysis),
+        'nasa_data': MissionFormatter.format_nasa_data(mission.nasa_data or {})
+    }
+
+def _is_current(projection: Optional[Dict]) -> bool:
+    return bool(projection) and projection.get('v') == PROJECTION_VERSION
+
+def _changed(state, names) -> bool:
+    return any(state.attrs[name].history.has_changes() for name in names)
+
+@event.listens_for(db.session, 'before_flush')
+def _project_missions(session, flush_context, instances):
+    """Rebuild the projections of missions whose source attributes are being written"""
+    for obj in session.new:
+        if isinstance(obj, Mission):
+            # Column defaults are applied at INSERT, after this hook
+            obj.created_at = obj.created_at or datetime.utcnow()
+            obj.status = obj.status or MissionStatus.DRAFT
+            obj.display_summary = build_summary(obj)
+            obj.display_detail = build_detail(obj)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Mission) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        if _changed(state, SUMMARY_SOURCES):
+            obj.display_summary = build_summary(obj)
+        if _changed(state, DETAIL_SOURCES):
+            obj.display_detail = build_detail(obj)
+
+class ProjectionService:
+    """Reads the display projections stored on each mission.
+
+    Projections are written in the same flush as the data they are built
+    from, so pages only read them. A missing or out-of-date projection is
+    rebuilt on read and saved back, leaving updated_at (and with it the
+    HTTP validators) untouched.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def summary(self, mission: Mission) -> Dict:
+        """Formatted mission fields, as MissionFormatter.format_mission_data returns them"""
+        return self.summaries([mission])[0]
+
+    def summaries(self, missions: List[Mission]) -> List[Dict]:
+        """Summary projections for a page of missions, backfilling stale ones with one executemany"""
+        summaries = []
+        stale = {}
+        for mission in missions:
+            projection = mission.display_summary
+            if not _is_current(projection):
+                projection = stale[mission.id] = build_summary(mission)
+            summaries.append(self._public(projection, id=mission.id))
+        if stale:
+            self._backfill('display_summary', stale)
+        return summaries
+
+    def detail(self, mission: Mission) -> Dict:
+        """{'analysis': ..., 'nasa_data': ...} as format_ai_analysis / format_nasa_data return them"""
+        projection = mission.display_detail
+        if not _is_current(projection):
+            projection = build_detail(mission)
+            self._backfill('display_detail', {mission.id: projection})
+        return self._public(projection)
+
+    @staticmethod
+    def _public(projection: Dict, **extra) -> Dict:
+        public = {name: value for name, value in projection.items() if name != 'v'}
+        public.update(extra)
+        return public
+
+    def _backfill(self, column: str, projections: Dict[int, Dict]):
+        """Save rebuilt projections without bumping updated_at; a failed save only costs a rebuild next time.
+
+        The UPDATE runs on the session's own connection and transaction, so
+        SQLite never sees a second writer from the same request.
+        """
+        table = Mission.__table__
+        statement = (table.update()
+                     .where(table.c.id == bindparam('mission_id'))
+                     .values({column: bindparam('projection'), 'updated_at': table.c.updated_at}))
+        try:
+            db.session.connection().execute(statement, [
+                {'mission_id': mission_id, 'projection': projection}
+                for mission_id, projection in projections.items()
+            ])
+            db.session.commit()
+            self.logger.info(f"Backfilled {column} for {len(projections)} mission(s)")
+        except Exception as e:
+            db.session.rollback()
+            self.logger.warning(f"Could not backfill {column}: {e}")
@@ -0,0 +1,120 @@
+import json
+import difflib
+import hashlib
+import logging
+from typing import Dict, List, Optional
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from models import Mission, MissionReport
+from app import db
+
+class ReportStore:
+    """Versioned mission reports keyed by a hash of their inputs.
+    
+    A report stays current while the mission row and its latest analysis are
+    unchanged; any change produces a new hash, so the next view generates a
+    new version while the old ones stay available for diffing.
+    """
+    
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+    
+    @staticmethod
+    def input_hash(mission_data: Dict, analysis: Dict, mission_updated_at, analysis_id: Optional[int]) -> str:
+        """Canonical hash of everything the report is generated from"""
+        canonical = {
+            'mission': mission_data,
+            'analysis': analysis,
+            'mission_updated_at': mission_updated_at,
+            'analysis_id': analysis_id
+        }
+        encoded = json.dumps(canonical, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+    
+    def inputs_for(self, mission: Mission, mission_data: Dict) -> Dict:
+        """Hash and provenance of the current report inputs for a mission"""
+        analysis_id = mission.latest_analysis_id
+        return {
+            'input_hash': self.input_hash(mission_data, mission.ai_analysis or {}, mission.updated_at, analysis_id),
+            'analysis_id': analysis_id,
+            'mission_updated_at': mission.updated_at
+        }
+    
+    def get_current(self, mission_id: int, input_hash: str) -> Optional[MissionReport]:
+        """The stored report for these exact inputs, if any"""
+        return (MissionReport.query
+                .filter_by(mission_id=mission_id, input_hash=input_hash)
+                .order_by(MissionReport.version.desc())
+                .first())
+    
+    def save(self, mission_id: int, content: Dict, model: str, inputs: Dict) -> Optional[MissionReport]:
+        """Store content as the next version for a mission"""
+        try:
+            next_version = (db.session.query(func.coalesce(func.max(MissionReport.version), 0))
+                            .filter(MissionReport.mission_id == mission_id)
+                            .scalar()) + 1
+            
+            report = MissionReport(
+                mission_id=mission_id,
+                version=next_version,
+                input_hash=inputs['input_hash'],
+                analysis_id=inputs['analysis_id'],
+                mission_updated_at=inputs['mission_updated_at'],
+                content=content,
+                model=model
+            )
+            db.session.add(report)
+            db.session.commit()
+            return report
+            
+        except IntegrityError:
+            # Another request saved a version concurrently; prefer its copy
+            db.session.rollback()
+            return self.get_current(mission_id, inputs['input_hash'])
+        
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Error saving report for mission {mission_id}: {e}")
+            return None
+    
+    def versions(self, mission_id: int) -> List[MissionReport]:
+        return (MissionReport.query
+                .filter_by(mission_id=mission_id)
+                .order_by(MissionReport.version.desc())
+                .all())
+    
+    def get_version(self, mission_id: int, version: int) -> Optional[MissionReport]:
+        return MissionReport.query.filter_by(mission_id=mission_id, version=version).first()
+    
+    @staticmethod
+    def diff(old: MissionReport, new: MissionReport) -> Dict:
+        """Section-by-section unified diff between two report versions"""
+        sections = {}
+        names = list(old.content) + [name for name in new.content if name not in old.content]
+        
+        for name in names:
+            before = old.content.get(name)
+            after = new.content.get(name)
+            if before == after:
+                continue
+            
+            sections[name] = {
+                'status': 'added' if before is None else 'removed' if after is None else 'changed',
+                'diff': list(difflib.unified_diff(
+                    _lines(before), _lines(after),
+                    fromfile=f"v{old.version}", tofile=f"v{new.version}", lineterm=''
+                ))
+            }
+        
+        return {
+            'from_version': old.version,
+            'to_version': new.version,
+            'changed_sections': sections
+        }
+
+def _lines(value) -> List[str]:
+    if value is None:
+        return []
+    if not isinstance(value, str):
+        value = json.dumps(value, indent=2, sort_keys=True)
+    return value.splitlines()
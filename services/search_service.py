@@ -0,0 +1,333 @@
+import re
+import json
+import time
+import base64
+import logging
+from typing import Dict, List, Optional
+from datetime import date, datetime, timedelta
+import numpy as np
+from sqlalchemy import func, or_, select, text, tuple_
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import load_only
+from werkzeug.datastructures import MultiDict
+from models import Mission, MissionStatus, RiskLevel
+from app import db
+from services.history_service import LIST_COLUMNS, HistoryService
+from utils.validators import ValidationError
+
+# Sortable fields; each is paired with Mission.id for a stable keyset
+SORT_FIELDS = {
+    'created_at': Mission.created_at,
+    'launch_date': Mission.launch_date,
+    'feasibility_score': Mission.feasibility_score,
+    'name': Mission.name
+}
+
+MAX_LIMIT = 100
+
+# Must match the expression of the ix_mission_fts GIN index exactly
+_PG_DOCUMENT = "coalesce(name, '') || ' ' || coalesce(description, '')"
+# Built CONCURRENTLY so existing tables stay writable; that cannot run inside a transaction
+_PG_INDEX_DDL = (f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_mission_fts ON mission "
+                 f"USING gin (to_tsvector('english', {_PG_DOCUMENT}))")
+# Serializes the build between processes starting together; a build in progress also looks invalid
+_PG_INDEX_LOCK_KEY = 72823503
+# An interrupted concurrent build leaves an invalid index behind that IF NOT EXISTS would keep
+_PG_INVALID_INDEX = ("SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                     "WHERE c.relname = 'ix_mission_fts' AND NOT i.indisvalid")
+
+_SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS mission_fts USING fts5("
+    "name, description, content='mission', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS mission_fts_insert AFTER INSERT ON mission BEGIN "
+    "INSERT INTO mission_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS mission_fts_delete AFTER DELETE ON mission BEGIN "
+    "INSERT INTO mission_fts(mission_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS mission_fts_update AFTER UPDATE OF name, description ON mission BEGIN "
+    "INSERT INTO mission_fts(mission_fts, rowid, name, description) VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO mission_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END"
+)
+
+_fts_backend = None  # 'postgresql', 'sqlite' or None for the LIKE fallback
+
+def install_search_index(engine):
+    """Create the full-text index for the current backend.
+
+    PostgreSQL gets a GIN index over a tsvector expression, built
+    concurrently on an autocommit connection. SQLite gets an
+    external-content FTS5 table kept in sync by triggers; it is rebuilt
+    from the mission table the first time it is created. Other backends,
+    or SQLite builds without FTS5, fall back to LIKE matching.
+    """
+    global _fts_backend
+    logger = logging.getLogger(__name__)
+
+    try:
+        if engine.dialect.name == 'postgresql':
+            with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+                connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': _PG_INDEX_LOCK_KEY})
+                try:
+                    if connection.execute(text(_PG_INVALID_INDEX)).first() is not None:
+                        connection.execute(text("DROP INDEX CONCURRENTLY IF EXISTS ix_mission_fts"))
+                    connection.execute(text(_PG_INDEX_DDL))
+                finally:
+                    connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': _PG_INDEX_LOCK_KEY})
+            _fts_backend = 'postgresql'
+            return
+
+        with engine.begin() as connection:
+            if engine.dialect.name == 'sqlite':
+                existed = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'mission_fts'")
+                ).first() is not None
+                for statement in _SQLITE_FTS_DDL:
+                    connection.execute(text(statement))
+                if not existed:
+                    connection.execute(text("INSERT INTO mission_fts(mission_fts) VALUES ('rebuild')"))
+                _fts_backend = 'sqlite'
+    except OperationalError as e:
+        logger.warning(f"Full-text index unavailable, falling back to LIKE search: {e}")
+        _fts_backend = None
+
+def _encode_cursor(value, mission_id: int) -> str:
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    raw = json.dumps([value, mission_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def _decode_cursor(cursor: str, field: str):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        value, mission_id = json.loads(base64.urlsafe_b64decode(padded))
+        if field == 'created_at':
+            value = datetime.fromisoformat(value)
+        elif field == 'launch_date':
+            value = date.fromisoformat(value)
+        elif field == 'feasibility_score':
+            value = float(value)
+        return value, int(mission_id)
+    except Exception:
+        raise ValidationError("Invalid cursor")
+
+def _parse_date(value: str, name: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValidationError(f"{name} must be a YYYY-MM-DD date")
+
+def _parse_float(value: str, name: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        raise ValidationError(f"{name} must be a number")
+
+def _parse_enum(enum_type, values: List[str], name: str) -> list:
+    try:
+        return [enum_type(value.lower()) for value in values]
+    except ValueError:
+        allowed = ', '.join(member.value for member in enum_type)
+        raise ValidationError(f"{name} must be one of: {allowed}")
+
+def _fts5_query(terms: str) -> Optional[str]:
+    """Quote each word so user input cannot use FTS5 query syntax"""
+    words = re.findall(r'\w+', terms)
+    return ' '.join(f'"{word}"' for word in words) or None
+
+class SearchService:
+    """Filtered, sorted and full-text mission search.
+
+    Results are paged with a keyset cursor on (sort field, id) so every
+    page is an index range scan. Sorting by feasibility_score only returns
+    assessed missions, since unscored rows have no position in that order.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def search(self, args) -> Dict:
+        """Run a search from request query arguments (a werkzeug MultiDict)"""
+        sort = args.get('sort', '-created_at')
+        descending = sort.startswith('-')
+        field = sort.lstrip('-+')
+        if field not in SORT_FIELDS:
+            raise ValidationError(f"sort must be one of: {', '.join(SORT_FIELDS)} (prefix with - for descending)")
+
+        limit = args.get('limit', 25, type=int)
+        if not 1 <= limit <= MAX_LIMIT:
+            raise ValidationError(f"limit must be between 1 and {MAX_LIMIT}")
+
+        query = Mission.query.options(load_only(*LIST_COLUMNS))
+        for condition in self.filters(args):
+            query = query.filter(condition)
+
+        column = SORT_FIELDS[field]
+        if field == 'feasibility_score':
+            query = query.filter(column.isnot(None))
+
+        cursor = args.get('cursor')
+        if cursor:
+            key = tuple_(column, Mission.id)
+            position = _decode_cursor(cursor, field)
+            query = query.filter(key < position if descending else key > position)
+
+        if descending:
+            query = query.order_by(column.desc(), Mission.id.desc())
+        else:
+            query = query.order_by(column.asc(), Mission.id.asc())
+
+        rows = query.limit(limit + 1).all()
+        missions = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = missions[-1]
+            next_cursor = _encode_cursor(getattr(last, field), last.id)
+
+        return {
+            'missions': [HistoryService.to_dict(mission) for mission in missions],
+            'next_cursor': next_cursor,
+            'sort': sort,
+            'limit': limit
+        }
+
+    def filters(self, args) -> List:
+        """WHERE conditions for the destination, status, risk_level, feasibility, launch date and q arguments"""
+        conditions = []
+
+        destinations = [value.lower() for value in args.getlist('destination') if value]
+        if destinations:
+            conditions.append(Mission.destination.in_(destinations))
+
+        statuses = [value for value in args.getlist('status') if value]
+        if statuses:
+            conditions.append(Mission.status.in_(_parse_enum(MissionStatus, statuses, 'status')))
+
+        risk_levels = [value for value in args.getlist('risk_level') if value]
+        if risk_levels:
+            conditions.append(Mission.risk_level.in_(_parse_enum(RiskLevel, risk_levels, 'risk_level')))
+
+        if args.get('min_feasibility'):
+            conditions.append(Mission.feasibility_score >= _parse_float(args['min_feasibility'], 'min_feasibility'))
+        if args.get('max_feasibility'):
+            conditions.append(Mission.feasibility_score <= _parse_float(args['max_feasibility'], 'max_feasibility'))
+
+        if args.get('launch_from'):
+            conditions.append(Mission.launch_date >= _parse_date(args['launch_from'], 'launch_from'))
+        if args.get('launch_to'):
+            conditions.append(Mission.launch_date <= _parse_date(args['launch_to'], 'launch_to'))
+
+        terms = (args.get('q') or '').strip()
+        if terms:
+            conditions.append(self._text_condition(terms))
+
+        return conditions
+
+    def _text_condition(self, terms: str):
+        if _fts_backend == 'postgresql':
+            document = func.to_tsvector('english', text(_PG_DOCUMENT))
+            return document.op('@@')(func.websearch_to_tsquery('english', terms))
+
+        if _fts_backend == 'sqlite':
+            match = _fts5_query(terms)
+            if match is None:
+                return Mission.id.is_(None)
+            return Mission.id.in_(
+                select(text('rowid')).select_from(text('mission_fts'))
+                .where(text('mission_fts MATCH :fts_query').bindparams(fts_query=match))
+            )
+
+        pattern = f"%{terms}%"
+        return or_(Mission.name.ilike(pattern), Mission.description.ilike(pattern))
+
+# One query per index the search relies on, plus a second keyset page and a text search
+BENCHMARK_QUERIES = {
+    'newest': {},
+    'destination_status': {'destination': 'mars', 'status': 'completed'},
+    'risk_feasibility': {'risk_level': 'low', 'min_feasibility': '80', 'sort': '-feasibility_score'},
+    'launch_window': {'launch_from': '2033-01-01', 'launch_to': '2033-03-31', 'sort': 'launch_date'},
+    'by_name': {'sort': 'name'},
+    'text': {'q': 'habitat'},
+    'text_filtered': {'q': 'sample return', 'destination': 'mars'},
+}
+
+_BENCHMARK_WORDS = ('crewed', 'habitat', 'sample', 'return', 'orbiter', 'lander', 'survey', 'relay',
+                    'cargo', 'ice', 'drill', 'telescope', 'flyby', 'outpost', 'rover', 'aerobrake')
+
+def seed_benchmark_missions(count: int, chunk_size: int = 10000, seed: int = 0) -> int:
+    """Insert count synthetic missions for benchmarking; meant for a scratch database.
+
+    Values are spread like real data: several destinations and statuses,
+    scores for assessed missions, launch dates over 20 years and short
+    descriptions drawn from a small vocabulary so text queries match a
+    realistic fraction of rows.
+    """
+    rng = np.random.default_rng(seed)
+    destinations = ['mars', 'moon', 'venus', 'jupiter', 'europa', 'titan', 'asteroid_belt']
+    statuses = list(MissionStatus)
+    risks = list(RiskLevel)
+    start = date(2026, 1, 1)
+    now = datetime.utcnow()
+
+    for offset in range(0, count, chunk_size):
+        size = min(chunk_size, count - offset)
+        status = rng.choice(len(statuses), size, p=[0.2, 0.05, 0.7, 0.05])
+        words = rng.choice(_BENCHMARK_WORDS, (size, 6))
+        values = []
+        for i in range(size):
+            assessed = statuses[status[i]] == MissionStatus.COMPLETED
+            values.append({
+                'name': f"{words[i, 0].title()} {words[i, 1].title()} {offset + i}",
+                'description': ' '.join(words[i]),
+                'destination': destinations[int(rng.integers(len(destinations)))],
+                'launch_date': start + timedelta(days=int(rng.integers(20 * 365))),
+                'mission_duration': int(rng.integers(30, 1200)),
+                'crew_size': int(rng.integers(0, 7)),
+                'spacecraft_type': 'orion',
+                'payload_mass': float(rng.uniform(1000, 50000)),
+                'fuel_requirements': float(rng.uniform(5000, 100000)),
+                'status': statuses[status[i]],
+                'risk_level': risks[int(rng.integers(len(risks)))] if assessed else None,
+                'feasibility_score': round(float(rng.uniform(0, 100)), 1) if assessed else None,
+                'created_at': now - timedelta(seconds=count - offset - i),
+                'updated_at': now
+            })
+        db.session.execute(Mission.__table__.insert(), values)
+        db.session.commit()
+    return count
+
+def benchmark_search(iterations: int = 200, queries: Optional[Dict[str, Dict]] = None) -> Dict:
+    """Latency of SearchService.search per query, in ms (p50, p95, p99 and max).
+
+    Each query runs iterations times after one warm-up run, through the
+    same path as the API including serialization. 'next_page' follows the
+    cursor of the newest page.
+    """
+    service = SearchService()
+    queries = dict(queries or BENCHMARK_QUERIES)
+    first_page = service.search(MultiDict({}))
+    if first_page['next_cursor']:
+        queries['next_page'] = {'cursor': first_page['next_cursor']}
+
+    results = {}
+    overall = []
+    for name, params in queries.items():
+        args = MultiDict(params)
+        service.search(args)  # warm up
+        db.session.expunge_all()
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            page = service.search(args)
+            timings.append((time.perf_counter() - started) * 1000)
+            db.session.expunge_all()
+        p50, p95, p99 = np.percentile(timings, [50, 95, 99])
+        results[name] = {'p50': round(float(p50), 2), 'p95': round(float(p95), 2), 'p99': round(float(p99), 2),
+                         'max': round(max(timings), 2), 'rows': len(page['missions'])}
+        overall.extend(timings)
+
+    return {
+        'missions': db.session.execute(select(func.count()).select_from(Mission)).scalar(),
+        'backend': _fts_backend or 'like',
+        'iterations': iterations,
+        'queries': results,
+        'p99': round(float(np.percentile(overall, 99)), 2)
+    }
@@ -0,0 +1,131 @@
+import os
+import json
+import zlib
+import struct
+from typing import Dict, List, Optional
+import numpy as np
+
+# Layout (little endian):
+#   header    magic "AMS1", version u8, dtype code u8, compression u8, pad u8,
+#             rows u32, name-table length u32
+#   names     UTF-8 JSON list of column names, zero-padded to an 8-byte boundary
+#   payload   one contiguous array per column, in name order (zlib-compressed as a
+#             whole when compression is 1)
+MAGIC = b'AMS1'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBBII')
+
+DTYPES = {1: np.dtype('<f4'), 2: np.dtype('<f8')}
+DTYPE_CODES = {dtype: code for code, dtype in DTYPES.items()}
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+
+class SeriesFormatError(ValueError):
+    """Raised for buffers that are not valid series data"""
+
+def encode(columns: Dict[str, np.ndarray], dtype: str = 'float32', compress: bool = False) -> bytes:
+    """Pack equal-length 1-D columns into the columnar binary format"""
+    target = np.dtype(dtype).newbyteorder('<')
+    if target not in DTYPE_CODES:
+        raise SeriesFormatError(f"Unsupported dtype {dtype}; use float32 or float64")
+
+    names = list(columns)
+    arrays = [np.ascontiguousarray(columns[name], dtype=target).ravel() for name in names]
+    rows = arrays[0].size if arrays else 0
+    if any(array.size != rows for array in arrays):
+        raise SeriesFormatError('All columns must have the same length')
+
+    name_table = json.dumps(names, separators=(',', ':')).encode('utf-8')
+    name_table += b'\0' * (-(HEADER.size + len(name_table)) % 8)
+
+    payload = b''.join(array.tobytes() for array in arrays)
+    compression = COMPRESSION_NONE
+    if compress:
+        payload = zlib.compress(payload, 6)
+        compression = COMPRESSION_ZLIB
+
+    header = HEADER.pack(MAGIC, VERSION, DTYPE_CODES[target], compression, 0, rows, len(name_table))
+    return header + name_table + payload
+
+class SeriesView:
+    """Read-only access to encoded series.
+
+    For uncompressed data each column is a NumPy view straight into the
+    source buffer (bytes, or a memory map for side files), so nothing is
+    copied or parsed until values are read, and a strided slice touches
+    only the rows it returns.
+    """
+
+    def __init__(self, buffer):
+        view = memoryview(buffer)
+        if len(view) < HEADER.size:
+            raise SeriesFormatError('Buffer too short for a series header')
+
+        magic, version, dtype_code, compression, _, rows, names_length = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise SeriesFormatError('Not a series buffer (bad magic)')
+        if version != VERSION or dtype_code not in DTYPES:
+            raise SeriesFormatError(f"Unsupported series version {version} or dtype {dtype_code}")
+
+        names_end = HEADER.size + names_length
+        self.names: List[str] = json.loads(bytes(view[HEADER.size:names_end]).rstrip(b'\0'))
+        self.rows = rows
+        self.dtype = DTYPES[dtype_code]
+        self.compressed = compression == COMPRESSION_ZLIB
+
+        if self.compressed:
+            data = np.frombuffer(zlib.decompress(view[names_end:]), dtype=self.dtype)
+            offset = 0
+        else:
+            data = np.frombuffer(view, dtype=np.uint8)
+            offset = names_end
+
+        self._columns = {}
+        for index, name in enumerate(self.names):
+            if self.compressed:
+                column = data[index * rows:(index + 1) * rows]
+            else:
+                start = offset + index * rows * self.dtype.itemsize
+                column = data[start:start + rows * self.dtype.itemsize].view(self.dtype)
+            column.flags.writeable = False
+            self._columns[name] = column
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return dict(self._columns)
+
+    def downsample(self, points: int, start: Optional[int] = None, stop: Optional[int] = None,
+                   names: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """At most `points` evenly strided rows from [start, stop), always keeping the last row"""
+        start, stop, _ = slice(start, stop).indices(self.rows)
+        count = max(stop - start, 0)
+        # Stride so the strided rows plus the appended last row stay within `points`
+        step = max(-(-(count - 1) // (points - 1)), 1) if points > 1 else max(count, 1)
+
+        result = {}
+        for name in names or self.names:
+            column = self._columns[name]
+            sampled = column[start:stop:step]
+            if count and points > 1 and (count - 1) % step:
+                sampled = np.append(sampled, column[stop - 1])
+            result[name] = sampled
+        return result
+
+def open_file(path: str) -> SeriesView:
+    """Memory-map a side file; pages are only read as columns are accessed"""
+    if os.path.getsize(path) == 0:
+        raise SeriesFormatError(f"Empty series file {path}")
+    return SeriesView(np.memmap(path, dtype=np.uint8, mode='r'))
+
+def write_file(path: str, buffer: bytes):
+    """Write an encoded series atomically"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temporary = f"{path}.tmp"
+    with open(temporary, 'wb') as handle:
+        handle.write(buffer)
+    os.replace(temporary, path)
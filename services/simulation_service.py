@@ -0,0 +1,232 @@
+import os
+import math
+import contextlib
+import random
+import logging
+from typing import Dict, Optional
+import numpy as np
+from sqlalchemy import select
+from models import Mission, SimulationResult
+from app import db
+from services import series_format
+from services.feasibility_scorer import MissionPhysics, nominal_physics
+from services.launch_windows import transfer_trajectory
+from services.monte_carlo import TrialInputs, propellant_timeline, simulate, summarize
+from services.nasa_service import NASAService
+
+# Blackbody equilibrium temperature of a sunlit sphere at 1 AU, K
+EQUILIBRIUM_TEMPERATURE_1AU = 278.6
+
+TRAJECTORY_SAMPLES = 2000
+FUEL_SAMPLES = 500
+
+# Series name -> SimulationResult blob column
+SERIES_COLUMNS = {
+    'trajectory': SimulationResult.trajectory_series,
+    'fuel': SimulationResult.fuel_series
+}
+
+class SimulationService:
+    """Monte Carlo simulation of a mission, stored as SimulationResult rows"""
+
+    def __init__(self, trials: int = 10000, max_trials: int = 1000000, processes: int = 1,
+                 series_storage: str = 'blob', series_dir: str = 'simulation_series',
+                 series_dtype: str = 'float32', series_compress: bool = False,
+                 nasa_service: Optional[NASAService] = None):
+        self.trials = trials
+        self.max_trials = max_trials
+        self.processes = processes
+        self.series_storage = series_storage
+        self.series_dir = series_dir
+        self.series_dtype = series_dtype
+        self.series_compress = series_compress
+        self.nasa_service = nasa_service or NASAService()
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config, nasa_service: Optional[NASAService] = None) -> 'SimulationService':
+        """Build the service from the Flask app config"""
+        return cls(
+            nasa_service=nasa_service,
+            trials=config.get('SIMULATION_TRIALS', 10000),
+            max_trials=config.get('SIMULATION_MAX_TRIALS', 1000000),
+            processes=config.get('SIMULATION_PROCESSES', 1),
+            series_storage=config.get('SIMULATION_SERIES_STORAGE', 'blob'),
+            series_dir=config.get('SIMULATION_SERIES_DIR', 'simulation_series'),
+            series_dtype=config.get('SIMULATION_SERIES_DTYPE', 'float32'),
+            series_compress=config.get('SIMULATION_SERIES_COMPRESS', False)
+        )
+
+    def simulate_mission(self, mission_id: int, trials: Optional[int] = None, seed: Optional[int] = None) -> Dict:
+        """Run the simulation for a mission and persist its summary"""
+        try:
+            mission = db.session.get(Mission, mission_id)
+            if mission is None:
+                return {'success': False, 'error': 'Mission not found'}
+
+            trials = trials or self.trials
+            if not 1 <= trials <= self.max_trials:
+                return {'success': False, 'error': f"trials must be between 1 and {self.max_trials}"}
+            if seed is None:
+                seed = random.getrandbits(63)
+
+            mission_data = {
+                'destination': mission.destination,
+                'mission_duration': mission.mission_duration,
+                'crew_size': mission.crew_size,
+                'spacecraft_type': mission.spacecraft_type,
+                'payload_mass': mission.payload_mass,
+                'fuel_requirements': mission.fuel_requirements
+            }
+            physics = nominal_physics(mission_data, self.nasa_service.get_mission_window(mission.destination, mission.launch_date))
+            inputs = TrialInputs.from_physics(physics)
+
+            results = simulate(inputs, trials, seed=seed, processes=self.processes)
+            summary = summarize(results, inputs)
+            result = SimulationResult(
+                mission_id=mission.id,
+                trials=trials,
+                seed=seed,
+                **self._result_columns(physics, inputs, summary)
+            )
+            db.session.add(result)
+            db.session.flush()
+
+            side_files = self._store_series(result, {
+                'trajectory': self._trajectory(mission, physics),
+                'fuel': propellant_timeline(inputs, results, points=FUEL_SAMPLES)
+            })
+            db.session.commit()
+            # Only once the row exists: a rolled-back id can be handed out again
+            self._write_side_files(result, side_files)
+
+            self.logger.info(f"Simulated {trials} trials for mission {mission.name}: "
+                             f"{summary['success_probability']:.1%} success")
+            return {'success': True, 'simulation': result}
+
+        except Exception as e:
+            db.session.rollback()
+            self.logger.error(f"Error simulating mission {mission_id}: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def load_series(self, simulation_id: int, name: str) -> Optional[series_format.SeriesView]:
+        """A stored series as a SeriesView, or None if the simulation has none.
+
+        Only the one blob column is selected; side files are memory-mapped.
+        """
+        if name not in SERIES_COLUMNS:
+            raise KeyError(name)
+
+        storage = db.session.execute(
+            select(SimulationResult.series_storage).where(SimulationResult.id == simulation_id)
+        ).scalar_one_or_none()
+        if storage == 'file':
+            path = self._series_path(simulation_id, name)
+            return series_format.open_file(path) if os.path.exists(path) else None
+        if storage == 'blob':
+            blob = db.session.execute(
+                select(SERIES_COLUMNS[name]).where(SimulationResult.id == simulation_id)
+            ).scalar_one_or_none()
+            return series_format.SeriesView(blob) if blob else None
+        return None
+
+    def _store_series(self, result: SimulationResult,
+                      series: Dict[str, Optional[Dict[str, np.ndarray]]]) -> Dict[str, bytes]:
+        """Encode the series into the row's blob columns, or return them by path for file storage"""
+        result.series_storage = self.series_storage
+        side_files = {}
+        for name, columns in series.items():
+            if columns is None:
+                continue
+            encoded = series_format.encode(columns, dtype=self.series_dtype, compress=self.series_compress)
+            if self.series_storage == 'file':
+                side_files[self._series_path(result.id, name)] = encoded
+            else:
+                setattr(result, SERIES_COLUMNS[name].key, encoded)
+        return side_files
+
+    def _write_side_files(self, result: SimulationResult, side_files: Dict[str, bytes]):
+        """Write the committed result's series files.
+
+        If any write fails, every file of the result (and any half-written
+        temporary) is removed, the result is kept without series and the
+        original error is raised.
+        """
+        try:
+            for path, encoded in side_files.items():
+                series_format.write_file(path, encoded)
+        except OSError as e:
+            self.logger.error(f"Could not write series files for simulation {result.id}: {e}")
+            for path in side_files:
+                for leftover in (path, f"{path}.tmp"):
+                    with contextlib.suppress(OSError):
+                        os.remove(leftover)
+            result.series_storage = None
+            db.session.commit()
+            raise
+
+    def _series_path(self, simulation_id: int, name: str) -> str:
+        return os.path.join(self.series_dir, f"{simulation_id}-{name}.ams")
+
+    def _trajectory(self, mission: Mission, physics: MissionPhysics) -> Optional[Dict[str, np.ndarray]]:
+        """Nominal outbound arc for the launch date; None where there is no heliocentric transfer"""
+        if physics.body.elements is None or mission.launch_date is None:
+            return None
+        try:
+            arc = transfer_trajectory(physics.body.key, mission.launch_date, physics.transit_days, TRAJECTORY_SAMPLES)
+        except ValueError:
+            return None
+        if not all(np.isfinite(values).all() for values in arc.values()):
+            self.logger.warning(f"No converged transfer arc for mission {mission.id}")
+            return None
+        return arc
+
+    def _result_columns(self, physics: MissionPhysics, inputs: TrialInputs, summary: Dict) -> Dict:
+        transit = summary['transit_days']
+        return {
+            'success_probability': summary['success_probability'],
+            'failure_modes': summary['failure_modes'],
+            'trajectory_data': {
+                'source': physics.trajectory_source,
+                'legs': physics.legs,
+                'nominal_delta_v': round(physics.required_dv, 4),
+                'delta_v_margin': summary['delta_v_margin'],
+                'transit_days': transit
+            },
+            'fuel_consumption': {
+                'propellant_loaded': round(inputs.propellant, 1),
+                'nominal_required': round(physics.fuel_needed, 1),
+                'propellant_remaining': summary['propellant_remaining']
+            },
+            'mission_timeline': self._timeline(physics, transit),
+            'radiation_exposure': summary['radiation_dose']['p50'] if summary['radiation_dose'] else 0.0,
+            'temperature_variations': self._temperature_range(physics),
+            'micrometeorite_risk': summary['failure_modes']['micrometeoroid_impact']
+        }
+
+    @staticmethod
+    def _timeline(physics: MissionPhysics, transit: Dict) -> Dict:
+        """Phase lengths in days at the 5th, 50th and 95th percentile of transit time"""
+        phases = {'outbound_transit': {key: transit[key] for key in ('p5', 'p50', 'p95')}}
+        # Longer transits leave less time on station, so the percentiles swap
+        phases['operations'] = {
+            key: round(max(physics.duration - transit[opposite] * physics.legs, 0), 1)
+            for key, opposite in (('p5', 'p95'), ('p50', 'p50'), ('p95', 'p5'))
+        }
+        if physics.legs == 2:
+            phases['return_transit'] = dict(phases['outbound_transit'])
+        return phases
+
+    @staticmethod
+    def _temperature_range(physics: MissionPhysics) -> Dict:
+        """Equilibrium temperature range between Earth and the destination's orbit, K"""
+        elements = physics.body.elements
+        if elements is None:
+            near = far = 1.0
+        else:
+            near = min(1.0, elements.semi_major_axis * (1 - elements.eccentricity))
+            far = max(1.0, elements.semi_major_axis * (1 + elements.eccentricity))
+        return {
+            'max_kelvin': round(EQUILIBRIUM_TEMPERATURE_1AU / math.sqrt(near), 1),
+            'min_kelvin': round(EQUILIBRIUM_TEMPERATURE_1AU / math.sqrt(far), 1)
+        }
@@ -0,0 +1,211 @@
+import logging
+from typing import Dict, Optional
+from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import event, func, inspect
+from models import Mission, MissionStatistics, MissionStatus, RiskLevel
+from app import db
+from utils.http_cache import Validators, make_validators
+
+SUMMARY_ROW_ID = 1
+
+def _status_column(status: Optional[MissionStatus]) -> str:
+    return f"{(status or MissionStatus.DRAFT).value}_missions"
+
+def _risk_column(risk_level: Optional[RiskLevel]) -> Optional[str]:
+    return f"{risk_level.value}_risk" if risk_level else None
+
+class StatisticsService:
+    """Dashboard statistics from one grouped query or the summary row"""
+
+    def __init__(self, use_summary: bool = False):
+        self.use_summary = use_summary
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def from_config(cls, config) -> 'StatisticsService':
+        """Build the service from the Flask app config"""
+        return cls(use_summary=config.get('STATS_SUMMARY_ENABLED', False))
+
+    def get_statistics(self) -> Dict:
+        """Get mission statistics in a single round trip"""
+        if self.use_summary:
+            summary = db.session.get(MissionStatistics, SUMMARY_ROW_ID)
+            if summary is None:
+                summary = self.rebuild_summary()
+            return self._summary_to_dict(summary)
+
+        return self._aggregate_to_dict(self._aggregate())
+
+    def validators(self) -> Validators:
+        """HTTP validators for the statistics without computing them.
+
+        The summary row's generation changes on every counted change. Without
+        the summary, the mission count and latest updated_at catch inserts,
+        updates and deletes.
+        """
+        if self.use_summary:
+            summary = db.session.get(MissionStatistics, SUMMARY_ROW_ID)
+            if summary is not None:
+                return make_validators('statistics', summary.generation, last_modified=summary.updated_at)
+
+        total, latest = db.session.query(func.count(Mission.id), func.max(Mission.updated_at)).one()
+        return make_validators('statistics', total, latest, last_modified=latest)
+
+    def _aggregate(self) -> Dict:
+        """Count missions by status and risk level with one GROUP BY query"""
+        rows = db.session.query(
+            Mission.status,
+            Mission.risk_level,
+            db.func.count(Mission.id),
+            db.func.sum(Mission.feasibility_score),
+            db.func.count(Mission.feasibility_score)
+        ).group_by(Mission.status, Mission.risk_level).all()
+
+        totals = {
+            'total_missions': 0,
+            'feasibility_sum': 0.0,
+            'feasibility_count': 0
+        }
+        for status in MissionStatus:
+            totals[_status_column(status)] = 0
+        for risk_level in RiskLevel:
+            totals[_risk_column(risk_level)] = 0
+
+        for status, risk_level, count, score_sum, score_count in rows:
+            totals['total_missions'] += count
+            totals[_status_column(status)] += count
+            if risk_level:
+                totals[_risk_column(risk_level)] += count
+            totals['feasibility_sum'] += score_sum or 0
+            totals['feasibility_count'] += score_count
+
+        return totals
+
+    def _aggregate_to_dict(self, totals: Dict) -> Dict:
+        total_missions = totals['total_missions']
+        completed_missions = totals[_status_column(MissionStatus.COMPLETED)]
+        avg_feasibility = (totals['feasibility_sum'] / totals['feasibility_count']
+                           if totals['feasibility_count'] else 0)
+
+        return {
+            'total_missions': total_missions,
+            'completed_missions': completed_missions,
+            'failed_missions': totals[_status_column(MissionStatus.FAILED)],
+            'success_rate': (completed_missions / total_missions * 100) if total_missions > 0 else 0,
+            'risk_distribution': {
+                risk_level.value: totals[_risk_column(risk_level)] for risk_level in RiskLevel
+            },
+            'average_feasibility': round(avg_feasibility, 2)
+        }
+
+    def _summary_to_dict(self, summary: MissionStatistics) -> Dict:
+        totals = {column: getattr(summary, column) for column in self._counter_columns()}
+        return self._aggregate_to_dict(totals)
+
+    @staticmethod
+    def _counter_columns():
+        columns = ['total_missions', 'feasibility_sum', 'feasibility_count']
+        columns += [_status_column(status) for status in MissionStatus]
+        columns += [_risk_column(risk_level) for risk_level in RiskLevel]
+        return columns
+
+    def rebuild_summary(self) -> MissionStatistics:
+        """Recompute the summary row from the missions table"""
+        totals = self._aggregate()
+
+        summary = db.session.get(MissionStatistics, SUMMARY_ROW_ID)
+        if summary is None:
+            summary = MissionStatistics(id=SUMMARY_ROW_ID, generation=0)
+            db.session.add(summary)
+
+        for column, value in totals.items():
+            setattr(summary, column, value)
+        summary.generation = (summary.generation or 0) + 1
+        summary.updated_at = datetime.utcnow()
+
+        db.session.commit()
+        self.logger.info("Rebuilt mission statistics summary")
+        return summary
+
+def _history(state, attribute):
+    """Return (old, new) values of an attribute for a pending mission"""
+    history = state.attrs[attribute].history
+    old = history.deleted[0] if history.deleted else (history.unchanged[0] if history.unchanged else None)
+    new = history.added[0] if history.added else old
+    return old, new
+
+def _collect_deltas(session) -> Dict:
+    deltas = {}
+
+    def bump(column, amount):
+        if column:
+            deltas[column] = deltas.get(column, 0) + amount
+
+    def apply(status, risk_level, score, sign):
+        bump('total_missions', sign)
+        bump(_status_column(status), sign)
+        bump(_risk_column(risk_level), sign)
+        if score is not None:
+            bump('feasibility_sum', sign * score)
+            bump('feasibility_count', sign)
+
+    for obj in session.new:
+        if isinstance(obj, Mission):
+            apply(obj.status, obj.risk_level, obj.feasibility_score, 1)
+
+    for obj in session.deleted:
+        if isinstance(obj, Mission):
+            state = inspect(obj)
+            old_status, _ = _history(state, 'status')
+            old_risk, _ = _history(state, 'risk_level')
+            old_score, _ = _history(state, 'feasibility_score')
+            apply(old_status, old_risk, old_score, -1)
+
+    for obj in session.dirty:
+        if not isinstance(obj, Mission) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        old_status, new_status = _history(state, 'status')
+        old_risk, new_risk = _history(state, 'risk_level')
+        old_score, new_score = _history(state, 'feasibility_score')
+        if (old_status, old_risk, old_score) == (new_status, new_risk, new_score):
+            continue
+        apply(old_status, old_risk, old_score, -1)
+        apply(new_status, new_risk, new_score, 1)
+
+    return {column: amount for column, amount in deltas.items() if amount}
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    return value
+
+# Load the old value before an assignment so flush-time history always has it,
+# even when the attribute was expired by an earlier commit
+for _attribute in (Mission.status, Mission.risk_level, Mission.feasibility_score):
+    event.listen(_attribute, 'set', _load_previous_value, active_history=True, retval=True)
+
+@event.listens_for(db.session, 'after_flush')
+def _maintain_summary(session, flush_context):
+    """Apply mission count deltas to the summary row in the same transaction"""
+    if not has_app_context() or not current_app.config.get('STATS_SUMMARY_ENABLED', False):
+        return
+
+    deltas = _collect_deltas(session)
+    if deltas:
+        _apply_deltas(session, deltas)
+
+def record_bulk_insert(session, count: int):
+    """Count draft missions added by a bulk INSERT, which bypasses the flush hook"""
+    if not count or not has_app_context() or not current_app.config.get('STATS_SUMMARY_ENABLED', False):
+        return
+    _apply_deltas(session, {'total_missions': count, _status_column(MissionStatus.DRAFT): count})
+
+def _apply_deltas(session, deltas: Dict):
+    table = MissionStatistics.__table__
+    values = {column: table.c[column] + amount for column, amount in deltas.items()}
+    values['generation'] = table.c.generation + 1
+    values['updated_at'] = datetime.utcnow()
+
+    session.connection().execute(
+        table.update().where(table.c.id == SUMMARY_ROW_ID).values(**values)
+    )
@@ -10,8 +10,11 @@ document.addEventListener('DOMContentLoaded', function() {
     initializeTheme();
     initializeNotifications();
     
-    // Set up auto-refresh for analyzing missions
-    checkForAnalyzingMissions();
+    // Follow status changes of the missions on the page
+    initializeMissionWatch();
+    
+    // Stream in report sections that are still being generated
+    initializeReportStream();
 });
 
 // Initialize Bootstrap tooltips
@@ -89,16 +92,89 @@ function initializeNotifications() {
     });
 }
 
-// Check for analyzing missions and auto-refresh
-function checkForAnalyzingMissions() {
-    const analyzingElements = document.querySelectorAll('[data-status="analyzing"]');
+// Keep mission status on the page current from the server's event stream.
+// Elements marked data-watch-mission="<id>" get their data-status and the
+// [data-mission-status], [data-mission-score] and [data-mission-risk] inside
+// them updated; data-reload-on-change reloads the page instead once the
+// status differs from the one it was rendered with.
+function initializeMissionWatch() {
+    const elements = document.querySelectorAll('[data-watch-mission]');
+    const missionIds = [...new Set(Array.from(elements, el => el.dataset.watchMission))];
     
-    if (analyzingElements.length > 0) {
-        // Refresh page every 10 seconds if there are analyzing missions
-        setTimeout(() => {
-            location.reload();
-        }, 10000);
+    if (missionIds.length === 0) {
+        return;
+    }
+    
+    // The server accepts at most 100 missions per stream
+    ApiUtils.watchMissions(missionIds.slice(0, 100), {
+        onStatus: function(event) {
+            document.querySelectorAll(`[data-watch-mission="${event.mission_id}"]`).forEach(element => {
+                if (element.dataset.status === event.status) {
+                    return;
+                }
+                if ('reloadOnChange' in element.dataset) {
+                    location.reload();
+                    return;
+                }
+                updateMissionElement(element, event);
+            });
+        }
+    });
+}
+
+function updateMissionElement(element, event) {
+    const capitalize = value => value.charAt(0).toUpperCase() + value.slice(1);
+    element.dataset.status = event.status;
+    
+    element.querySelectorAll('[data-mission-status]').forEach(badge => {
+        badge.className = badge.className.replace(/\bbg-\w+/, `bg-${AstroUtils.getStatusColor(event.status)}`);
+        badge.textContent = capitalize(event.status);
+    });
+    
+    element.querySelectorAll('[data-mission-score]').forEach(cell => {
+        if (!event.feasibility_score) {
+            cell.innerHTML = '<span class="text-muted">Not assessed</span>';
+            return;
+        }
+        const score = `${event.feasibility_score.toFixed(1)}%`;
+        cell.innerHTML = `<div class="progress" style="height: 20px; width: 80px;">
+            <div class="progress-bar" role="progressbar" style="width: ${score}">${score}</div></div>`;
+    });
+    
+    element.querySelectorAll('[data-mission-risk]').forEach(cell => {
+        if (!event.risk_level) {
+            cell.innerHTML = '<span class="text-muted">Not assessed</span>';
+            return;
+        }
+        element.dataset.risk = event.risk_level;
+        cell.innerHTML = `<span class="badge bg-${AstroUtils.getRiskColor(event.risk_level)}">${capitalize(event.risk_level)}</span>`;
+    });
+}
+
+// Fill report sections from the SSE stream as the server generates them
+function initializeReportStream() {
+    const container = document.querySelector('[data-report-stream]');
+    
+    if (!container) {
+        return;
     }
+    
+    ApiUtils.streamReport(container.dataset.reportStream, {
+        onSection: function(name, content) {
+            const target = container.querySelector(`[data-report-section="${name}"]`);
+            if (target) {
+                target.textContent = typeof content === 'string' ? content : JSON.stringify(content, null, 2);
+                target.classList.remove('placeholder-glow');
+            }
+        },
+        onDone: function() {
+            container.removeAttribute('data-report-stream');
+            container.querySelectorAll('[data-report-loading]').forEach(el => el.remove());
+        },
+        onError: function(message) {
+            AstroUtils.showToast(`Report generation failed: ${message}`, 'danger');
+        }
+    });
 }
 
 // Utility Functions
@@ -359,9 +435,72 @@ const ApiUtils = {
         return await this.request(`/mission/api/status/${missionId}`);
     },
     
+    // Follow mission status changes pushed by the server instead of polling.
+    // onStatus receives {mission_id, status, previous_status, feasibility_score,
+    // risk_level, analyzed_at}, first with each mission's current state and then
+    // on every change. The browser reconnects by itself when a stream ends;
+    // each new stream starts with a fresh snapshot. Returns a function that stops watching.
+    watchMissions: function(missionIds, handlers = {}) {
+        if (!window.EventSource) {
+            return this.pollMissions(missionIds, handlers);
+        }
+
+        const source = new EventSource(`/mission/api/events?missions=${missionIds.join(',')}`);
+
+        source.addEventListener('status', function(event) {
+            if (handlers.onStatus) handlers.onStatus(JSON.parse(event.data));
+        });
+
+        source.addEventListener('error', function() {
+            if (handlers.onError) handlers.onError('Connection lost, reconnecting');
+        });
+
+        return function() { source.close(); };
+    },
+
+    // Fallback for browsers without EventSource
+    pollMissions: function(missionIds, handlers = {}, interval = 5000) {
+        const timer = setInterval(async () => {
+            for (const missionId of missionIds) {
+                try {
+                    const status = await this.getMissionStatus(missionId);
+                    if (handlers.onStatus) handlers.onStatus(status);
+                } catch (error) {
+                    if (handlers.onError) handlers.onError(error.message);
+                }
+            }
+        }, interval);
+
+        return function() { clearInterval(timer); };
+    },
+
     // Get statistics
     getStatistics: async function() {
         return await this.request('/mission/api/statistics');
+    },
+    
+    // Subscribe to a streamed mission report (section, done and error events)
+    streamReport: function(url, handlers = {}) {
+        const source = new EventSource(url);
+        
+        source.addEventListener('section', function(event) {
+            const data = JSON.parse(event.data);
+            if (handlers.onSection) handlers.onSection(data.name, data.content);
+        });
+        
+        source.addEventListener('done', function(event) {
+            source.close();
+            if (handlers.onDone) handlers.onDone(JSON.parse(event.data));
+        });
+        
+        source.addEventListener('error', function(event) {
+            // Server-sent error events carry data; connection errors do not
+            source.close();
+            const message = event.data ? JSON.parse(event.data).error : 'Connection lost';
+            if (handlers.onError) handlers.onError(message);
+        });
+        
+        return source;
     }
 };
 
@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+# Importing app (via models) needs a database; tests that touch services get a throwaway one
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+os.environ.setdefault('SESSION_SECRET', 'test')
+os.environ.setdefault('OPENAI_API_KEY', 'test')
+
+class FakeOpenAIServer:
+    """Local stand-in for the chat completions endpoint.
+
+    Each request takes the next scripted (status, delay, headers) reply,
+    or a prompt 200 once the script is empty. Requests with stream=true
+    get their content back as server-sent chunks. Every request is logged
+    with its arrival time.
+    """
+
+    def __init__(self):
+        self.script = []
+        self.requests = []
+        self.content = json.dumps({'feasibility_score': 80, 'risk_level': 'low'})
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    def reply(self, status: int = 200, delay: float = 0.0, headers=None, times: int = 1):
+        """Queue the next reply(ies)"""
+        self.script.extend([(status, delay, headers or {})] * times)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_reply(self, body):
+        with self._lock:
+            self.requests.append((time.monotonic(), body))
+            return self.script.pop(0) if self.script else (200, 0.0, {})
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                status, delay, headers = server._next_reply(body)
+                time.sleep(delay)
+                try:
+                    if status == 200 and body.get('stream'):
+                        self._stream(body, headers)
+                    elif status == 200:
+                        self._send(status, headers, server._completion(body))
+                    else:
+                        self._send(status, headers, {'error': {'message': f'fake {status}', 'type': 'fake'}})
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _send(self, status, headers, payload):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, body, headers):
+                self.send_response(200)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.end_headers()
+                content = server.content
+                pieces = [content[i:i + 8] for i in range(0, len(content), 8)]
+                for index, piece in enumerate(pieces):
+                    chunk = server._chunk(body, piece, 'stop' if index == len(pieces) - 1 else None)
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+                self.wfile.write(b"data: [DONE]\n\n")
+
+        return Handler
+
+    def _completion(self, body):
+        return {
+            'id': 'chatcmpl-fake', 'object': 'chat.completion', 'created': 0, 'model': body['model'],
+            'choices': [{'index': 0, 'finish_reason': 'stop',
+                         'message': {'role': 'assistant', 'content': self.content}}],
+            'usage': {'prompt_tokens': 100, 'completion_tokens': 50, 'total_tokens': 150}
+        }
+
+    @staticmethod
+    def _chunk(body, piece, finish_reason):
+        return {
+            'id': 'chatcmpl-fake', 'object': 'chat.completion.chunk', 'created': 0, 'model': body['model'],
+            'choices': [{'index': 0, 'delta': {'content': piece}, 'finish_reason': finish_reason}]
+        }
+
+@pytest.fixture
+def fake_openai():
+    server = FakeOpenAIServer().start()
+    yield server
+    server.stop()
@@ -0,0 +1,99 @@
+import json
+from types import SimpleNamespace
+import pytest
+import app  # noqa: F401  (services import models, which need the app set up first)
+from services.ai_service import AIService
+from services.analysis_cache import CACHE_KEY_FIELDS
+
+MISSION = {
+    'name': 'Ares One', 'destination': 'mars', 'launch_date': '2031-07-01', 'mission_duration': 900,
+    'crew_size': 4, 'spacecraft_type': 'orion', 'payload_mass': 20000, 'fuel_requirements': 50000
+}
+NASA = {'destination': 'mars', 'data_source': 'computed', 'retrieved_at': '2030-01-01T00:00:00'}
+
+class StubClient:
+    """Answers single-mission and batched feasibility requests, recording which kind it got"""
+
+    def __init__(self):
+        self.calls = []
+
+    def create_chat_completion(self, **kwargs):
+        content = kwargs['messages'][-1]['content']
+        if content.lstrip().startswith('{'):
+            missions = json.loads(content)['missions']
+            self.calls.append('batch')
+            reply = {'analyses': [{'id': mission['id'], 'feasibility_score': 60, 'risk_level': 'medium',
+                                   'summary': 'batched'} for mission in missions]}
+        else:
+            self.calls.append('single')
+            reply = {'feasibility_score': 80, 'risk_level': 'low', 'summary': 'single'}
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=json.dumps(reply)), finish_reason='stop')],
+            usage=None
+        )
+
+class DictCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        return dict(entry) if entry is not None else None
+
+    def set(self, key, model, payload):
+        self.entries[key] = dict(payload)
+
+    def bypass(self):
+        pass
+
+@pytest.fixture
+def client():
+    return StubClient()
+
+@pytest.fixture
+def service(client):
+    return AIService(client=client, cache=DictCache(), batch_size=8)
+
+def _second(mission):
+    return dict(mission, destination='moon')
+
+def test_batch_results_are_not_served_to_single_requests(service, client):
+    items = [(MISSION, NASA), (_second(MISSION), NASA)]
+
+    batched = service.analyze_missions_feasibility(items)
+    single = service.analyze_mission_feasibility(MISSION, NASA)
+
+    assert [result['summary'] for result in batched] == ['batched', 'batched']
+    assert client.calls == ['batch', 'single']
+    assert single['summary'] == 'single'
+    assert 'cache_hit' not in single
+
+def test_batches_reuse_cached_batch_and_single_results(service, client):
+    items = [(MISSION, NASA), (_second(MISSION), NASA)]
+    service.analyze_mission_feasibility(MISSION, NASA)
+
+    first = service.analyze_missions_feasibility(items)
+    again = service.analyze_missions_feasibility(items)
+
+    # Mission one reused its single answer, so only mission two was asked for (alone)
+    assert client.calls == ['single', 'single']
+    assert [result['summary'] for result in first] == ['single', 'single']
+    assert all(result.get('cache_hit') for result in again)
+
+def test_single_requests_hit_their_own_cache(service, client):
+    service.analyze_mission_feasibility(MISSION, NASA)
+    cached = service.analyze_mission_feasibility(dict(MISSION, name='Ares Two'), NASA)
+
+    assert client.calls == ['single']
+    assert cached['cache_hit'] is True
+
+def test_prompt_sends_exactly_the_cache_key_fields(service):
+    prompt = service._build_feasibility_prompt(MISSION, NASA)
+    batch = service._build_batch_messages([(MISSION, NASA)])[1]['content']
+
+    assert MISSION['name'] not in prompt
+    assert MISSION['name'] not in batch
+    for field in CACHE_KEY_FIELDS:
+        changed = dict(MISSION, **{field: 'changed-value'})
+        assert service._build_feasibility_prompt(changed, NASA) != prompt, field
+        assert service._build_batch_messages([(changed, NASA)])[1]['content'] != batch, field
@@ -0,0 +1,134 @@
+import os
+import numpy as np
+import pytest
+from datetime import date
+from services.data_providers import HorizonsDataProvider, PlanetaryDataProvider
+from services.ephemeris import EphemerisSeries, EphemerisStore, parse_horizons_vectors
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# First record of both fixtures (Mars from Earth, 2030-Jan-01 TDB)
+FIRST_EPOCH = 2462502.5
+FIRST_POSITION = [-1.425592616318327e+08, 4.146985373049672e+07, 1.797680095934004e+07]
+FIRST_VELOCITY = [1.206164580436530e+01, -2.633412938542367e+01, -1.149869519853028e+01]
+
+def _fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES, name)) as f:
+        return f.read()
+
+@pytest.fixture
+def text_result():
+    return _fixture('horizons_mars_vectors.txt')
+
+@pytest.fixture
+def csv_result():
+    return _fixture('horizons_mars_vectors.csv')
+
+def test_parses_text_layout(text_result):
+    series = parse_horizons_vectors(text_result)
+
+    assert len(series) == 4
+    assert series.position.shape == (4, 3)
+    assert series.velocity.shape == (4, 3)
+    np.testing.assert_array_equal(series.epoch, FIRST_EPOCH + np.arange(4))
+    np.testing.assert_allclose(series.position[0], FIRST_POSITION, rtol=1e-15)
+    np.testing.assert_allclose(series.velocity[0], FIRST_VELOCITY, rtol=1e-15)
+
+def test_parses_csv_layout(csv_result):
+    series = parse_horizons_vectors(csv_result)
+
+    assert len(series) == 4
+    np.testing.assert_array_equal(series.epoch, FIRST_EPOCH + np.arange(4))
+    np.testing.assert_allclose(series.position[0], FIRST_POSITION, rtol=1e-15)
+    np.testing.assert_allclose(series.velocity[0], FIRST_VELOCITY, rtol=1e-15)
+
+def test_text_and_csv_layouts_agree(text_result, csv_result):
+    text = parse_horizons_vectors(text_result)
+    csv = parse_horizons_vectors(csv_result)
+
+    np.testing.assert_array_equal(text.epoch, csv.epoch)
+    np.testing.assert_array_equal(text.position, csv.position)
+    np.testing.assert_array_equal(text.velocity, csv.velocity)
+
+def test_derived_distance_and_speed(csv_result):
+    series = parse_horizons_vectors(csv_result)
+
+    np.testing.assert_allclose(series.distance, np.linalg.norm(series.position, axis=1))
+    np.testing.assert_allclose(series.speed, np.linalg.norm(series.velocity, axis=1))
+    summary = series.summary()
+    assert summary['samples'] == 4
+    assert summary['start_epoch'] == FIRST_EPOCH
+    assert summary['distance_min'] <= summary['distance_mean'] <= summary['distance_max']
+
+def test_empty_block_gives_empty_series():
+    series = parse_horizons_vectors('header\n$$SOE\n$$EOE\n')
+
+    assert len(series) == 0
+    assert series.summary() == {}
+
+def test_missing_block_is_rejected():
+    with pytest.raises(ValueError, match='SOE'):
+        parse_horizons_vectors('No ephemeris for target "Vulcan"')
+
+def test_text_block_of_another_table_is_rejected(text_result):
+    # VEC_TABLE=1 prints positions only: 4 values per record
+    positions_only = '\n'.join(line for line in text_result.splitlines() if not line.startswith(' VX='))
+
+    with pytest.raises(ValueError, match='VEC_TABLE=2'):
+        parse_horizons_vectors(positions_only)
+
+def test_store_round_trip(tmp_path, csv_result):
+    store = EphemerisStore(str(tmp_path))
+    series = parse_horizons_vectors(csv_result)
+
+    assert store.get('mars', '2030-01-01', '2030-01-04', '1 d') is None
+    store.put('mars', '2030-01-01', '2030-01-04', '1 d', series)
+    loaded = store.get('mars', '2030-01-01', '2030-01-04', '1 d')
+
+    assert isinstance(loaded, EphemerisSeries)
+    np.testing.assert_array_equal(loaded.position, series.position)
+
+class _FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+class _FakeSession:
+    def __init__(self, result):
+        self.result = result
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None):
+        self.requests.append(params)
+        return _FakeResponse({'result': self.result})
+
+def test_provider_requests_vector_table_2(csv_result):
+    session = _FakeSession(csv_result)
+    provider = HorizonsDataProvider(session=session)
+
+    data = provider.get_orbital_data('mars', date(2030, 1, 1))
+
+    params = session.requests[0]
+    assert params['EPHEM_TYPE'] == 'VECTORS'
+    assert params['VEC_TABLE'] == '2'
+    assert params['CSV_FORMAT'] == 'YES'
+    assert data['distance_from_earth'] == pytest.approx(np.linalg.norm(FIRST_POSITION))
+    assert data['velocity_magnitude'] == pytest.approx(np.linalg.norm(FIRST_VELOCITY))
+
+    # Served from the provider's cache the second time
+    provider.get_orbital_data('mars', date(2030, 1, 1))
+    assert len(session.requests) == 1
+
+def test_providers_must_implement_get_orbital_data():
+    class Incomplete(PlanetaryDataProvider):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        PlanetaryDataProvider()
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,57 @@
+from datetime import date
+import pytest
+import app as application
+from app import db
+from models import AnalysisJob, JobStatus, Mission, MissionStatus
+from services.job_queue import JobQueue
+
+@pytest.fixture
+def missions():
+    with application.app.app_context():
+        created = [Mission(name=f'Mission {index}', destination='mars', launch_date=date(2031, 7, 1),
+                           mission_duration=900, crew_size=4, spacecraft_type='orion',
+                           payload_mass=20000, fuel_requirements=50000, status=MissionStatus.DRAFT)
+                   for index in range(8)]
+        db.session.add_all(created)
+        db.session.commit()
+        yield [mission.id for mission in created]
+        db.session.rollback()
+        AnalysisJob.query.delete()
+        Mission.query.delete()
+        db.session.commit()
+
+def _running():
+    return AnalysisJob.query.filter_by(status=JobStatus.RUNNING).count()
+
+def test_batch_claim_stays_within_max_concurrency(missions):
+    queue = JobQueue(max_concurrency=3, batch_claim_size=10)
+    queue.enqueue(missions[0])
+    assert queue.claim('other-worker') is not None  # a job of someone else's already running
+    queue.enqueue_batch(missions[1:])
+
+    leader = queue.claim('worker')
+    jobs = queue.claim_batch('worker', leader)
+
+    assert len(jobs) == 2
+    assert _running() == 3
+    assert queue.claim('third-worker') is None
+
+def test_batch_claim_at_the_cap_keeps_only_the_claimed_job(missions):
+    queue = JobQueue(max_concurrency=1, batch_claim_size=10)
+    queue.enqueue_batch(missions)
+
+    leader = queue.claim('worker')
+    jobs = queue.claim_batch('worker', leader)
+
+    assert [job.id for job in jobs] == [leader.id]
+    assert _running() == 1
+
+def test_batch_claim_without_cap_takes_claim_size(missions):
+    queue = JobQueue(batch_claim_size=5)
+    queue.enqueue_batch(missions)
+
+    leader = queue.claim('worker')
+    jobs = queue.claim_batch('worker', leader)
+
+    assert len(jobs) == 5
+    assert all(job.locked_by == 'worker' for job in jobs)
@@ -0,0 +1,135 @@
+import json
+import time
+import socket
+from types import SimpleNamespace
+from datetime import datetime
+import pytest
+from sqlalchemy import create_engine
+import app  # noqa: F401  (services import models, which need the app set up first)
+from app import db
+from models import Mission, MissionStatus
+from services.mission_events import CHANNEL, RESYNC, MissionEventBus
+
+missions = Mission.__table__
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'events.db'}")
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(missions.insert(), [
+            {'id': mission_id, 'name': f'Mission {mission_id}', 'destination': 'mars',
+             'launch_date': datetime(2031, 7, 1).date(), 'mission_duration': 900, 'crew_size': 4,
+             'spacecraft_type': 'orion', 'payload_mass': 20000, 'fuel_requirements': 50000,
+             'status': MissionStatus.DRAFT, 'created_at': datetime.utcnow(), 'updated_at': datetime.utcnow()}
+            for mission_id in (1, 2)
+        ])
+    yield engine
+    engine.dispose()
+
+def _set_status(engine, mission_id, status):
+    # Another process's commit: it never passes through this bus
+    with engine.begin() as connection:
+        connection.execute(missions.update().where(missions.c.id == mission_id)
+                           .values(status=status, updated_at=datetime.utcnow()))
+
+def _wait_for_polls(bus, count):
+    target = bus.get_stats()['polls'] + count
+    deadline = time.monotonic() + 5
+    while bus.get_stats()['polls'] < target and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+def test_poller_publishes_changes_committed_elsewhere(engine):
+    bus = MissionEventBus()
+    subscription = bus.subscribe([1])
+    bus.ensure_poller(engine, interval=0.05)
+    _wait_for_polls(bus, 1)
+
+    _set_status(engine, 1, MissionStatus.ANALYZING)
+    _set_status(engine, 2, MissionStatus.ANALYZING)
+
+    event = subscription.get(timeout=5)
+    assert event['mission_id'] == 1
+    assert event['status'] == 'analyzing'
+    assert event['previous_status'] == 'draft'
+    _wait_for_polls(bus, 2)
+    assert subscription.get(timeout=0.1) is None
+    assert bus.get_stats()['polling']
+
+def test_poller_skips_changes_already_published_here(engine):
+    bus = MissionEventBus()
+    subscription = bus.subscribe()
+    # Long enough that the commit and its in-process publish fall between two polls
+    bus.ensure_poller(engine, interval=0.3)
+    _wait_for_polls(bus, 1)
+
+    _set_status(engine, 1, MissionStatus.COMPLETED)
+    bus.publish({'mission_id': 1, 'status': 'completed', 'feasibility_score': None, 'risk_level': None})
+    _wait_for_polls(bus, 2)
+
+    assert subscription.get(timeout=0.1)['status'] == 'completed'
+    assert subscription.get(timeout=0.1) is None
+
+class FakeNotifyConnection:
+    """psycopg2-like connection: readable when a NOTIFY arrives, poll() moves it to notifies"""
+
+    def __init__(self):
+        self.autocommit = False
+        self.notifies = []
+        self.executed = []
+        self._buffer = b''
+        self._readable, self._writer = socket.socketpair()
+
+    def fileno(self):
+        return self._readable.fileno()
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, statement):
+                connection.executed.append(statement)
+        return Cursor()
+
+    def notify(self, payload):
+        self._writer.sendall(payload.encode('utf-8') + b'\n')
+
+    def poll(self):
+        self._buffer += self._readable.recv(65536)
+        *lines, self._buffer = self._buffer.split(b'\n')
+        self.notifies.extend(SimpleNamespace(channel=CHANNEL, payload=line.decode('utf-8')) for line in lines)
+
+class FakeNotifyEngine:
+    def __init__(self, dbapi_connection):
+        self.dbapi_connection = dbapi_connection
+        self.connections = 0
+
+    def raw_connection(self):
+        self.connections += 1
+        return SimpleNamespace(dbapi_connection=self.dbapi_connection, detach=lambda: None, close=lambda: None)
+
+def test_listener_relays_notifications():
+    dbapi_connection = FakeNotifyConnection()
+    bus = MissionEventBus()
+    bus.ensure_listener(FakeNotifyEngine(dbapi_connection))
+    deadline = time.monotonic() + 5
+    while not bus.get_stats()['listening'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    subscription = bus.subscribe([1])
+
+    dbapi_connection.notify(json.dumps({'mission_id': 2, 'status': 'analyzing'}))
+    dbapi_connection.notify('not json')
+    dbapi_connection.notify(json.dumps({'mission_id': 1, 'status': 'completed'}))
+
+    event = subscription.get(timeout=5)
+    assert event is not RESYNC and event['status'] == 'completed'
+    assert dbapi_connection.executed == [f'LISTEN {CHANNEL}']
+    assert dbapi_connection.autocommit
+    stats = bus.get_stats()
+    assert stats['listening'] and stats['listener_reconnects'] == 0
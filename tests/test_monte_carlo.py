@@ -0,0 +1,39 @@
+from services.feasibility_scorer import MIN_STAY_DAYS, nominal_physics, score_mission
+from services.monte_carlo import TrialInputs, simulate, summarize
+
+MARS = {
+    'destination': 'mars', 'mission_duration': 900, 'crew_size': 4, 'spacecraft_type': 'orion',
+    'payload_mass': 20000, 'fuel_requirements': 50000
+}
+
+def _too_short_rate(mission_data, trials=20000):
+    inputs = TrialInputs.from_physics(nominal_physics(mission_data))
+    summary = summarize(simulate(inputs, trials, seed=1), inputs)
+    return summary['failure_modes']['mission_too_short']
+
+def _transit_days():
+    return nominal_physics(MARS).transit_days
+
+def test_crewed_mission_covering_only_the_outbound_leg_is_too_short():
+    # Long enough to arrive, nowhere near long enough to come back
+    duration = _transit_days() * 1.5
+
+    assert _too_short_rate(dict(MARS, mission_duration=duration)) == 1.0
+
+def test_crewed_round_trip_needs_the_minimum_stay():
+    round_trip = _transit_days() * 2
+
+    assert _too_short_rate(dict(MARS, mission_duration=round_trip * 1.3)) == 0.0
+    assert _too_short_rate(dict(MARS, mission_duration=round_trip + MIN_STAY_DAYS / 2)) > 0.3
+
+def test_uncrewed_mission_only_has_to_arrive():
+    probe = dict(MARS, crew_size=0, payload_mass=1000, fuel_requirements=5000)
+    duration = _transit_days() * 1.5
+
+    assert _too_short_rate(dict(probe, mission_duration=duration)) == 0.0
+    assert _too_short_rate(dict(probe, mission_duration=_transit_days() * 0.7)) == 1.0
+
+def test_scorer_flags_a_crewed_mission_without_time_to_return():
+    scored = score_mission(dict(MARS, mission_duration=_transit_days() * 2 + MIN_STAY_DAYS / 2))
+
+    assert 'Duration too short for a crewed return leg' in scored['risk_assessment']['primary_risks']
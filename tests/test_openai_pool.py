@@ -0,0 +1,206 @@
+import gc
+import time
+import concurrent.futures
+import openai
+import pytest
+from services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from services.openai_pool import DeadlineExceededError, OpenAIClientPool, TokenBucket
+
+REQUEST = {'model': 'gpt-4o', 'messages': [{'role': 'user', 'content': 'hi'}], 'max_tokens': 100}
+
+@pytest.fixture
+def make_pool(fake_openai):
+    def make(**overrides):
+        options = dict(api_key='test', base_url=fake_openai.url, backoff_base=0.05, backoff_max=0.2,
+                       timeout=2.0, deadline=5.0)
+        options.update(overrides)
+        return OpenAIClientPool(**options)
+    return make
+
+# TokenBucket
+
+def test_bucket_spends_capacity_then_refuses_past_deadline():
+    bucket = TokenBucket(per_minute=60)  # capacity 60, one token per second
+
+    assert bucket.acquire(60, time.monotonic())
+    assert not bucket.acquire(5, time.monotonic() + 1)
+
+def test_bucket_waits_for_refill_within_deadline():
+    bucket = TokenBucket(per_minute=600, capacity=1)  # ten tokens per second
+
+    assert bucket.acquire(1, time.monotonic())
+    started = time.monotonic()
+    assert bucket.acquire(1, started + 1)
+    assert 0.05 <= time.monotonic() - started < 0.5
+
+def test_bucket_debt_is_repaid_before_new_grants():
+    bucket = TokenBucket(per_minute=60)
+    bucket.acquire(60, time.monotonic())
+
+    bucket.adjust(-30)  # actual usage exceeded the estimate
+
+    assert bucket.available < -29
+    assert not bucket.acquire(1, time.monotonic() + 10)
+
+def test_bucket_without_limit_always_grants():
+    bucket = TokenBucket(per_minute=0)
+
+    assert all(bucket.acquire(10 ** 6, time.monotonic()) for _ in range(3))
+
+# CircuitBreaker
+
+def test_breaker_opens_after_threshold_and_half_opens_after_timeout():
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=0.1)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.15)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # one trial call at a time
+
+def test_breaker_trial_outcome_decides_state():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=0.05)
+
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_breaker_call_raises_when_open():
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=60)
+    with pytest.raises(ZeroDivisionError):
+        breaker.call(lambda: 1 / 0)
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'never called')
+
+# OpenAIClientPool against the fake server
+
+def test_retries_rate_limit_and_server_errors(fake_openai, make_pool):
+    pool = make_pool()
+    fake_openai.reply(429)
+    fake_openai.reply(500)
+
+    response = pool.create_chat_completion(**REQUEST)
+
+    assert response.choices[0].finish_reason == 'stop'
+    stats = pool.get_stats()
+    assert stats['attempts'] == 3
+    assert stats['retries'] == 2
+    assert stats['rate_limited'] == 1
+    assert stats['upstream_errors'] == 1
+    assert stats['in_flight'] == 0
+
+def test_honours_retry_after(fake_openai, make_pool):
+    pool = make_pool()
+    fake_openai.reply(429, headers={'Retry-After': '0.4'})
+
+    pool.create_chat_completion(**REQUEST)
+
+    (first, _), (second, _) = fake_openai.requests
+    assert second - first >= 0.4
+
+def test_client_errors_are_not_retried(fake_openai, make_pool):
+    pool = make_pool()
+    fake_openai.reply(400)
+
+    with pytest.raises(openai.BadRequestError):
+        pool.create_chat_completion(**REQUEST)
+
+    assert pool.get_stats()['attempts'] == 1
+    assert pool.breaker.state == CircuitBreaker.CLOSED
+
+def test_breaker_opens_then_fails_fast_then_recovers(fake_openai, make_pool):
+    pool = make_pool(max_retries=0, breaker=CircuitBreaker('openai', failure_threshold=3, reset_timeout=0.3))
+    fake_openai.reply(503, times=3)
+
+    for _ in range(3):
+        with pytest.raises(openai.InternalServerError):
+            pool.create_chat_completion(**REQUEST)
+    assert pool.breaker.state == CircuitBreaker.OPEN
+
+    started = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        pool.create_chat_completion(**REQUEST)
+    assert time.monotonic() - started < 0.05
+    assert len(fake_openai.requests) == 3
+
+    time.sleep(0.35)
+    pool.create_chat_completion(**REQUEST)
+    assert pool.breaker.state == CircuitBreaker.CLOSED
+
+def test_deadline_bounds_slow_upstream(fake_openai, make_pool):
+    pool = make_pool(timeout=0.3, deadline=1.0, max_retries=10)
+    fake_openai.reply(200, delay=2.0, times=10)
+
+    started = time.monotonic()
+    with pytest.raises((openai.APITimeoutError, DeadlineExceededError)):
+        pool.create_chat_completion(**REQUEST)
+
+    assert time.monotonic() - started < 1.5
+    assert pool.get_stats()['in_flight'] == 0
+
+def test_request_budget_past_deadline_is_refused(fake_openai, make_pool):
+    pool = make_pool(requests_per_minute=2)
+
+    pool.create_chat_completion(**REQUEST)
+    pool.create_chat_completion(**REQUEST)
+    with pytest.raises(DeadlineExceededError):
+        pool.create_chat_completion(deadline=0.5, **REQUEST)
+
+    assert len(fake_openai.requests) == 2
+    assert pool.get_stats()['deadline_exceeded'] == 1
+
+def test_concurrency_is_capped(fake_openai, make_pool):
+    pool = make_pool(max_concurrency=2)
+    fake_openai.reply(200, delay=0.3, times=4)
+
+    started = time.monotonic()
+    with concurrent.futures.ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda _: pool.create_chat_completion(**REQUEST), range(4)))
+
+    assert time.monotonic() - started >= 0.6
+    assert pool.get_stats()['in_flight'] == 0
+
+# Streaming holds a slot until the stream is done with
+
+def test_stream_releases_slot_when_exhausted(fake_openai, make_pool):
+    pool = make_pool(max_concurrency=1)
+
+    stream = pool.create_chat_completion(stream=True, **REQUEST)
+    assert pool.get_stats()['in_flight'] == 1
+    content = ''.join(chunk.choices[0].delta.content or '' for chunk in stream)
+
+    assert content == fake_openai.content
+    assert pool.get_stats()['in_flight'] == 0
+
+def test_stream_releases_slot_when_closed_unread(fake_openai, make_pool):
+    pool = make_pool(max_concurrency=1, deadline=1.0)
+
+    pool.create_chat_completion(stream=True, **REQUEST).close()
+    with pool.create_chat_completion(stream=True, **REQUEST) as stream:
+        next(stream)
+
+    assert pool.get_stats()['in_flight'] == 0
+
+def test_stream_never_iterated_releases_slot_when_collected(fake_openai, make_pool):
+    pool = make_pool(max_concurrency=1, deadline=1.0)
+
+    stream = pool.create_chat_completion(stream=True, **REQUEST)
+    del stream
+    gc.collect()
+
+    # Would wait out the deadline for the slot if the abandoned stream still held it
+    pool.create_chat_completion(**REQUEST)
+    assert pool.get_stats()['in_flight'] == 0
@@ -0,0 +1,60 @@
+import time
+import threading
+import concurrent.futures
+import pytest
+from services import pipeline
+from services.pipeline import Pipeline, Stage, StageError
+
+@pytest.fixture(autouse=True)
+def fresh_executor(monkeypatch):
+    monkeypatch.setattr(pipeline, '_executor', None)
+    yield
+    if pipeline._executor is not None:
+        pipeline._executor.shutdown(wait=True)
+
+def test_concurrent_first_runs_share_one_pool(monkeypatch):
+    created = []
+    original = pipeline.ThreadPoolExecutor
+
+    def slow_pool(*args, **kwargs):
+        time.sleep(0.05)  # widen the window between the check and the assignment
+        created.append(kwargs['max_workers'])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline, 'ThreadPoolExecutor', slow_pool)
+    start = threading.Barrier(8)
+
+    def run(_):
+        start.wait()
+        return Pipeline([Stage('one', lambda _: 1)], max_workers=3).run()[0]
+
+    with concurrent.futures.ThreadPoolExecutor(8) as runners:
+        results = list(runners.map(run, range(8)))
+
+    assert results == [{'one': 1}] * 8
+    assert created == [3]
+
+def test_stages_run_after_their_dependencies_and_concurrently():
+    def slow(value):
+        def stage(_):
+            time.sleep(0.2)
+            return value
+        return stage
+
+    started = time.monotonic()
+    results, timings = Pipeline([
+        Stage('a', slow(1)),
+        Stage('b', slow(2)),
+        Stage('sum', lambda results: results['a'] + results['b'], ('a', 'b'))
+    ], max_workers=2).run()
+
+    assert results['sum'] == 3
+    assert time.monotonic() - started < 0.35
+    assert set(timings) == {'a', 'b', 'sum', 'total'}
+
+def test_failed_stage_is_reported_by_name():
+    with pytest.raises(StageError) as error:
+        Pipeline([Stage('broken', lambda _: 1 / 0)], max_workers=1).run()
+
+    assert error.value.stage == 'broken'
+    assert isinstance(error.value.error, ZeroDivisionError)
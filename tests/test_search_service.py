@@ -0,0 +1,24 @@
+import pytest
+import app as application
+from app import db
+from models import Mission
+from services.search_service import BENCHMARK_QUERIES, benchmark_search, seed_benchmark_missions
+
+@pytest.fixture
+def app_context():
+    with application.app.app_context():
+        yield
+        db.session.rollback()
+        Mission.query.delete()
+        db.session.commit()
+
+def test_benchmark_runs_every_query_over_seeded_missions(app_context):
+    seed_benchmark_missions(300, chunk_size=120)
+
+    result = benchmark_search(iterations=3)
+
+    assert result['missions'] == 300
+    assert set(result['queries']) == set(BENCHMARK_QUERIES) | {'next_page'}
+    assert result['queries']['newest']['rows'] == 25
+    assert result['queries']['text']['rows'] > 0
+    assert all(stats['p50'] <= stats['p99'] <= stats['max'] for stats in result['queries'].values())
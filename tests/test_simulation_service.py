@@ -0,0 +1,56 @@
+from datetime import date
+import pytest
+import app as application
+from app import db
+from models import Mission, MissionStatus, SimulationResult
+from services import series_format
+from services.simulation_service import SimulationService
+
+@pytest.fixture
+def mission_id():
+    with application.app.app_context():
+        mission = Mission(name='Ares One', destination='mars', launch_date=date(2031, 7, 1), mission_duration=900,
+                          crew_size=4, spacecraft_type='orion', payload_mass=20000, fuel_requirements=50000,
+                          status=MissionStatus.DRAFT)
+        db.session.add(mission)
+        db.session.commit()
+        yield mission.id
+        db.session.rollback()
+        SimulationResult.query.delete()
+        Mission.query.delete()
+        db.session.commit()
+
+@pytest.fixture
+def service(tmp_path):
+    return SimulationService(trials=2000, series_storage='file', series_dir=str(tmp_path))
+
+def test_file_series_are_written_after_commit(service, mission_id, tmp_path):
+    result = service.simulate_mission(mission_id)
+
+    assert result['success']
+    simulation_id = result['simulation'].id
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f'{simulation_id}-fuel.ams',
+                                                                f'{simulation_id}-trajectory.ams']
+    assert service.load_series(simulation_id, 'fuel') is not None
+
+def test_failed_write_removes_every_side_file_and_reports_the_error(service, mission_id, tmp_path, monkeypatch):
+    write_file = series_format.write_file
+    calls = []
+
+    def failing_second_write(path, buffer):
+        calls.append(path)
+        if len(calls) == 2:
+            with open(f"{path}.tmp", 'wb') as handle:
+                handle.write(buffer[:10])  # half-written temporary left behind
+            raise OSError(28, 'No space left on device')
+        write_file(path, buffer)
+
+    monkeypatch.setattr(series_format, 'write_file', failing_second_write)
+    result = service.simulate_mission(mission_id)
+
+    assert not result['success']
+    assert 'No space left on device' in result['error']
+    assert list(tmp_path.iterdir()) == []
+    stored = SimulationResult.query.filter_by(mission_id=mission_id).one()
+    assert stored.series_storage is None
+    assert service.load_series(stored.id, 'fuel') is None
@@ -0,0 +1,41 @@
+import hashlib
+from datetime import datetime
+from typing import NamedTuple, Optional
+from flask import Response, request, session
+from werkzeug.http import is_resource_modified
+
+# Cache-Control per kind of response. HTML embeds the session's CSRF token and
+# flash messages, so only the browser may keep it; JSON is shared by every
+# client and may be served by a proxy for a few seconds before revalidating.
+HTML_POLICY = 'private, no-cache'
+STATUS_POLICY = 'public, max-age=2, stale-while-revalidate=5'
+STATISTICS_POLICY = 'public, max-age=30, stale-while-revalidate=60'
+
+class Validators(NamedTuple):
+    etag: str
+    last_modified: Optional[datetime] = None
+
+def make_validators(kind: str, *parts, last_modified: Optional[datetime] = None) -> Validators:
+    """Strong ETag from the values a response is built from"""
+    digest = hashlib.sha1(repr((kind,) + parts).encode('utf-8')).hexdigest()[:20]
+    return Validators(digest, last_modified.replace(microsecond=0) if last_modified else None)
+
+def not_modified(validators: Validators, policy: str, html: bool = False) -> Optional[Response]:
+    """A 304 response if the request's If-None-Match / If-Modified-Since still match, else None.
+
+    HTML with pending flash messages is always rendered, since the
+    messages are consumed by that render.
+    """
+    if html and session.get('_flashes'):
+        return None
+    if is_resource_modified(request.environ, etag=validators.etag, last_modified=validators.last_modified):
+        return None
+    return with_validators(Response(status=304), validators, policy)
+
+def with_validators(response: Response, validators: Validators, policy: str) -> Response:
+    """Attach ETag, Last-Modified and Cache-Control to a successful response"""
+    response.set_etag(validators.etag)
+    if validators.last_modified:
+        response.last_modified = validators.last_modified
+    response.headers['Cache-Control'] = policy
+    return response
@@ -1,11 +1,28 @@
 import re
 from datetime import datetime, date
-from typing import Optional, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import numpy as np
 
 class ValidationError(Exception):
     """Custom validation error"""
     pass
 
+# Mission limits shared by the single-record and batch validators
+NAME_PATTERN = re.compile(r'^[a-zA-Z0-9\s\-_\.]+$')
+SPACECRAFT_TYPES = ('orion', 'dragon', 'soyuz', 'artemis', 'custom')
+MAX_LAUNCH_YEARS = 50
+MAX_MISSION_DURATION = 3650  # 10 years
+MAX_CREW_SIZE = 20
+MAX_PAYLOAD_MASS = 100000  # 100 tons
+MAX_FUEL_REQUIREMENTS = 1000000  # 1000 tons
+
+def max_launch_date(today: date) -> date:
+    """Latest accepted launch date, MAX_LAUNCH_YEARS after today (Feb 29 falls back to Feb 28)"""
+    try:
+        return today.replace(year=today.year + MAX_LAUNCH_YEARS)
+    except ValueError:
+        return today.replace(year=today.year + MAX_LAUNCH_YEARS, day=28)
+
 class MissionValidator:
     @staticmethod
     def validate_mission_name(name: str) -> bool:
@@ -17,7 +34,7 @@ class MissionValidator:
             raise ValidationError("Mission name cannot exceed 200 characters")
         
         # Check for valid characters
-        if not re.match(r'^[a-zA-Z0-9\s\-_\.]+$', name):
+        if not NAME_PATTERN.match(name):
             raise ValidationError("Mission name contains invalid characters")
         
         return True
@@ -35,8 +52,7 @@ class MissionValidator:
             raise ValidationError("Launch date cannot be in the past")
         
         # Check if date is too far in the future (arbitrary limit of 50 years)
-        max_date = date.today().replace(year=date.today().year + 50)
-        if launch_date > max_date:
+        if launch_date > max_launch_date(date.today()):
             raise ValidationError("Launch date cannot be more than 50 years in the future")
         
         return True
@@ -47,7 +63,7 @@ class MissionValidator:
         if duration < 1:
             raise ValidationError("Mission duration must be at least 1 day")
         
-        if duration > 3650:  # 10 years
+        if duration > MAX_MISSION_DURATION:
             raise ValidationError("Mission duration cannot exceed 10 years (3650 days)")
         
         return True
@@ -58,7 +74,7 @@ class MissionValidator:
         if crew_size < 0:
             raise ValidationError("Crew size cannot be negative")
         
-        if crew_size > 20:
+        if crew_size > MAX_CREW_SIZE:
             raise ValidationError("Crew size cannot exceed 20 members")
         
         return True
@@ -72,7 +88,7 @@ class MissionValidator:
         if payload_mass < 0:
             raise ValidationError("Payload mass cannot be negative")
         
-        if payload_mass > 100000:  # 100 tons
+        if payload_mass > MAX_PAYLOAD_MASS:
             raise ValidationError("Payload mass cannot exceed 100,000 kg")
         
         return True
@@ -86,7 +102,7 @@ class MissionValidator:
         if fuel_requirements < 0:
             raise ValidationError("Fuel requirements cannot be negative")
         
-        if fuel_requirements > 1000000:  # 1000 tons
+        if fuel_requirements > MAX_FUEL_REQUIREMENTS:
             raise ValidationError("Fuel requirements cannot exceed 1,000,000 kg")
         
         return True
@@ -94,10 +110,8 @@ class MissionValidator:
     @staticmethod
     def validate_destination(destination: str) -> bool:
         """Validate destination"""
-        valid_destinations = [
-            'mars', 'moon', 'venus', 'jupiter', 'saturn', 
-            'asteroid_belt', 'europa', 'titan', 'enceladus', 'io'
-        ]
+        from services.body_catalog import BODY_CATALOG
+        valid_destinations = list(BODY_CATALOG)
         
         if destination not in valid_destinations:
             raise ValidationError(f"Invalid destination. Must be one of: {', '.join(valid_destinations)}")
@@ -107,10 +121,8 @@ class MissionValidator:
     @staticmethod
     def validate_spacecraft_type(spacecraft_type: str) -> bool:
         """Validate spacecraft type"""
-        valid_types = ['orion', 'dragon', 'soyuz', 'artemis', 'custom']
-        
-        if spacecraft_type not in valid_types:
-            raise ValidationError(f"Invalid spacecraft type. Must be one of: {', '.join(valid_types)}")
+        if spacecraft_type not in SPACECRAFT_TYPES:
+            raise ValidationError(f"Invalid spacecraft type. Must be one of: {', '.join(SPACECRAFT_TYPES)}")
         
         return True
     
@@ -128,6 +140,128 @@ class MissionValidator:
         
         return True
 
+class MissionBatchValidator:
+    """Validates many raw mission records (e.g. CSV rows) with MissionValidator's rules.
+
+    The destination set and the launch-date window are built once per
+    batch and each rule runs over a whole column, numeric limits as numpy
+    comparisons. Every failed rule of a record is reported, not just the
+    first.
+    """
+
+    def __init__(self, destinations: Optional[Iterable[str]] = None):
+        if destinations is None:
+            from services.body_catalog import BODY_CATALOG
+            destinations = BODY_CATALOG
+        destinations = list(destinations)
+        self.destinations = frozenset(destinations)
+        self._destination_list = ', '.join(destinations)
+
+    def validate(self, records: List[Dict]) -> Tuple[List[Optional[Dict]], List[List[str]]]:
+        """Cleaned records (None where invalid) and the error messages of each record"""
+        errors = [[] for _ in records]
+        today = date.today()
+
+        names = [self._text(record.get('name')) for record in records]
+        for index, name in enumerate(names):
+            if len(name) < 3:
+                errors[index].append("Mission name must be at least 3 characters long")
+            elif len(name) > 200:
+                errors[index].append("Mission name cannot exceed 200 characters")
+            elif not NAME_PATTERN.match(name):
+                errors[index].append("Mission name contains invalid characters")
+
+        destinations = [self._text(record.get('destination')).lower() for record in records]
+        self._flag(errors, [value not in self.destinations for value in destinations],
+                   f"Invalid destination. Must be one of: {self._destination_list}")
+
+        spacecraft_types = [self._text(record.get('spacecraft_type')).lower() for record in records]
+        self._flag(errors, [value not in SPACECRAFT_TYPES for value in spacecraft_types],
+                   f"Invalid spacecraft type. Must be one of: {', '.join(SPACECRAFT_TYPES)}")
+
+        launch_dates = [self._date(record.get('launch_date'), index, errors) for index, record in enumerate(records)]
+        ordinals = np.array([value.toordinal() if value else np.nan for value in launch_dates])
+        self._flag(errors, ordinals < today.toordinal(), "Launch date cannot be in the past")
+        self._flag(errors, ordinals > max_launch_date(today).toordinal(),
+                   f"Launch date cannot be more than {MAX_LAUNCH_YEARS} years in the future")
+
+        durations = self._numbers(records, 'mission_duration', 'Mission duration', errors, required=True, integer=True)
+        self._flag(errors, durations < 1, "Mission duration must be at least 1 day")
+        self._flag(errors, durations > MAX_MISSION_DURATION,
+                   f"Mission duration cannot exceed 10 years ({MAX_MISSION_DURATION} days)")
+
+        crew_sizes = self._numbers(records, 'crew_size', 'Crew size', errors, required=True, integer=True)
+        self._flag(errors, crew_sizes < 0, "Crew size cannot be negative")
+        self._flag(errors, crew_sizes > MAX_CREW_SIZE, f"Crew size cannot exceed {MAX_CREW_SIZE} members")
+
+        payload_masses = self._numbers(records, 'payload_mass', 'Payload mass', errors)
+        self._flag(errors, payload_masses < 0, "Payload mass cannot be negative")
+        self._flag(errors, payload_masses > MAX_PAYLOAD_MASS, f"Payload mass cannot exceed {MAX_PAYLOAD_MASS:,} kg")
+
+        fuel_requirements = self._numbers(records, 'fuel_requirements', 'Fuel requirements', errors)
+        self._flag(errors, fuel_requirements < 0, "Fuel requirements cannot be negative")
+        self._flag(errors, fuel_requirements > MAX_FUEL_REQUIREMENTS,
+                   f"Fuel requirements cannot exceed {MAX_FUEL_REQUIREMENTS:,} kg")
+
+        cleaned = []
+        for index, record in enumerate(records):
+            if errors[index]:
+                cleaned.append(None)
+                continue
+            cleaned.append({
+                'name': names[index],
+                'description': self._text(record.get('description')),
+                'destination': destinations[index],
+                'launch_date': launch_dates[index],
+                'mission_duration': int(durations[index]),
+                'crew_size': int(crew_sizes[index]),
+                'spacecraft_type': spacecraft_types[index],
+                'payload_mass': None if np.isnan(payload_masses[index]) else float(payload_masses[index]),
+                'fuel_requirements': None if np.isnan(fuel_requirements[index]) else float(fuel_requirements[index])
+            })
+        return cleaned, errors
+
+    @staticmethod
+    def _text(value) -> str:
+        return '' if value is None else str(value).strip()
+
+    @staticmethod
+    def _flag(errors: List[List[str]], mask, message: str):
+        for index in np.flatnonzero(mask):
+            errors[index].append(message)
+
+    @staticmethod
+    def _date(value, index: int, errors: List[List[str]]) -> Optional[date]:
+        if isinstance(value, date):
+            return value
+        try:
+            return datetime.strptime(str(value).strip(), '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            errors[index].append("Invalid date format. Use YYYY-MM-DD")
+            return None
+
+    @staticmethod
+    def _numbers(records: List[Dict], field: str, label: str, errors: List[List[str]],
+                 required: bool = False, integer: bool = False) -> np.ndarray:
+        """Column as floats; missing or malformed values are NaN, so no range check flags them again"""
+        values = np.full(len(records), np.nan)
+        for index, record in enumerate(records):
+            raw = record.get(field)
+            if raw is None or (isinstance(raw, str) and not raw.strip()):
+                if required:
+                    errors[index].append(f"{label} is required")
+                continue
+            try:
+                number = float(raw)
+            except (TypeError, ValueError):
+                errors[index].append(f"{label} must be a number")
+                continue
+            if not np.isfinite(number) or (integer and not number.is_integer()):
+                errors[index].append(f"{label} must be a whole number" if integer else f"{label} must be a finite number")
+                continue
+            values[index] = number
+        return values
+
 class DataValidator:
     @staticmethod
     def validate_nasa_response(response_data: dict) -> bool: